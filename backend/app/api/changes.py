@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import anyio
+
+from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskChange, TaskReadModel
+from app.services.reminders import ReminderScheduler
+
+
+class ChangePublisher:
+    def __init__(
+        self,
+        notifier: TaskNotifier,
+        *,
+        read_model: TaskReadModel | None = None,
+        reminders: ReminderScheduler | None = None,
+    ) -> None:
+        self.notifier = notifier
+        self.read_model = read_model
+        self.reminders = reminders
+
+    def publish(self, changes: list[TaskChange]) -> None:
+        # Called from the threadpool after the writing transaction has committed.
+        if not changes:
+            return
+        if self.read_model is not None:
+            for change in changes:
+                self.read_model.apply(change)
+        if self.reminders is not None:
+            anyio.from_thread.run_sync(self.reminders.apply, changes)
+        events = {change.list_id: _event_type(change) for change in changes}
+        for list_id, event_type in events.items():
+            message = {"type": event_type, "list_id": list_id}
+            anyio.from_thread.run(self.notifier.broadcast, list_id, message)
+
+
+def _event_type(change: TaskChange) -> str:
+    return "list_deleted" if change.kind == "delete_list" else "tasks_changed"
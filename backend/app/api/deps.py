@@ -1,39 +1,89 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import hmac
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session, sessionmaker
+from jose import JWTError, jwt
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
 
+from app.api.changes import ChangePublisher
 from app.core.config import Settings, get_settings
 from app.core.security import decode_access_token
+from app.db.query_log import SlowQueryLog
+from app.db.session import RoutingSessionFactory
+from app.db.shards import ShardRouter
 from app.repositories.user import UserRepository
+from app.services.backup import BackupJob
+from app.services.list_cache import TaskListCache
+from app.services.memory import MemoryMonitor
 from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskReadModel
 
-_SessionFactory: sessionmaker | None = None
+_SessionFactory: RoutingSessionFactory | None = None
 _security = HTTPBearer(auto_error=False)
 
 
-def set_session_factory(factory: sessionmaker) -> None:
+def set_session_factory(factory: RoutingSessionFactory) -> None:
     global _SessionFactory
     _SessionFactory = factory
 
 
 def get_db() -> Generator[Session, None, None]:
-    if _SessionFactory is None:
-        raise RuntimeError("Database session factory is not configured.")
-    session = _SessionFactory()
+    session = _require_session_factory()()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_read_db(connection: HTTPConnection) -> Generator[Session, None, None]:
+    with read_session(unverified_user_id(connection)) as session:
+        yield session
+
+
+@contextmanager
+def read_session(user_id: int | None = None) -> Iterator[Session]:
+    session = _require_session_factory().reader(user_id)
     try:
         yield session
     finally:
         session.close()
 
 
+@contextmanager
+def owner_session(user_id: int) -> Iterator[Session]:
+    # For callers that know the user id but have not resolved the user through a token.
+    with read_session(user_id) as session:
+        user = UserRepository(session).get_by_id(user_id)
+        if user is not None:
+            _require_session_factory().bind_owner(session, user)
+        yield session
+
+
+def get_shard_router() -> ShardRouter | None:
+    return _require_session_factory().shards
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(_security),
     db: Session = Depends(get_db),
     settings: Settings = Depends(get_settings),
+):
+    if credentials is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    user = _resolve_user_from_token(credentials.credentials, db, settings)
+    db.info["user_id"] = user.id
+    return user
+
+
+def get_current_reader(
+    credentials: HTTPAuthorizationCredentials = Depends(_security),
+    db: Session = Depends(get_read_db),
+    settings: Settings = Depends(get_settings),
 ):
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
@@ -48,6 +98,11 @@ def get_user_from_token(
     return _resolve_user_from_token(token, db, settings)
 
 
+def check_debug_token(expected: str | None, provided: str | None) -> None:
+    if not expected or provided is None or not hmac.compare_digest(provided, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Debug token required")
+
+
 def get_task_notifier(request: Request) -> TaskNotifier:
     notifier = getattr(request.app.state, "task_notifier", None)
     if notifier is None:
@@ -55,6 +110,68 @@ def get_task_notifier(request: Request) -> TaskNotifier:
     return notifier
 
 
+def get_task_cache(request: Request) -> TaskListCache | None:
+    return getattr(request.app.state, "task_cache", None)
+
+
+def get_change_publisher(request: Request) -> ChangePublisher:
+    return request.app.state.change_publisher
+
+
+def get_read_model(request: Request) -> TaskReadModel | None:
+    return getattr(request.app.state, "read_model", None)
+
+
+def get_query_log(request: Request) -> SlowQueryLog | None:
+    return getattr(request.app.state, "query_log", None)
+
+
+def get_memory_monitor(request: Request) -> MemoryMonitor | None:
+    return getattr(request.app.state, "memory_monitor", None)
+
+
+def get_backup_job(request: Request) -> BackupJob | None:
+    return getattr(request.app.state, "backup_job", None)
+
+
+def _require_session_factory() -> RoutingSessionFactory:
+    if _SessionFactory is None:
+        raise RuntimeError("Database session factory is not configured.")
+    return _SessionFactory
+
+
+def unverified_user_id(connection: HTTPConnection) -> int | None:
+    # Only used to route reads; the token is verified by the auth dependency.
+    return unverified_token_user_id(_connection_token(connection))
+
+
+def verified_user_id(connection: HTTPConnection, secret_key: str, algorithm: str) -> int | None:
+    # For callers ahead of the auth dependency that must not trust a forged subject.
+    token = _connection_token(connection)
+    if not token:
+        return None
+    try:
+        return int(decode_access_token(token, secret_key, algorithm).get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _connection_token(connection: HTTPConnection) -> str:
+    scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        token = connection.query_params.get("token", "")
+    return token
+
+
+def unverified_token_user_id(token: str) -> int | None:
+    if not token:
+        return None
+    try:
+        return int(jwt.get_unverified_claims(token).get("sub"))
+    except (JWTError, TypeError, ValueError):
+        return None
+
+
 def _resolve_user_from_token(token: str, db: Session, settings: Settings):
     try:
         payload = decode_access_token(token, settings.secret_key, settings.algorithm)
@@ -68,7 +185,11 @@ def _resolve_user_from_token(token: str, db: Session, settings: Settings):
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
     user = UserRepository(db).get_by_id(user_id)
+    if user is None and db.info.get("replica"):
+        # A freshly registered account may not have reached the replica yet.
+        with _require_session_factory()() as primary:
+            user = UserRepository(primary).get_by_id(user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    _require_session_factory().bind_owner(db, user)
     return user
-
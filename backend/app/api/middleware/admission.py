@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.api.deps import verified_user_id
+
+AUTH_PATHS = frozenset({"/api/register", "/api/login"})
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+STREAM_PATH_SUFFIXES = ("/events",)
+
+
+def classify_route(scope: Scope) -> str:
+    if scope["path"] in AUTH_PATHS:
+        return "auth"
+    if scope["method"] in READ_METHODS:
+        return "read"
+    return "write"
+
+
+class _Slots:
+    __slots__ = ("limit", "active", "waiters")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self.waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def idle(self) -> bool:
+        return self.active == 0 and not self.waiters
+
+    def try_acquire(self) -> bool:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        return False
+
+    async def acquire(self, timeout: float) -> bool:
+        if timeout <= 0:
+            return False
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            try:
+                self.waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self) -> None:
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_concurrency: int,
+        max_concurrency_per_user: int,
+        class_limits: dict[str, int],
+        max_queue: int,
+        queue_timeout_seconds: float,
+        retry_after_seconds: int,
+        secret_key: str,
+        algorithm: str = "HS256",
+    ) -> None:
+        self.app = app
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_concurrency_per_user = max_concurrency_per_user
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self._global = _Slots(max_concurrency)
+        self._classes = {name: _Slots(limit) for name, limit in class_limits.items()}
+        self._users: dict[int, _Slots] = {}
+        self._waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].endswith(STREAM_PATH_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        # A forged or expired token counts as anonymous, so it cannot use up another user's slots.
+        user_id = verified_user_id(HTTPConnection(scope), self.secret_key, self.algorithm)
+        gates: list[_Slots] = []
+        if user_id is not None:
+            gates.append(self._users.setdefault(user_id, _Slots(self.max_concurrency_per_user)))
+        route_gate = self._classes.get(classify_route(scope))
+        if route_gate is not None:
+            gates.append(route_gate)
+        gates.append(self._global)
+
+        acquired: list[_Slots] = []
+        try:
+            if not await self._acquire_all(gates, acquired):
+                self.rejected += 1
+                await self._reject(scope, receive, send)
+                return
+            self.admitted += 1
+            await self.app(scope, receive, send)
+        finally:
+            for gate in reversed(acquired):
+                gate.release()
+            if user_id is not None:
+                user_gate = self._users.get(user_id)
+                if user_gate is not None and user_gate.idle:
+                    del self._users[user_id]
+
+    async def _acquire_all(self, gates: list[_Slots], acquired: list[_Slots]) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout_seconds
+        for gate in gates:
+            if not gate.try_acquire():
+                if self._waiting >= self.max_queue:
+                    return False
+                self._waiting += 1
+                try:
+                    admitted = await gate.acquire(deadline - loop.time())
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    return False
+            acquired.append(gate)
+        return True
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            {"detail": "Server is busy, retry later"},
+            status_code=503,
+            headers={"Retry-After": str(self.retry_after_seconds)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import event
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = "x-profile"
+MAX_STACK_DEPTH = 64
+# Threads whose innermost frame is in one of these modules are idle, not working.
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+
+_active: ContextVar[_Profile | None] = ContextVar("active_profile", default=None)
+
+
+class _Profile:
+    def __init__(self) -> None:
+        self.statements: list[dict[str, Any]] = []
+        self.samples: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    def record_statement(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.statements.append({"statement": statement, "seconds": round(seconds, 6)})
+
+
+class _Sampler(threading.Thread):
+    # Samples every busy thread: sync handlers run in the threadpool, where a per-thread
+    # profiler such as cProfile cannot follow them.
+    def __init__(self, profile: _Profile, interval: float) -> None:
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self._done.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                self.profile.samples[_fold(frame)] += 1
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        directory: str,
+        token: str | None = None,
+        sample_rate: float = 0.0,
+        interval_seconds: float = 0.005,
+        max_profiles: int = 100,
+    ) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_seconds
+        self.max_profiles = max_profiles
+        self.in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.in_flight += 1
+        try:
+            if self._wanted(scope):
+                await self._profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    def _wanted(self, scope: Scope) -> bool:
+        header = Headers(scope=scope).get(PROFILE_HEADER)
+        if header is not None and self.token:
+            return hmac.compare_digest(header, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status_code = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profile = _Profile()
+        sampler = _Sampler(profile, self.interval_seconds)
+        token = _active.set(profile)
+        overlapping = self.in_flight - 1
+        started_at = time.time()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            _active.reset(token)
+            route = scope.get("route")
+            self._save(
+                {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "status": status_code,
+                    "started_at": started_at,
+                    "wall_seconds": round(time.perf_counter() - wall_started, 6),
+                    # Process-wide, as are the samples: other requests in flight show up too.
+                    "cpu_seconds": round(time.process_time() - cpu_started, 6),
+                    "overlapping_requests": max(overlapping, self.in_flight - 1),
+                    "sample_interval_seconds": self.interval_seconds,
+                    "samples": sum(profile.samples.values()),
+                    "sql": profile.statements,
+                    "stacks": dict(profile.samples.most_common()),
+                }
+            )
+
+    def _save(self, profile: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        route = re.sub(r"[^A-Za-z0-9]+", "-", profile["route"] or profile["path"]).strip("-")
+        name = f"{int(profile['started_at'] * 1000)}-{profile['method'].lower()}-{route}.json"
+        path = self.directory / name
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(profile), encoding="utf-8")
+        os.replace(temporary, path)
+        for stale in list_profiles(self.directory)[self.max_profiles :]:
+            stale.unlink(missing_ok=True)
+
+
+def capture_profile_sql(engine) -> None:
+    # Only installed when profiling is enabled; statements are kept for profiled requests only.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+        if _active.get() is not None:
+            context._profile_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(_conn, _cursor, statement, _parameters, context, _executemany) -> None:
+        profile = _active.get()
+        started = getattr(context, "_profile_started", None)
+        if profile is not None and started is not None:
+            profile.record_statement(statement, time.perf_counter() - started)
+
+
+def list_profiles(directory: str | Path) -> list[Path]:
+    path = Path(directory)
+    if not path.is_dir():
+        return []
+    return sorted(path.glob("*.json"), key=lambda item: item.name, reverse=True)
+
+
+def _fold(frame) -> str:
+    names: list[str] = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_qualname}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
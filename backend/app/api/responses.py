@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.encoding import MSGPACK_MEDIA_TYPES, accepts_msgpack, packb
+from app.schemas.task import TaskRead
+
+JSON_MEDIA_TYPE = "application/json"
+
+_task_list_adapter = TypeAdapter(list[TaskRead])
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        return packb(content)
+
+
+def task_list_response(request: Request, tasks: Iterable[Any]):
+    if not accepts_msgpack(request.headers.get("accept", "")):
+        return tasks
+    return MsgPackResponse(
+        [TaskRead.model_validate(task).model_dump(mode="json") for task in tasks],
+        headers={"Vary": "Accept"},
+    )
+
+
+def negotiate_task_media_type(request: Request) -> str:
+    if accepts_msgpack(request.headers.get("accept", "")):
+        return MSGPACK_MEDIA_TYPES[0]
+    return JSON_MEDIA_TYPE
+
+
+def encode_task_list(tasks: Iterable[Any], media_type: str) -> bytes:
+    validated = _task_list_adapter.validate_python(list(tasks), from_attributes=True)
+    if media_type == JSON_MEDIA_TYPE:
+        return _task_list_adapter.dump_json(validated)
+    return packb(_task_list_adapter.dump_python(validated, mode="json"))
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.config import Settings, get_settings
+from app.db.shards import ShardRouter
 from app.schemas.auth import LoginRequest, Token
 from app.schemas.user import UserCreate
 from app.services.auth import AuthService
@@ -15,8 +16,9 @@ def register_user(
     payload: UserCreate,
     db: Session = Depends(deps.get_db),
     settings: Settings = Depends(get_settings),
+    shards: ShardRouter | None = Depends(deps.get_shard_router),
 ) -> Token:
-    service = AuthService(db, settings)
+    service = AuthService(db, settings, shards=shards)
     _, access_token = service.register_user(
         email=payload.email,
         password=payload.password,
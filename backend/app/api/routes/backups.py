@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, Request
+
+from app.api import deps
+from app.services.backup import BackupJob
+
+router = APIRouter(prefix="/api/debug/backups", tags=["debug"])
+
+
+def require_backup_job(request: Request, x_debug_token: str | None = Header(default=None)) -> BackupJob:
+    deps.check_debug_token(request.app.state.settings.backup_token, x_debug_token)
+    return request.app.state.backup_job
+
+
+@router.get("")
+def get_backups(job: BackupJob = Depends(require_backup_job)) -> dict[str, Any]:
+    return job.details()
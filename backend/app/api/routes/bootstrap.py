@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.db import models
+from app.schemas.bootstrap import Bootstrap
+from app.services.task import TaskService
+
+router = APIRouter(prefix="/api", tags=["bootstrap"])
+
+MAX_BOOTSTRAP_PAGE_SIZE = 200
+
+
+@router.get("/bootstrap", response_model=Bootstrap)
+def get_bootstrap(
+    list_id: int | None = None,
+    limit: int = Query(50, ge=1, le=MAX_BOOTSTRAP_PAGE_SIZE),
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
+) -> Bootstrap:
+    # Everything the client needs to render on load, from the one session the auth check opened.
+    service = TaskService(db)
+    return Bootstrap(
+        user=current_user,
+        **service.bootstrap(owner_id=current_user.id, list_id=list_id, limit=limit),
+    )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Request, Response, status
+
+router = APIRouter(prefix="/api/health", tags=["health"])
+
+
+@router.get("/live")
+def live() -> dict[str, str]:
+    # The worker's event loop is answering; says nothing about its dependencies.
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready(request: Request, response: Response) -> dict[str, Any]:
+    checks: dict[str, bool] = {"started": request.app.state.ready}
+    for name, engine in request.app.state.database_engines.items():
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql("SELECT 1")
+        except Exception:
+            checks[name] = False
+        else:
+            checks[name] = True
+    is_ready = all(checks.values())
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if is_ready else "unavailable", "checks": checks}
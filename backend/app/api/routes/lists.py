@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.api.changes import ChangePublisher
 from app.db import models
 from app.schemas.task import TaskListCreate, TaskListRead
 from app.services.task import TaskService
@@ -11,8 +12,8 @@ router = APIRouter(prefix="/api", tags=["task-lists"])
 
 @router.get("/lists", response_model=list[TaskListRead])
 def get_lists(
-    current_user: models.User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
 ) -> list[TaskListRead]:
     service = TaskService(db)
     return service.list_lists(owner_id=current_user.id)
@@ -27,3 +28,14 @@ def create_list(
     service = TaskService(db)
     return service.create_list(owner_id=current_user.id, name=payload.name)
 
+
+@router.delete("/lists/{list_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_list(
+    list_id: int,
+    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
+) -> None:
+    service = TaskService(db)
+    service.delete_list(list_id=list_id, owner_id=current_user.id)
+    publisher.publish(service.changes)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+
+from app.api import deps
+from app.services.memory import MemoryMonitor, list_snapshots
+
+router = APIRouter(prefix="/api/debug/memory", tags=["debug"])
+
+
+def require_memory_monitor(
+    request: Request, x_debug_token: str | None = Header(default=None)
+) -> MemoryMonitor:
+    deps.check_debug_token(request.app.state.settings.memory_diagnostics_token, x_debug_token)
+    return request.app.state.memory_monitor
+
+
+@router.get("")
+def get_memory(monitor: MemoryMonitor = Depends(require_memory_monitor)) -> dict[str, Any]:
+    return {
+        **monitor.stats(),
+        "last_diff": monitor.last_diff,
+        "snapshots": [path.name for path in list_snapshots(monitor.directory)],
+    }
+
+
+@router.post("/snapshots", status_code=status.HTTP_201_CREATED)
+async def take_snapshot(
+    monitor: MemoryMonitor = Depends(require_memory_monitor),
+) -> dict[str, Any]:
+    path, diff = await run_in_threadpool(monitor.dump)
+    return {"name": path.name, "diff": diff}
+
+
+@router.get("/snapshots/{name}")
+def download_snapshot(
+    name: str, monitor: MemoryMonitor = Depends(require_memory_monitor)
+) -> FileResponse:
+    # Load with tracemalloc.Snapshot.load() on a machine with the same source tree.
+    for path in list_snapshots(monitor.directory):
+        if path.name == name:
+            return FileResponse(path, media_type="application/octet-stream", filename=name)
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
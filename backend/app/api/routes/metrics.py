@@ -0,0 +1,40 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.api.changes import ChangePublisher
+from app.db.query_log import SlowQueryLog
+from app.services.backup import BackupJob
+from app.services.memory import MemoryMonitor
+from app.services.list_cache import TaskListCache
+from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskReadModel
+
+router = APIRouter(prefix="/api", tags=["metrics"])
+
+
+@router.get("/metrics")
+def get_metrics(
+    notifier: TaskNotifier = Depends(deps.get_task_notifier),
+    cache: TaskListCache | None = Depends(deps.get_task_cache),
+    read_model: TaskReadModel | None = Depends(deps.get_read_model),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
+    query_log: SlowQueryLog | None = Depends(deps.get_query_log),
+    memory: MemoryMonitor | None = Depends(deps.get_memory_monitor),
+    backup: BackupJob | None = Depends(deps.get_backup_job),
+) -> dict[str, dict[str, Any]]:
+    metrics = {"websockets": notifier.stats()}
+    if cache is not None:
+        metrics["task_cache"] = cache.stats()
+    if read_model is not None:
+        metrics["read_model"] = read_model.stats()
+    if publisher.reminders is not None:
+        metrics["reminders"] = publisher.reminders.stats()
+    if query_log is not None:
+        metrics["slow_queries"] = query_log.stats()
+    if memory is not None:
+        metrics["memory"] = memory.stats()
+    if backup is not None:
+        metrics["backup"] = backup.stats()
+    return metrics
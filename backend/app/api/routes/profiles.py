@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse
+
+from app.api import deps
+from app.api.middleware.profiling import list_profiles
+from app.core.config import Settings
+
+router = APIRouter(prefix="/api/debug/profiles", tags=["debug"])
+
+
+def require_debug_token(
+    request: Request, x_debug_token: str | None = Header(default=None)
+) -> Settings:
+    # A separate header from X-Profile so browsing profiles does not record new ones.
+    settings: Settings = request.app.state.settings
+    deps.check_debug_token(settings.profiling_token, x_debug_token)
+    return settings
+
+
+@router.get("")
+def get_profiles(
+    limit: int = Query(20, ge=1, le=100),
+    settings: Settings = Depends(require_debug_token),
+) -> list[dict[str, Any]]:
+    summaries = []
+    for path in list_profiles(settings.profiling_directory)[:limit]:
+        profile = json.loads(path.read_text(encoding="utf-8"))
+        summaries.append(
+            {
+                "name": path.name,
+                "route": profile["route"],
+                "method": profile["method"],
+                "status": profile["status"],
+                "wall_seconds": profile["wall_seconds"],
+                "cpu_seconds": profile["cpu_seconds"],
+                "sql_statements": len(profile["sql"]),
+            }
+        )
+    return summaries
+
+
+@router.get("/{name}")
+def download_profile(name: str, settings: Settings = Depends(require_debug_token)) -> FileResponse:
+    for path in list_profiles(settings.profiling_directory):
+        if path.name == name:
+            return FileResponse(path, media_type="application/json", filename=name)
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
@@ -1,34 +1,128 @@
 from __future__ import annotations
 
-import anyio
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Any
+
 from fastapi import (
     APIRouter,
     Depends,
+    Header,
     HTTPException,
+    Query,
+    Request,
+    Response,
     WebSocket,
-    WebSocketDisconnect,
     status,
 )
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.api.changes import ChangePublisher
+from app.api.responses import encode_task_list, negotiate_task_media_type, task_list_response
 from app.core.config import get_settings
+from app.core.encoding import msgpack_available, unpackb
 from app.db import models
-from app.schemas.task import TaskCreate, TaskRead, TaskReorderRequest, TaskUpdate
+from app.schemas.task import (
+    ArchivedTaskPage,
+    BulkResult,
+    TaskBulkUpdate,
+    TaskCounts,
+    TaskCreate,
+    TaskOccurrenceRead,
+    TaskOccurrenceUpdate,
+    TaskPriority,
+    TaskRead,
+    TaskReorderRequest,
+    TaskStatus,
+    TaskUpdate,
+)
+from app.services.archive import ArchiveService
+from app.services.list_cache import TaskListCache
 from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskReadModel
 from app.services.task import TaskService
 
 router = APIRouter(prefix="/api", tags=["tasks"])
 
+MAX_LISTS_PER_SUBSCRIBE = 200
+MAX_ARCHIVE_PAGE_SIZE = 200
+MAX_AGENDA_DAYS = 366
+SSE_RETRY_MILLISECONDS = 3000
+
 
 @router.get("/lists/{list_id}/tasks", response_model=list[TaskRead])
 def list_tasks(
     list_id: int,
-    current_user: models.User = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
-) -> list[TaskRead]:
+    request: Request,
+    status: TaskStatus | None = None,
+    priority: TaskPriority | None = None,
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
+    cache: TaskListCache | None = Depends(deps.get_task_cache),
+    read_model: TaskReadModel | None = Depends(deps.get_read_model),
+) -> Response:
+    service = TaskService(db)
+    media_type = negotiate_task_media_type(request)
+    body = service.list_tasks_encoded(
+        list_id=list_id,
+        owner_id=current_user.id,
+        media_type=media_type,
+        encode=lambda tasks: encode_task_list(tasks, media_type),
+        status=status.value if status else None,
+        priority=priority.value if priority else None,
+        cache=cache,
+        read_model=read_model,
+    )
+    return Response(body, media_type=media_type, headers={"Vary": "Accept"})
+
+
+@router.get("/lists/{list_id}/tasks/counts", response_model=TaskCounts)
+def count_tasks(
+    list_id: int,
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
+    read_model: TaskReadModel | None = Depends(deps.get_read_model),
+) -> TaskCounts:
     service = TaskService(db)
-    return service.list_tasks(list_id=list_id, owner_id=current_user.id)
+    return service.count_tasks(list_id=list_id, owner_id=current_user.id, read_model=read_model)
+
+
+@router.get("/lists/{list_id}/archive", response_model=ArchivedTaskPage)
+def list_archived_tasks(
+    list_id: int,
+    limit: int = Query(50, ge=1, le=MAX_ARCHIVE_PAGE_SIZE),
+    before_id: int | None = None,
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
+) -> ArchivedTaskPage:
+    service = ArchiveService(db)
+    items = service.list_archived(
+        list_id=list_id, owner_id=current_user.id, limit=limit, before_id=before_id
+    )
+    next_before_id = items[-1].id if len(items) == limit else None
+    return ArchivedTaskPage(items=items, next_before_id=next_before_id)
+
+
+@router.get("/lists/{list_id}/agenda", response_model=list[TaskOccurrenceRead])
+def list_agenda(
+    list_id: int,
+    start: date,
+    end: date,
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
+) -> list[dict[str, Any]]:
+    if end < start or (end - start).days >= MAX_AGENDA_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end must be on or after start and at most {MAX_AGENDA_DAYS} days later",
+        )
+    service = TaskService(db)
+    return service.agenda(list_id=list_id, owner_id=current_user.id, start=start, end=end)
 
 
 @router.post("/lists/{list_id}/tasks", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
@@ -37,7 +131,7 @@ def create_task(
     payload: TaskCreate,
     current_user: models.User = Depends(deps.get_current_user),
     db: Session = Depends(deps.get_db),
-    notifier: TaskNotifier = Depends(deps.get_task_notifier),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
 ) -> TaskRead:
     service = TaskService(db)
     task = service.create_task(
@@ -49,8 +143,9 @@ def create_task(
         status=payload.status.value,
         priority=payload.priority.value,
         tags=payload.tags,
+        recurrence=payload.recurrence.model_dump(mode="json") if payload.recurrence else None,
     )
-    _notify_task_change(notifier, list_id)
+    publisher.publish(service.changes)
     return task
 
 
@@ -60,7 +155,7 @@ def update_task(
     payload: TaskUpdate,
     current_user: models.User = Depends(deps.get_current_user),
     db: Session = Depends(deps.get_db),
-    notifier: TaskNotifier = Depends(deps.get_task_notifier),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
 ) -> TaskRead:
     service = TaskService(db)
     task = service.update_task(
@@ -72,38 +167,121 @@ def update_task(
         status=payload.status.value if payload.status else None,
         priority=payload.priority.value if payload.priority else None,
         tags=payload.tags,
+        recurrence=payload.recurrence.model_dump(mode="json") if payload.recurrence else None,
+        clear_recurrence="recurrence" in payload.model_fields_set and payload.recurrence is None,
     )
-    _notify_task_change(notifier, task.list_id)
+    publisher.publish(service.changes)
     return task
 
 
+@router.put("/tasks/{task_id}/occurrences/{occurrence_date}", response_model=TaskOccurrenceRead)
+def update_occurrence(
+    task_id: int,
+    occurrence_date: date,
+    payload: TaskOccurrenceUpdate,
+    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
+) -> dict[str, Any]:
+    service = TaskService(db)
+    occurrence = service.update_occurrence(
+        task_id=task_id,
+        owner_id=current_user.id,
+        occurrence_date=occurrence_date,
+        task_status=payload.status.value,
+    )
+    publisher.publish(service.changes)
+    return occurrence
+
+
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
     task_id: int,
     current_user: models.User = Depends(deps.get_current_user),
     db: Session = Depends(deps.get_db),
-    notifier: TaskNotifier = Depends(deps.get_task_notifier),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
 ) -> None:
     service = TaskService(db)
-    list_id = service.delete_task(task_id=task_id, owner_id=current_user.id)
-    _notify_task_change(notifier, list_id)
+    service.delete_task(task_id=task_id, owner_id=current_user.id)
+    publisher.publish(service.changes)
 
 
 @router.put("/lists/{list_id}/tasks/reorder", response_model=list[TaskRead])
 def reorder_tasks(
     list_id: int,
     payload: TaskReorderRequest,
+    request: Request,
     current_user: models.User = Depends(deps.get_current_user),
     db: Session = Depends(deps.get_db),
-    notifier: TaskNotifier = Depends(deps.get_task_notifier),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
 ) -> list[TaskRead]:
     task_ids = payload.task_ids
     if not task_ids:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="task_ids cannot be empty")
     service = TaskService(db)
     updated_tasks = service.reorder_tasks(list_id=list_id, owner_id=current_user.id, ordered_ids=task_ids)
-    _notify_task_change(notifier, list_id)
-    return updated_tasks
+    publisher.publish(service.changes)
+    return task_list_response(request, updated_tasks)
+
+
+@router.patch("/lists/{list_id}/tasks", response_model=BulkResult)
+def update_matching_tasks(
+    list_id: int,
+    payload: TaskBulkUpdate,
+    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
+) -> BulkResult:
+    service = TaskService(db)
+    updated = service.update_matching(
+        list_id=list_id,
+        owner_id=current_user.id,
+        where=payload.where.model_dump(mode="json", exclude_none=True),
+        values=payload.model_dump(mode="json", include={"status", "priority"}, exclude_none=True),
+    )
+    publisher.publish(service.changes)
+    return BulkResult(affected=updated)
+
+
+@router.post("/lists/{list_id}/tasks/clear-completed", response_model=BulkResult)
+def clear_completed_tasks(
+    list_id: int,
+    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db),
+    publisher: ChangePublisher = Depends(deps.get_change_publisher),
+) -> BulkResult:
+    service = TaskService(db)
+    deleted = service.clear_completed(list_id=list_id, owner_id=current_user.id)
+    publisher.publish(service.changes)
+    return BulkResult(affected=deleted)
+
+
+@router.get("/lists/{list_id}/events")
+async def task_updates_stream(
+    list_id: int,
+    request: Request,
+    token: str | None = None,
+    last_event_id: str | None = Header(None),
+) -> StreamingResponse:
+    scheme, _, bearer = request.headers.get("authorization", "").partition(" ")
+    credentials = token or (bearer if scheme.lower() == "bearer" else None)
+    if not credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    user_id = await run_in_threadpool(_require_subscription, credentials, list_id)
+
+    notifier: TaskNotifier = request.app.state.task_notifier
+    if not notifier.has_capacity(user_id):
+        # Checked again when the stream opens; this only turns the common case into a clear error.
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many live connections, retry later",
+        )
+    keepalive = request.app.state.settings.sse_keepalive_seconds
+    return StreamingResponse(
+        _event_stream(notifier, list_id, user_id, last_event_id or None, keepalive),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.websocket("/ws/lists/{list_id}")
@@ -111,34 +289,145 @@ async def task_updates_websocket(
     websocket: WebSocket,
     list_id: int,
     token: str,
-    db: Session = Depends(deps.get_db),
+    encoding: str = "json",
 ) -> None:
-    settings = get_settings()
-    try:
-        user = deps.get_user_from_token(token=token, db=db, settings=settings)
-    except HTTPException:
+    if encoding not in {"json", "msgpack"} or (encoding == "msgpack" and not msgpack_available()):
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+    user_id = await run_in_threadpool(_authorize_subscription, token, list_id)
+    if user_id is None:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
-    service = TaskService(db)
+    notifier: TaskNotifier = websocket.app.state.task_notifier  # type: ignore[attr-defined]
+    if not await notifier.connect(list_id, websocket, user_id=user_id, encoding=encoding):
+        return
     try:
-        service.list_tasks(list_id=list_id, owner_id=user.id)
-    except HTTPException:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            notifier.touch(websocket)
+    finally:
+        await notifier.disconnect(websocket)
+
+
+@router.websocket("/ws")
+async def multiplexed_updates_websocket(
+    websocket: WebSocket,
+    token: str,
+    encoding: str = "json",
+) -> None:
+    if encoding not in {"json", "msgpack"} or (encoding == "msgpack" and not msgpack_available()):
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+    user_id = await run_in_threadpool(_authenticate_subscriber, token)
+    if user_id is None:
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
         return
 
     notifier: TaskNotifier = websocket.app.state.task_notifier  # type: ignore[attr-defined]
-    await notifier.connect(list_id, websocket)
+    if not await notifier.register(websocket, user_id=user_id, encoding=encoding):
+        return
     try:
         while True:
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        pass
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            notifier.touch(websocket)
+            command = _decode_command(message, encoding)
+            if command is None:
+                continue
+            action, list_ids = command
+            if action == "subscribe":
+                owned = await run_in_threadpool(_owned_list_ids, user_id, list_ids)
+                await notifier.subscribe(websocket, owned)
+                reply = {
+                    "type": "subscribed",
+                    "list_ids": sorted(owned),
+                    "denied": sorted(list_ids - owned),
+                }
+            else:
+                await notifier.unsubscribe(websocket, list_ids)
+                reply = {"type": "unsubscribed", "list_ids": sorted(list_ids)}
+            await notifier.send(websocket, reply)
     finally:
-        await notifier.disconnect(list_id, websocket)
+        await notifier.disconnect(websocket)
+
 
+def _authenticate_subscriber(token: str) -> int | None:
+    with deps.read_session(deps.unverified_token_user_id(token)) as db:
+        try:
+            user = deps.get_user_from_token(token=token, db=db, settings=get_settings())
+        except HTTPException:
+            return None
+    return user.id
 
-def _notify_task_change(notifier: TaskNotifier, list_id: int) -> None:
-    message = {"type": "tasks_changed", "list_id": list_id}
-    anyio.from_thread.run(notifier.broadcast, list_id, message)
 
+def _authorize_subscription(token: str, list_id: int) -> int | None:
+    try:
+        return _require_subscription(token, list_id)
+    except HTTPException:
+        return None
+
+
+def _require_subscription(token: str, list_id: int) -> int:
+    # The session is closed before the subscription starts, so idle subscribers hold no connection.
+    with deps.read_session(deps.unverified_token_user_id(token)) as db:
+        user = deps.get_user_from_token(token=token, db=db, settings=get_settings())
+        TaskService(db).get_list(list_id=list_id, owner_id=user.id)
+    return user.id
+
+
+async def _event_stream(
+    notifier: TaskNotifier,
+    list_id: int,
+    user_id: int,
+    last_event_id: str | None,
+    keepalive: float,
+) -> AsyncIterator[str]:
+    opened = await notifier.open_stream(list_id, last_event_id, user_id=user_id)
+    if opened is None:
+        return
+    queue, backlog = opened
+    try:
+        yield f"retry: {SSE_RETRY_MILLISECONDS}\n\n"
+        for event_id, message in backlog:
+            yield _format_event(notifier.format_event_id(event_id), message)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            yield _format_event(notifier.format_event_id(event[0]), event[1])
+    finally:
+        await notifier.close_stream(list_id, queue)
+
+
+def _format_event(event_id: str, message: dict[str, Any]) -> str:
+    return f"id: {event_id}\ndata: {json.dumps(message, separators=(',', ':'))}\n\n"
+
+
+def _owned_list_ids(user_id: int, list_ids: set[int]) -> set[int]:
+    with deps.owner_session(user_id) as db:
+        return TaskService(db).owned_list_ids(owner_id=user_id, list_ids=list_ids)
+
+
+def _decode_command(message: dict[str, Any], encoding: str) -> tuple[str, set[int]] | None:
+    try:
+        if message.get("bytes") is not None and encoding == "msgpack":
+            payload = unpackb(message["bytes"])
+        else:
+            payload = json.loads(message.get("text") or "")
+    except Exception:
+        return None
+    if not isinstance(payload, dict) or payload.get("type") not in {"subscribe", "unsubscribe"}:
+        return None
+    raw_ids = payload.get("list_ids")
+    if not isinstance(raw_ids, list):
+        return None
+    list_ids = {list_id for list_id in raw_ids[:MAX_LISTS_PER_SUBSCRIBE] if type(list_id) is int}
+    return payload["type"], list_ids
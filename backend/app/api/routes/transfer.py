@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.db import models
+from app.schemas.task import ImportSummary, TransferFormat
+from app.services.transfer import TransferService, decode_lines
+
+router = APIRouter(prefix="/api", tags=["transfer"])
+
+_MEDIA_TYPES = {
+    TransferFormat.ndjson: "application/x-ndjson",
+    TransferFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+@router.get("/export")
+def export_data(
+    export_format: TransferFormat = Query(TransferFormat.ndjson, alias="format"),
+    current_user: models.User = Depends(deps.get_current_reader),
+    db: Session = Depends(deps.get_read_db),
+) -> StreamingResponse:
+    service = TransferService(db)
+    if export_format is TransferFormat.csv:
+        body = service.export_csv(owner_id=current_user.id)
+    else:
+        body = service.export_ndjson(owner_id=current_user.id)
+    return StreamingResponse(
+        body,
+        media_type=_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="tasktrack-export.{export_format.value}"'},
+    )
+
+
+@router.post("/import", response_model=ImportSummary, status_code=status.HTTP_201_CREATED)
+def import_data(
+    file: UploadFile = File(...),
+    import_format: TransferFormat | None = Query(None, alias="format"),
+    current_user: models.User = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db),
+) -> ImportSummary:
+    if import_format is None:
+        is_csv = (file.filename or "").lower().endswith(".csv")
+        import_format = TransferFormat.csv if is_csv else TransferFormat.ndjson
+    lines = decode_lines(file.file)
+    service = TransferService(db)
+    if import_format is TransferFormat.csv:
+        summary = service.import_csv(owner_id=current_user.id, lines=lines)
+    else:
+        summary = service.import_ndjson(owner_id=current_user.id, lines=lines)
+    return ImportSummary(**summary)
@@ -7,9 +7,72 @@ from functools import lru_cache
 class Settings:
     app_name: str = "TaskTrack"
     database_url: str = "sqlite:///./tasktrack.db"
+    auto_migrate: bool = True
+    read_database_url: str | None = None
+    read_your_writes_seconds: float = 5.0
+    shard_database_urls: tuple[str, ...] = ()
+    database_wal: bool = False
     secret_key: str = "change-me"
     access_token_expire_minutes: int = 60
     algorithm: str = "HS256"
+    admission_control_enabled: bool = True
+    admission_max_concurrency: int = 40
+    admission_max_concurrency_per_user: int = 8
+    admission_auth_concurrency: int = 4
+    admission_read_concurrency: int = 32
+    admission_write_concurrency: int = 16
+    admission_max_queue: int = 128
+    admission_queue_timeout_seconds: float = 2.0
+    admission_retry_after_seconds: int = 1
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    websocket_heartbeat_interval_seconds: float = 25.0
+    websocket_heartbeat_timeout_seconds: float = 60.0
+    websocket_max_connections: int = 10_000
+    websocket_max_connections_per_user: int = 20
+    sse_event_buffer_size: int = 256
+    sse_keepalive_seconds: float = 15.0
+    task_cache_enabled: bool = True
+    task_cache_max_bytes: int = 64 * 1024 * 1024
+    read_model_enabled: bool = False
+    read_model_max_bytes: int = 32 * 1024 * 1024
+    archive_enabled: bool = False
+    archive_after_days: float = 30.0
+    archive_interval_seconds: float = 3600.0
+    archive_batch_size: int = 1000
+    reminders_enabled: bool = True
+    reminder_window_days: int = 1
+    reminder_batch_size: int = 1000
+    slow_query_log_enabled: bool = True
+    slow_query_threshold_ms: float = 100.0
+    profiling_enabled: bool = False
+    profiling_token: str | None = None
+    profiling_sample_rate: float = 0.0
+    profiling_directory: str = "./profiles"
+    profiling_max_profiles: int = 100
+    memory_diagnostics_enabled: bool = False
+    memory_diagnostics_token: str | None = None
+    memory_snapshot_interval_seconds: float = 300.0
+    memory_snapshot_top_n: int = 20
+    memory_trace_frames: int = 5
+    memory_snapshot_directory: str = "./memory_snapshots"
+    memory_max_snapshots: int = 10
+    backup_enabled: bool = False
+    backup_token: str | None = None
+    backup_directory: str = "./backups"
+    backup_interval_seconds: float = 86400.0
+    backup_max_backups: int = 7
+    backup_step_pages: int = 256
+    backup_step_sleep_seconds: float = 0.01
+    server_host: str = "127.0.0.1"
+    server_port: int = 8000
+    server_workers: int = 1
+    server_keep_alive_seconds: int = 15
+    server_backlog: int = 2048
+    server_max_requests: int = 10_000
+    server_max_requests_jitter: int = 1_000
+    server_graceful_timeout_seconds: int = 30
+    server_proxy_headers: bool = False
 
 
 @lru_cache
@@ -18,10 +81,136 @@ def get_settings() -> Settings:
     return Settings(
         app_name=os.getenv("APP_NAME", defaults.app_name),
         database_url=os.getenv("DATABASE_URL", defaults.database_url),
+        auto_migrate=_env_bool("AUTO_MIGRATE", defaults.auto_migrate),
+        read_database_url=os.getenv("READ_DATABASE_URL") or defaults.read_database_url,
+        read_your_writes_seconds=float(
+            os.getenv("READ_YOUR_WRITES_SECONDS", defaults.read_your_writes_seconds)
+        ),
+        shard_database_urls=tuple(
+            url.strip() for url in os.getenv("SHARD_DATABASE_URLS", "").split(",") if url.strip()
+        ),
+        database_wal=_env_bool("DATABASE_WAL", defaults.database_wal),
         secret_key=os.getenv("SECRET_KEY", defaults.secret_key),
         access_token_expire_minutes=int(
             os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", defaults.access_token_expire_minutes)
         ),
         algorithm=os.getenv("AUTH_ALGORITHM", defaults.algorithm),
+        admission_control_enabled=_env_bool(
+            "ADMISSION_CONTROL_ENABLED", defaults.admission_control_enabled
+        ),
+        admission_max_concurrency=int(
+            os.getenv("ADMISSION_MAX_CONCURRENCY", defaults.admission_max_concurrency)
+        ),
+        admission_max_concurrency_per_user=int(
+            os.getenv("ADMISSION_MAX_CONCURRENCY_PER_USER", defaults.admission_max_concurrency_per_user)
+        ),
+        admission_auth_concurrency=int(
+            os.getenv("ADMISSION_AUTH_CONCURRENCY", defaults.admission_auth_concurrency)
+        ),
+        admission_read_concurrency=int(
+            os.getenv("ADMISSION_READ_CONCURRENCY", defaults.admission_read_concurrency)
+        ),
+        admission_write_concurrency=int(
+            os.getenv("ADMISSION_WRITE_CONCURRENCY", defaults.admission_write_concurrency)
+        ),
+        admission_max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", defaults.admission_max_queue)),
+        admission_queue_timeout_seconds=float(
+            os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", defaults.admission_queue_timeout_seconds)
+        ),
+        admission_retry_after_seconds=int(
+            os.getenv("ADMISSION_RETRY_AFTER_SECONDS", defaults.admission_retry_after_seconds)
+        ),
+        compression_enabled=_env_bool("COMPRESSION_ENABLED", defaults.compression_enabled),
+        compression_minimum_size=int(
+            os.getenv("COMPRESSION_MINIMUM_SIZE", defaults.compression_minimum_size)
+        ),
+        websocket_heartbeat_interval_seconds=float(
+            os.getenv(
+                "WEBSOCKET_HEARTBEAT_INTERVAL_SECONDS", defaults.websocket_heartbeat_interval_seconds
+            )
+        ),
+        websocket_heartbeat_timeout_seconds=float(
+            os.getenv("WEBSOCKET_HEARTBEAT_TIMEOUT_SECONDS", defaults.websocket_heartbeat_timeout_seconds)
+        ),
+        websocket_max_connections=int(
+            os.getenv("WEBSOCKET_MAX_CONNECTIONS", defaults.websocket_max_connections)
+        ),
+        websocket_max_connections_per_user=int(
+            os.getenv("WEBSOCKET_MAX_CONNECTIONS_PER_USER", defaults.websocket_max_connections_per_user)
+        ),
+        sse_event_buffer_size=int(os.getenv("SSE_EVENT_BUFFER_SIZE", defaults.sse_event_buffer_size)),
+        sse_keepalive_seconds=float(os.getenv("SSE_KEEPALIVE_SECONDS", defaults.sse_keepalive_seconds)),
+        task_cache_enabled=_env_bool("TASK_CACHE_ENABLED", defaults.task_cache_enabled),
+        task_cache_max_bytes=int(os.getenv("TASK_CACHE_MAX_BYTES", defaults.task_cache_max_bytes)),
+        read_model_enabled=_env_bool("READ_MODEL_ENABLED", defaults.read_model_enabled),
+        read_model_max_bytes=int(os.getenv("READ_MODEL_MAX_BYTES", defaults.read_model_max_bytes)),
+        archive_enabled=_env_bool("ARCHIVE_ENABLED", defaults.archive_enabled),
+        archive_after_days=float(os.getenv("ARCHIVE_AFTER_DAYS", defaults.archive_after_days)),
+        archive_interval_seconds=float(
+            os.getenv("ARCHIVE_INTERVAL_SECONDS", defaults.archive_interval_seconds)
+        ),
+        archive_batch_size=int(os.getenv("ARCHIVE_BATCH_SIZE", defaults.archive_batch_size)),
+        reminders_enabled=_env_bool("REMINDERS_ENABLED", defaults.reminders_enabled),
+        reminder_window_days=int(os.getenv("REMINDER_WINDOW_DAYS", defaults.reminder_window_days)),
+        reminder_batch_size=int(os.getenv("REMINDER_BATCH_SIZE", defaults.reminder_batch_size)),
+        slow_query_log_enabled=_env_bool("SLOW_QUERY_LOG_ENABLED", defaults.slow_query_log_enabled),
+        slow_query_threshold_ms=float(
+            os.getenv("SLOW_QUERY_THRESHOLD_MS", defaults.slow_query_threshold_ms)
+        ),
+        profiling_enabled=_env_bool("PROFILING_ENABLED", defaults.profiling_enabled),
+        profiling_token=os.getenv("PROFILING_TOKEN") or defaults.profiling_token,
+        profiling_sample_rate=float(
+            os.getenv("PROFILING_SAMPLE_RATE", defaults.profiling_sample_rate)
+        ),
+        profiling_directory=os.getenv("PROFILING_DIRECTORY", defaults.profiling_directory),
+        profiling_max_profiles=int(
+            os.getenv("PROFILING_MAX_PROFILES", defaults.profiling_max_profiles)
+        ),
+        memory_diagnostics_enabled=_env_bool(
+            "MEMORY_DIAGNOSTICS_ENABLED", defaults.memory_diagnostics_enabled
+        ),
+        memory_diagnostics_token=os.getenv("MEMORY_DIAGNOSTICS_TOKEN")
+        or defaults.memory_diagnostics_token,
+        memory_snapshot_interval_seconds=float(
+            os.getenv("MEMORY_SNAPSHOT_INTERVAL_SECONDS", defaults.memory_snapshot_interval_seconds)
+        ),
+        memory_snapshot_top_n=int(os.getenv("MEMORY_SNAPSHOT_TOP_N", defaults.memory_snapshot_top_n)),
+        memory_trace_frames=int(os.getenv("MEMORY_TRACE_FRAMES", defaults.memory_trace_frames)),
+        memory_snapshot_directory=os.getenv(
+            "MEMORY_SNAPSHOT_DIRECTORY", defaults.memory_snapshot_directory
+        ),
+        memory_max_snapshots=int(os.getenv("MEMORY_MAX_SNAPSHOTS", defaults.memory_max_snapshots)),
+        backup_enabled=_env_bool("BACKUP_ENABLED", defaults.backup_enabled),
+        backup_token=os.getenv("BACKUP_TOKEN") or defaults.backup_token,
+        backup_directory=os.getenv("BACKUP_DIRECTORY", defaults.backup_directory),
+        backup_interval_seconds=float(
+            os.getenv("BACKUP_INTERVAL_SECONDS", defaults.backup_interval_seconds)
+        ),
+        backup_max_backups=int(os.getenv("BACKUP_MAX_BACKUPS", defaults.backup_max_backups)),
+        backup_step_pages=int(os.getenv("BACKUP_STEP_PAGES", defaults.backup_step_pages)),
+        backup_step_sleep_seconds=float(
+            os.getenv("BACKUP_STEP_SLEEP_SECONDS", defaults.backup_step_sleep_seconds)
+        ),
+        server_host=os.getenv("SERVER_HOST", defaults.server_host),
+        server_port=int(os.getenv("SERVER_PORT", defaults.server_port)),
+        server_workers=int(os.getenv("SERVER_WORKERS", defaults.server_workers)),
+        server_keep_alive_seconds=int(
+            os.getenv("SERVER_KEEP_ALIVE_SECONDS", defaults.server_keep_alive_seconds)
+        ),
+        server_backlog=int(os.getenv("SERVER_BACKLOG", defaults.server_backlog)),
+        server_max_requests=int(os.getenv("SERVER_MAX_REQUESTS", defaults.server_max_requests)),
+        server_max_requests_jitter=int(
+            os.getenv("SERVER_MAX_REQUESTS_JITTER", defaults.server_max_requests_jitter)
+        ),
+        server_graceful_timeout_seconds=int(
+            os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", defaults.server_graceful_timeout_seconds)
+        ),
+        server_proxy_headers=_env_bool("SERVER_PROXY_HEADERS", defaults.server_proxy_headers),
     )
 
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def packb(payload: Any) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def unpackb(payload: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.unpackb(payload, raw=False)
+
+
+def accepts_msgpack(accept_header: str) -> bool:
+    if msgpack is None or not accept_header:
+        return False
+    for media_range in accept_header.split(","):
+        media_type, _, params = media_range.strip().partition(";")
+        if media_type.strip().lower() in MSGPACK_MEDIA_TYPES:
+            return _quality(params) > 0
+    return False
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
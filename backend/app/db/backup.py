@@ -0,0 +1,232 @@
+"""Back up and restore the SQLite databases while the app keeps serving.
+
+Run from ``backend/`` with the app's DATABASE_URL and SHARD_DATABASE_URLS::
+
+    python -m app.db.backup                          # back up every database to BACKUP_DIRECTORY
+    python -m app.db.backup --to /mnt/backups        # ... or to another directory
+    python -m app.db.backup --list
+    python -m app.db.backup --restore backups/tasktrack-20260101T030000.db
+    python -m app.db.backup --restore backups/shard1-20260101T030000.db --database sqlite:///./shard1.db
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import Settings, get_settings
+
+BACKUP_SUFFIX = ".db"
+
+Progress = Callable[[int, int], None]
+
+
+class BackupError(RuntimeError):
+    pass
+
+
+class BackupCancelled(BackupError):
+    pass
+
+
+class _Restarted(Exception):
+    pass
+
+
+def sqlite_path(database_url: str) -> Path | None:
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    return Path(url.database)
+
+
+def backup_sqlite(
+    source: str | Path,
+    target: str | Path,
+    *,
+    step_pages: int = 256,
+    step_sleep_seconds: float = 0.01,
+    progress: Progress | None = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> dict[str, Any]:
+    """Copy ``source`` to ``target`` with the online backup API, ``step_pages`` at a time.
+
+    Each step holds the source's read lock only while it copies, and the pause after it
+    lets writers in. In WAL mode one read transaction spans the whole copy, so the backup
+    is a consistent snapshot that never blocks writers and never restarts. In rollback
+    journal mode SQLite restarts the copy whenever another connection writes; each restart
+    doubles the step so a busy database still finishes, at the cost of longer lock holds.
+    The copy is written next to ``target``, checked and then renamed into place.
+    """
+    target = Path(target)
+    partial = target.with_name(target.name + ".partial")
+    partial.unlink(missing_ok=True)
+    started = time.perf_counter()
+    # isolation_level=None so the explicit BEGIN below is the only transaction.
+    connection = sqlite3.connect(source, isolation_level=None, timeout=30)
+    destination = sqlite3.connect(partial)
+    pages = step_pages
+    restarts = 0
+    total = 0
+    try:
+        snapshot = connection.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        if snapshot:
+            connection.execute("BEGIN")
+            connection.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        while True:
+            last_remaining: int | None = None
+
+            def _step(_status: int, remaining: int, pagecount: int) -> None:
+                nonlocal last_remaining, total
+                total = pagecount
+                if last_remaining is not None and remaining >= last_remaining:
+                    raise _Restarted
+                last_remaining = remaining
+                if progress is not None:
+                    progress(pagecount - remaining, pagecount)
+                if cancelled is not None and cancelled():
+                    raise BackupCancelled(f"Backup of {source} was cancelled")
+                if remaining:
+                    time.sleep(step_sleep_seconds)
+
+            try:
+                connection.backup(destination, pages=pages, progress=_step)
+                break
+            except _Restarted:
+                restarts += 1
+                pages *= 2
+        if snapshot:
+            connection.execute("COMMIT")
+        # A standalone file; a copy of a WAL database would otherwise open in WAL mode.
+        destination.execute("PRAGMA journal_mode = DELETE")
+        check = destination.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise BackupError(f"Backup of {source} failed its integrity check: {check}")
+    except BaseException:
+        destination.close()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        connection.close()
+    destination.close()
+    os.replace(partial, target)
+    return {
+        "database": str(source),
+        "path": str(target),
+        "bytes": target.stat().st_size,
+        "pages": total,
+        "restarts": restarts,
+        "snapshot": snapshot,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def restore_sqlite(backup: str | Path, database: str | Path) -> dict[str, Any]:
+    """Replace ``database``'s contents with ``backup`` in a single transaction.
+
+    Readers see either the old or the restored database, never a mix, and writers wait
+    for the copy. Stop the app first: its caches would keep serving the old lists.
+    """
+    backup = Path(backup)
+    if not backup.is_file():
+        raise BackupError(f"Backup {backup} does not exist")
+    source = sqlite3.connect(f"file:{backup}?mode=ro", uri=True)
+    try:
+        check = source.execute("PRAGMA quick_check").fetchone()[0]
+        if check != "ok":
+            raise BackupError(f"Backup {backup} failed its integrity check: {check}")
+        destination = sqlite3.connect(database, timeout=30)
+        try:
+            source.backup(destination)
+        finally:
+            destination.close()
+    finally:
+        source.close()
+    return {"database": str(database), "restored_from": str(backup)}
+
+
+def backup_name(database: Path, now: float | None = None) -> str:
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now))
+    return f"{database.stem}-{stamp}{BACKUP_SUFFIX}"
+
+
+def list_backups(directory: str | Path, database: Path | None = None) -> list[Path]:
+    path = Path(directory)
+    if not path.is_dir():
+        return []
+    pattern = f"{database.stem}-*{BACKUP_SUFFIX}" if database is not None else f"*{BACKUP_SUFFIX}"
+    return sorted(path.glob(pattern), key=lambda item: item.name, reverse=True)
+
+
+def prune_backups(directory: str | Path, database: Path, keep: int) -> list[Path]:
+    stale = list_backups(directory, database)[keep:] if keep > 0 else []
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return stale
+
+
+def settings_databases(settings: Settings) -> list[Path]:
+    # Shards are backed up one after another, so together they are not one point in time.
+    urls = [settings.database_url, *settings.shard_database_urls]
+    return [path for path in map(sqlite_path, urls) if path is not None]
+
+
+def _print_progress(database: Path) -> Progress:
+    reported = -1
+
+    def _report(copied: int, total: int) -> None:
+        nonlocal reported
+        percent = copied * 100 // total if total else 100
+        if percent // 10 != reported // 10:
+            reported = percent
+            print(f"{database.name}: {percent}% of {total} pages", file=sys.stderr)
+
+    return _report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--to", help="backup directory (default: BACKUP_DIRECTORY)")
+    parser.add_argument("--list", action="store_true", help="list existing backups")
+    parser.add_argument("--restore", metavar="BACKUP", help="restore this backup file")
+    parser.add_argument(
+        "--database", help="database URL to restore into (default: DATABASE_URL)"
+    )
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    directory = Path(args.to or settings.backup_directory)
+    if args.list:
+        for path in list_backups(directory):
+            print(json.dumps({"path": str(path), "bytes": path.stat().st_size}))
+        return
+    if args.restore:
+        database = sqlite_path(args.database or settings.database_url)
+        if database is None:
+            parser.error("only SQLite file databases can be restored")
+        print(json.dumps(restore_sqlite(args.restore, database)))
+        return
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for database in settings_databases(settings):
+        result = backup_sqlite(
+            database,
+            directory / backup_name(database),
+            step_pages=settings.backup_step_pages,
+            step_sleep_seconds=settings.backup_step_sleep_seconds,
+            progress=_print_progress(database),
+        )
+        prune_backups(directory, database, settings.backup_max_backups)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
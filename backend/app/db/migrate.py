@@ -0,0 +1,65 @@
+"""Apply pending schema migrations to the database and every shard.
+
+Run from ``backend/`` with the app's DATABASE_URL and SHARD_DATABASE_URLS::
+
+    python -m app.db.migrate           # apply pending migrations
+    python -m app.db.migrate --check   # exit non-zero if any database is behind
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from app.core.config import Settings, get_settings
+from app.db import models  # noqa: F401
+from app.db.base import Base
+from app.db.migrations import LATEST_VERSION, SchemaOutOfDate, applied_versions, check_current, migrate
+from app.db.session import create_engine_from_settings, create_shard_engines_from_settings
+from app.db.shards import ShardRouter
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only report; do not migrate")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    if args.check:
+        behind = False
+        engines = [
+            create_engine_from_settings(settings),
+            *create_shard_engines_from_settings(settings),
+        ]
+        for engine in engines:
+            try:
+                check_current(engine)
+            except SchemaOutOfDate as exc:
+                behind = True
+                print(exc, file=sys.stderr)
+        sys.exit(1 if behind else 0)
+
+    for database, versions in migrate_databases(settings).items():
+        print(json.dumps({"database": database, "applied": versions, "version": LATEST_VERSION}))
+
+
+def migrate_databases(settings: Settings) -> dict[str, list[int]]:
+    directory = create_engine_from_settings(settings)
+    shard_engines = create_shard_engines_from_settings(settings)
+    applied = {directory: migrate(directory, Base.metadata)}
+    if shard_engines:
+        router = ShardRouter(directory, shard_engines)
+        before = {engine: applied_versions(engine) for engine in shard_engines}
+        router.create_all()
+        for engine in shard_engines:
+            applied[engine] = sorted(applied_versions(engine) - before[engine])
+    for engine in applied:
+        engine.dispose()
+    return {
+        engine.url.render_as_string(hide_password=True): versions
+        for engine, versions in applied.items()
+    }
+
+
+if __name__ == "__main__":
+    main()
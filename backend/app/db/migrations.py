@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
+
+_migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+)
+
+Migration = tuple[int, str, Callable[[Connection], None]]
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def _columns(connection: Connection, table: str) -> set[str] | None:
+    # Shard databases carry only the list tables and the directory may carry only users.
+    inspector = inspect(connection)
+    if not inspector.has_table(table):
+        return None
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def _add_missing_columns(connection: Connection) -> None:
+    additions = (
+        ("task_lists", "version", "INTEGER NOT NULL DEFAULT 0"),
+        ("tasks", "reminded_for", "DATE"),
+        ("users", "shard", "INTEGER"),
+    )
+    for table, column, definition in additions:
+        columns = _columns(connection, table)
+        if columns is not None and column not in columns:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+
+
+def _add_performance_indexes(connection: Connection) -> None:
+    indexes = (
+        ("tasks", "ix_tasks_list_id_position", "list_id, position"),
+        ("tasks", "ix_tasks_due_date", "due_date"),
+        ("task_lists", "ix_task_lists_owner_id", "owner_id"),
+    )
+    for table, name, columns in indexes:
+        if _columns(connection, table) is not None:
+            connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+_ENUM_CODES = {
+    "status": ("pending", "in_progress", "completed"),
+    "priority": ("low", "medium", "high"),
+}
+_TEXT_ENUM_COLUMN = re.compile(r"\b(status|priority)\s+VARCHAR\(\d+\)", re.IGNORECASE)
+_TABLE_NAME = re.compile(r'^(CREATE TABLE\s+)"?(\w+)"?', re.IGNORECASE)
+
+
+def _store_enums_as_codes(connection: Connection) -> None:
+    # SQLite cannot change a column's type in place, so each table is rebuilt from its own
+    # stored DDL with only the two enum columns retyped; whatever else that database's copy
+    # of the table carries (shard AUTOINCREMENT, columns added by migration 1) is kept.
+    for table in ("tasks", "archived_tasks"):
+        if _columns(connection, table) is None:
+            continue
+        create_sql = connection.scalar(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table},
+        )
+        if not _TEXT_ENUM_COLUMN.search(create_sql):
+            continue
+        index_sql = connection.scalars(
+            text(
+                "SELECT sql FROM sqlite_master"
+                " WHERE type = 'index' AND tbl_name = :name AND sql IS NOT NULL"
+            ),
+            {"name": table},
+        ).all()
+        sequence = _sequence(connection, table)
+        rebuilt = f"{table}_rebuilt"
+        connection.execute(
+            text(
+                _TABLE_NAME.sub(
+                    rf"\g<1>{rebuilt}", _TEXT_ENUM_COLUMN.sub(r"\1 SMALLINT", create_sql), count=1
+                )
+            )
+        )
+        columns = [column["name"] for column in inspect(connection).get_columns(table)]
+        converted = [
+            "CASE {0} {1} END".format(
+                name,
+                " ".join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(_ENUM_CODES[name])),
+            )
+            if name in _ENUM_CODES
+            else name
+            for name in columns
+        ]
+        connection.execute(
+            text(
+                f"INSERT INTO {rebuilt} ({', '.join(columns)}) "
+                f"SELECT {', '.join(converted)} FROM {table}"
+            )
+        )
+        # Nothing references these tables by foreign key, so dropping them cascades nowhere.
+        connection.execute(text(f"DROP TABLE {table}"))
+        connection.execute(text(f"ALTER TABLE {rebuilt} RENAME TO {table}"))
+        for statement in index_sql:
+            connection.execute(text(statement))
+        if sequence is not None and (_sequence(connection, table) or 0) < sequence:
+            # Keep a shard's reserved id range rather than restarting after the copied rows.
+            connection.execute(
+                text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table}
+            )
+            connection.execute(
+                text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                {"name": table, "seq": sequence},
+            )
+
+
+def _add_recurrence(connection: Connection) -> None:
+    # The task_occurrences table is new, so create_all has already made it.
+    columns = _columns(connection, "tasks")
+    if columns is not None and "recurrence" not in columns:
+        connection.execute(text("ALTER TABLE tasks ADD COLUMN recurrence JSON"))
+
+
+_INLINE_ID_KEY = re.compile(r"\bid\s+INTEGER\s+PRIMARY\s+KEY\b", re.IGNORECASE)
+_ID_COLUMN = re.compile(r"\bid\s+INTEGER\s+NOT\s+NULL\b", re.IGNORECASE)
+_ID_KEY_CONSTRAINT = re.compile(
+    r"\s*PRIMARY\s+KEY\s*\(\s*id\s*\)\s*,|,\s*PRIMARY\s+KEY\s*\(\s*id\s*\)", re.IGNORECASE
+)
+
+
+def _autoincrement_task_ids(connection: Connection) -> None:
+    # Archiving deletes a task's row. Without AUTOINCREMENT SQLite hands the newest archived
+    # id to the next task, and archiving that task later collides in archived_tasks.
+    if _columns(connection, "tasks") is None:
+        return
+    create_sql = connection.scalar(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'")
+    )
+    if "AUTOINCREMENT" in create_sql.upper():
+        return
+    if _INLINE_ID_KEY.search(create_sql):
+        rebuilt_sql = _INLINE_ID_KEY.sub("id INTEGER PRIMARY KEY AUTOINCREMENT", create_sql, count=1)
+    else:
+        rebuilt_sql = _ID_KEY_CONSTRAINT.sub("", create_sql, count=1)
+        rebuilt_sql = _ID_COLUMN.sub("id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT", rebuilt_sql, count=1)
+    index_sql = connection.scalars(
+        text(
+            "SELECT sql FROM sqlite_master"
+            " WHERE type = 'index' AND tbl_name = 'tasks' AND sql IS NOT NULL"
+        )
+    ).all()
+    # Dropping tasks cascades into task_occurrences when foreign keys are enforced, and the
+    # pragma cannot be turned off inside the migration's transaction; keep a copy instead.
+    occurrences = _columns(connection, "task_occurrences") is not None
+    if occurrences:
+        connection.execute(
+            text("CREATE TEMP TABLE task_occurrences_kept AS SELECT * FROM task_occurrences")
+        )
+    connection.execute(text(_TABLE_NAME.sub(r"\g<1>tasks_rebuilt", rebuilt_sql, count=1)))
+    columns = ", ".join(column["name"] for column in inspect(connection).get_columns("tasks"))
+    connection.execute(text(f"INSERT INTO tasks_rebuilt ({columns}) SELECT {columns} FROM tasks"))
+    connection.execute(text("DROP TABLE tasks"))
+    connection.execute(text("ALTER TABLE tasks_rebuilt RENAME TO tasks"))
+    for statement in index_sql:
+        connection.execute(text(statement))
+    if occurrences:
+        # OR IGNORE: without enforced foreign keys the drop left the rows in place.
+        connection.execute(
+            text("INSERT OR IGNORE INTO task_occurrences SELECT * FROM task_occurrences_kept")
+        )
+        connection.execute(text("DROP TABLE task_occurrences_kept"))
+    archived = _columns(connection, "archived_tasks") is not None
+    highest = connection.scalar(
+        text(
+            "SELECT max(id) FROM (SELECT max(id) AS id FROM tasks"
+            + (" UNION ALL SELECT max(id) FROM archived_tasks" if archived else "")
+            + ")"
+        )
+    )
+    if highest is not None:
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'tasks'"))
+        connection.execute(
+            text("INSERT INTO sqlite_sequence (name, seq) VALUES ('tasks', :seq)"), {"seq": highest}
+        )
+
+
+def _sequence(connection: Connection, table: str) -> int | None:
+    # Only databases with an AUTOINCREMENT table have sqlite_sequence at all.
+    if connection.scalar(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'")
+    ) is None:
+        return None
+    return connection.scalar(
+        text("SELECT seq FROM sqlite_sequence WHERE name = :name"), {"name": table}
+    )
+
+
+def _index_archive_candidates(connection: Connection) -> None:
+    # The job_leases table is new, so create_all has already made it in the main database.
+    if _columns(connection, "tasks") is not None:
+        connection.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_tasks_status_updated_at ON tasks (status, updated_at)")
+        )
+
+
+# Append only; a released migration must never change. Each one must tolerate databases
+# that lack some tables (shards, the directory) and schemas created fresh from the models.
+MIGRATIONS: tuple[Migration, ...] = (
+    (1, "add version, reminded_for and shard columns", _add_missing_columns),
+    (2, "index tasks by list and position, due date; lists by owner", _add_performance_indexes),
+    (3, "store task status and priority as small integer codes", _store_enums_as_codes),
+    (4, "add task recurrence rules", _add_recurrence),
+    (5, "never reuse the ids of archived tasks", _autoincrement_task_ids),
+    (6, "index tasks by status and age for the archive sweep", _index_archive_candidates),
+)
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def applied_versions(engine: Engine) -> set[int]:
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(schema_migrations.name):
+            return set()
+        return set(connection.scalars(select(schema_migrations.c.version)))
+
+
+def migrate(engine: Engine, metadata: MetaData) -> list[int]:
+    with engine.connect() as connection:
+        fresh = not inspect(connection).get_table_names()
+    # create_all only adds missing tables; existing ones are brought forward below.
+    metadata.create_all(engine)
+    _migration_metadata.create_all(engine)
+    applied: list[int] = []
+    done = applied_versions(engine)
+    for version, name, upgrade in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            with engine.begin() as connection:
+                # Recording the version first takes SQLite's write lock, so a second worker
+                # migrating concurrently fails here instead of repeating the upgrade.
+                connection.execute(insert(schema_migrations).values(version=version, name=name))
+                if not fresh:
+                    upgrade(connection)
+        except IntegrityError:
+            continue
+        applied.append(version)
+    return applied
+
+
+def check_current(engine: Engine) -> None:
+    missing = sorted({version for version, _, _ in MIGRATIONS} - applied_versions(engine))
+    if missing:
+        raise SchemaOutOfDate(
+            f"Database {engine.url.render_as_string(hide_password=True)} is missing schema "
+            f"migrations {missing}; run `python -m app.db.migrate`"
+        )
@@ -7,6 +7,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -16,6 +17,7 @@ from sqlalchemy import (
 from sqlalchemy.orm import relationship
 
 from .base import Base
+from .types import EnumCode
 
 
 class TaskStatusEnum(str, Enum):
@@ -37,12 +39,15 @@ class User(Base):
     email = Column(String(255), unique=True, nullable=False, index=True)
     full_name = Column(String(255), nullable=True)
     hashed_password = Column(String(255), nullable=False)
+    # Index into SHARD_DATABASE_URLS; NULL keeps the user's lists in the directory database.
+    shard = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     lists = relationship(
         "TaskList",
         back_populates="owner",
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
 
@@ -51,7 +56,10 @@ class TaskList(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     owner = relationship("User", back_populates="lists")
@@ -60,25 +68,39 @@ class TaskList(Base):
         back_populates="task_list",
         cascade="all, delete-orphan",
         order_by="Task.position",
+        passive_deletes=True,
     )
+    archived_tasks = relationship("ArchivedTask", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Serves every per-list read (ordered by position) and the list_id foreign key lookups.
+    # AUTOINCREMENT keeps ids of archived tasks from being handed out again.
+    __table_args__ = (
+        Index("ix_tasks_list_id_position", "list_id", "position"),
+        # The archive sweep looks for completed tasks by age.
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    due_date = Column(Date, nullable=True)
-    status = Column(String(50), nullable=False, default=TaskStatusEnum.pending.value)
+    due_date = Column(Date, nullable=True, index=True)
+    status = Column(EnumCode(TaskStatusEnum), nullable=False, default=TaskStatusEnum.pending.value)
     priority = Column(
-        String(50),
+        EnumCode(TaskPriorityEnum),
         nullable=False,
         default=TaskPriorityEnum.medium.value,
     )
     tags = Column(JSON, nullable=False, default=list)
     list_id = Column(Integer, ForeignKey("task_lists.id", ondelete="CASCADE"), nullable=False)
     position = Column(Integer, nullable=False, default=0)
+    reminded_for = Column(Date, nullable=True)
+    # A recurring series: one row whose due_date is the first occurrence and whose rule is
+    # expanded at read time; see app/services/recurrence.py.
+    recurrence = Column(JSON(none_as_null=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
@@ -86,3 +108,46 @@ class Task(Base):
 
     task_list = relationship("TaskList", back_populates="tasks")
 
+
+class TaskOccurrence(Base):
+    """An occurrence of a recurring task that was changed; untouched ones have no row."""
+
+    __tablename__ = "task_occurrences"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    occurrence_date = Column(Date, primary_key=True)
+    list_id = Column(
+        Integer, ForeignKey("task_lists.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    status = Column(EnumCode(TaskStatusEnum), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+
+class ArchivedTask(Base):
+    __tablename__ = "archived_tasks"
+    __table_args__ = (Index("ix_archived_tasks_list_id_id", "list_id", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    due_date = Column(Date, nullable=True)
+    status = Column(EnumCode(TaskStatusEnum), nullable=False)
+    priority = Column(EnumCode(TaskPriorityEnum), nullable=False)
+    tags = Column(JSON, nullable=False, default=list)
+    list_id = Column(Integer, ForeignKey("task_lists.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class JobLease(Base):
+    """Which worker runs a periodic job, and until when; see ArchiveJob."""
+
+    __tablename__ = "job_leases"
+
+    name = Column(String(64), primary_key=True)
+    holder = Column(String(64), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
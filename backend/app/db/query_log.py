@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+_FULL_SCAN = re.compile(r"^SCAN (\w+)")
+_NOT_TABLES = frozenset({"CONSTANT"})
+
+
+class QueryPlan:
+    __slots__ = ("details", "full_scans")
+
+    def __init__(self, details: list[str]) -> None:
+        self.details = details
+        # "SCAN t" visits every row of t, with or without an index providing the order.
+        self.full_scans = frozenset(
+            match.group(1)
+            for match in map(_FULL_SCAN.match, details)
+            if match is not None and match.group(1) not in _NOT_TABLES
+        )
+
+
+class SlowQueryLog:
+    def __init__(self, *, threshold_seconds: float, max_plans: int = 1000) -> None:
+        self.threshold_seconds = threshold_seconds
+        self.max_plans = max_plans
+        self._plans: OrderedDict[str, QueryPlan | None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.slow_total = 0
+        self.full_scan_total = 0
+
+    def install(self, engine) -> None:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+            context._query_started = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, _cursor, statement, parameters, context, executemany) -> None:
+            elapsed = time.perf_counter() - context._query_started
+            if elapsed >= self.threshold_seconds:
+                self._record(conn, statement, parameters, executemany, elapsed)
+
+    def explain(self, connection, statement: str, parameters: Any, executemany: bool = False):
+        # Plans are captured once per distinct statement; parameters only steer SQLite's
+        # choice for range conditions, which the first execution is representative of.
+        with self._lock:
+            if statement in self._plans:
+                self._plans.move_to_end(statement)
+                return self._plans[statement]
+        plan = self._explain(connection, statement, parameters, executemany)
+        with self._lock:
+            self._plans[statement] = plan
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "slow_total": self.slow_total,
+            "full_scan_total": self.full_scan_total,
+            "plans": len(self._plans),
+        }
+
+    def _record(self, connection, statement, parameters, executemany, elapsed) -> None:
+        plan = self.explain(connection, statement, parameters, executemany)
+        self.slow_total += 1
+        if plan is not None and plan.full_scans:
+            self.full_scan_total += 1
+        logger.warning(
+            "Slow query (%.1f ms)%s: %s params=%s plan=%s",
+            elapsed * 1000,
+            f" FULL SCAN of {', '.join(sorted(plan.full_scans))}" if plan and plan.full_scans else "",
+            " ".join(statement.split()),
+            redact_parameters(parameters, executemany),
+            plan.details if plan is not None else None,
+        )
+
+    def _explain(self, connection, statement, parameters, executemany) -> QueryPlan | None:
+        if connection.dialect.name != "sqlite":
+            return None
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return QueryPlan([row[3] for row in cursor.fetchall()])
+        except Exception:
+            logger.debug("Could not explain %s", statement, exc_info=True)
+            return None
+        finally:
+            cursor.close()
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> str:
+    if executemany:
+        return f"<{len(parameters)} rows>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: ?" for key in parameters) + "}"
+    return f"<{len(parameters or ())} redacted>"
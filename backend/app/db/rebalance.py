@@ -0,0 +1,134 @@
+"""Move users' task lists to another shard database.
+
+Run from ``backend/`` with the same DATABASE_URL and SHARD_DATABASE_URLS as the app::
+
+    python -m app.db.rebalance --dry-run          # users not on their placement shard
+    python -m app.db.rebalance                    # move all of them
+    python -m app.db.rebalance --user 42 --to 1   # move one user to a chosen shard
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Iterable
+
+from sqlalchemy import Connection, delete, insert, select, update
+
+from app.core.config import get_settings
+from app.db import models
+from app.db.migrations import check_current
+from app.db.session import create_engine_from_settings, create_shard_engines_from_settings
+from app.db.shards import SHARDED_MODELS, ShardRouter
+
+_users = models.User.__table__
+_task_lists = models.TaskList.__table__
+
+
+def plan_moves(
+    router: ShardRouter, *, user_ids: Iterable[int] | None = None, target: int | None = None
+) -> list[tuple[int, int | None, int]]:
+    statement = select(_users.c.id, _users.c.shard).order_by(_users.c.id)
+    if user_ids is not None:
+        statement = statement.where(_users.c.id.in_(list(user_ids)))
+    with router.directory.connect() as connection:
+        users = connection.execute(statement).all()
+    moves = []
+    for user_id, shard in users:
+        destination = router.assign(user_id) if target is None else target
+        if shard != destination:
+            moves.append((user_id, shard, destination))
+    return moves
+
+
+def move_user(router: ShardRouter, user_id: int, target: int, *, attempts: int = 3) -> int:
+    if not 0 <= target < len(router):
+        raise ValueError(f"Shard {target} does not exist")
+    with router.directory.connect() as connection:
+        user = connection.execute(select(_users.c.shard).where(_users.c.id == user_id)).first()
+    if user is None:
+        raise LookupError(f"User {user_id} not found")
+    if user.shard == target:
+        return 0
+    source = router.directory if user.shard is None else router.engines[user.shard]
+    destination = router.engines[target]
+
+    for _ in range(attempts):
+        # Copy without blocking writers, then confirm under the source's write lock that no
+        # list changed meanwhile; every write bumps its list's version.
+        with source.connect() as connection:
+            versions = _versions(connection, user_id)
+            rows = {model: _owned_rows(connection, model, user_id) for model in SHARDED_MODELS}
+        with destination.begin() as connection:
+            _delete_lists(connection, versions)
+            for model, model_rows in rows.items():
+                if model_rows:
+                    connection.execute(insert(model.__table__), model_rows)
+        with source.begin() as connection:
+            connection.execute(
+                update(_task_lists)
+                .where(_task_lists.c.owner_id == user_id)
+                .values(version=_task_lists.c.version)
+            )
+            if _versions(connection, user_id) != versions:
+                with destination.begin() as cleanup:
+                    _delete_lists(cleanup, versions)
+                continue
+            assign = update(_users).where(_users.c.id == user_id).values(shard=target)
+            if source is router.directory:
+                connection.execute(assign)
+            else:
+                with router.directory.begin() as directory:
+                    directory.execute(assign)
+            # Tasks and archived tasks follow through ON DELETE CASCADE.
+            connection.execute(delete(_task_lists).where(_task_lists.c.owner_id == user_id))
+        router.ensure_range(target)
+        return len(versions)
+    raise RuntimeError(f"Lists of user {user_id} kept changing; try again later")
+
+
+def _versions(connection: Connection, user_id: int) -> dict[int, int]:
+    statement = select(_task_lists.c.id, _task_lists.c.version).where(
+        _task_lists.c.owner_id == user_id
+    )
+    return {list_id: version for list_id, version in connection.execute(statement)}
+
+
+def _owned_rows(connection: Connection, model, user_id: int) -> list[dict]:
+    table = model.__table__
+    if model is models.TaskList:
+        condition = table.c.owner_id == user_id
+    else:
+        owned = select(_task_lists.c.id).where(_task_lists.c.owner_id == user_id)
+        condition = table.c.list_id.in_(owned)
+    return [dict(row) for row in connection.execute(select(table).where(condition)).mappings()]
+
+
+def _delete_lists(connection: Connection, list_ids: Iterable[int]) -> None:
+    list_ids = list(list_ids)
+    if list_ids:
+        connection.execute(delete(_task_lists).where(_task_lists.c.id.in_(list_ids)))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", type=int, action="append", help="limit to these user ids")
+    parser.add_argument("--to", type=int, help="target shard (default: each user's placement)")
+    parser.add_argument("--dry-run", action="store_true", help="only print the planned moves")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    shard_engines = create_shard_engines_from_settings(settings)
+    if not shard_engines:
+        parser.error("SHARD_DATABASE_URLS is not set")
+    directory = create_engine_from_settings(settings)
+    router = ShardRouter(directory, shard_engines)
+    check_current(directory)
+    router.create_all()
+
+    for user_id, source, target in plan_moves(router, user_ids=args.user, target=args.to):
+        moved = None if args.dry_run else move_user(router, user_id, target)
+        print(json.dumps({"user_id": user_id, "from": source, "to": target, "lists": moved}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,165 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import sqlite3
+import time
+import weakref
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import Settings
 
+if TYPE_CHECKING:
+    from app.db.shards import ShardRouter
+
 
 def create_engine_from_settings(settings: Settings):
-    connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-    return create_engine(settings.database_url, connect_args=connect_args)
+    return _create_engine(settings.database_url, wal=settings.database_wal)
+
+
+def create_read_engine_from_settings(settings: Settings):
+    if not settings.read_database_url:
+        return None
+    engine = _create_engine(settings.read_database_url)
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine, "connect")
+        def _enable_query_only(dbapi_connection, _connection_record) -> None:
+            dbapi_connection.execute("PRAGMA query_only = ON")
+
+    return engine
+
+
+def create_shard_engines_from_settings(settings: Settings) -> list:
+    return [_create_engine(url, wal=settings.database_wal) for url in settings.shard_database_urls]
+
+
+def _create_engine(database_url: str, *, wal: bool = False):
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    if engine.dialect.name == "sqlite":
+        enable_sqlite_foreign_keys(engine)
+        if wal:
+            enable_sqlite_wal(engine)
+    return engine
+
+
+def enable_sqlite_foreign_keys(engine) -> None:
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are enabled per connection.
+    @event.listens_for(engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, _connection_record) -> None:
+        dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+
+def enable_sqlite_wal(engine) -> None:
+    # Readers, including online backups, then work from a snapshot and never block writers.
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, _connection_record) -> None:
+        dbapi_connection.execute("PRAGMA journal_mode = WAL")
 
 
 def create_session_factory(engine):
-    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+class RoutingSessionFactory:
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replica: sessionmaker | None = None,
+        *,
+        read_your_writes_seconds: float = 5.0,
+        shards: ShardRouter | None = None,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.shards = shards
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._last_write: dict[int, float] = {}
+        self.live_sessions: weakref.WeakSet[Session] | None = None
+
+    def __call__(self) -> Session:
+        session = self.primary()
+        event.listen(session, "after_commit", self._on_commit)
+        if self.live_sessions is not None:
+            self.live_sessions.add(session)
+        return session
+
+    def reader(self, user_id: int | None = None) -> Session:
+        if self.replica is None or self._pinned_to_primary(user_id):
+            return self()
+        session = self.replica()
+        session.info["replica"] = True
+        if self.live_sessions is not None:
+            self.live_sessions.add(session)
+        return session
+
+    def track_sessions(self) -> None:
+        # Off by default so the request path pays nothing unless memory diagnostics are on.
+        if self.live_sessions is None:
+            self.live_sessions = weakref.WeakSet()
+
+    def session_stats(self) -> dict[str, int]:
+        sessions = list(self.live_sessions or ())
+        return {
+            "live": len(sessions),
+            "identity_map_objects": sum(len(session.identity_map) for session in sessions),
+        }
+
+    def bind_owner(self, session: Session, user) -> None:
+        # Users without a shard predate sharding and keep their lists in the directory.
+        if self.shards is not None and user.shard is not None:
+            self.shards.bind(session, user.shard)
+
+    def partitions(self) -> dict[int | None, Callable[[], Session]]:
+        partitions: dict[int | None, Callable[[], Session]] = {None: self}
+        if self.shards is not None:
+            partitions.update(enumerate(self.shards.session_factories))
+        return partitions
+
+    def record_write(self, user_id: int) -> None:
+        now = time.monotonic()
+        if len(self._last_write) > 1024:
+            horizon = now - self.read_your_writes_seconds
+            self._last_write = {uid: at for uid, at in self._last_write.items() if at > horizon}
+        self._last_write[user_id] = now
+
+    def _pinned_to_primary(self, user_id: int | None) -> bool:
+        if user_id is None:
+            return False
+        written_at = self._last_write.get(user_id)
+        if written_at is None:
+            return False
+        if time.monotonic() - written_at < self.read_your_writes_seconds:
+            return True
+        self._last_write.pop(user_id, None)
+        return False
+
+    def _on_commit(self, session: Session) -> None:
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            self.record_write(user_id)
+
+
+def sync_sqlite_replica(primary_url: str, replica_url: str) -> None:
+    source = sqlite3.connect(make_url(primary_url).database)
+    target = sqlite3.connect(make_url(replica_url).database)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
 
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
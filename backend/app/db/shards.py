@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import Column, Engine, Integer, MetaData, Table, delete, func, insert, select, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import models
+from app.db.migrations import check_current, migrate
+
+SHARDED_MODELS = (models.TaskList, models.Task, models.ArchivedTask, models.TaskOccurrence)
+# Tables whose ids are allocated by the shard; archived tasks keep the id they had as tasks.
+ALLOCATING_TABLES = ("task_lists", "tasks")
+# Each shard hands out ids from its own range so list and task ids stay globally unique:
+# the read model, list cache and notifier are all keyed by list id.
+ID_RANGE_SIZE = 1 << 40
+
+_directory_metadata = MetaData()
+shard_id_ranges = Table(
+    "shard_id_ranges",
+    _directory_metadata,
+    Column("shard", Integer, primary_key=True, autoincrement=False),
+    Column("base", Integer, nullable=False),
+)
+
+
+def shard_metadata() -> MetaData:
+    metadata = MetaData()
+    for model in SHARDED_MODELS:
+        table = model.__table__.to_metadata(metadata)
+        # Owners live in the directory database, so task_lists.owner_id cannot be a foreign key.
+        for constraint in list(table.foreign_key_constraints):
+            if constraint.elements[0].target_fullname.startswith("users."):
+                table.constraints.discard(constraint)
+                for element in constraint.elements:
+                    element.parent.foreign_keys.discard(element)
+                    table.foreign_keys.discard(element)
+        if table.name in ALLOCATING_TABLES:
+            # AUTOINCREMENT makes SQLite honour the seeded sqlite_sequence value.
+            table.dialect_options["sqlite"]["autoincrement"] = True
+    return metadata
+
+
+class ShardRouter:
+    def __init__(self, directory: Engine, engines: Sequence[Engine]) -> None:
+        if not engines:
+            raise ValueError("At least one shard database is required")
+        self.directory = directory
+        self.engines = list(engines)
+        self.session_factories = [
+            sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+            for engine in self.engines
+        ]
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def assign(self, user_id: int) -> int:
+        return user_id % len(self.engines)
+
+    def bind(self, session: Session, shard: int) -> None:
+        engine = self.engines[shard]
+        for model in SHARDED_MODELS:
+            session.bind_mapper(model, engine)
+        session.info["shard"] = shard
+
+    def create_all(self) -> None:
+        _directory_metadata.create_all(self.directory)
+        metadata = shard_metadata()
+        with self.directory.connect() as connection:
+            reserved = set(connection.scalars(select(shard_id_ranges.c.shard)))
+        for shard, engine in enumerate(self.engines):
+            migrate(engine, metadata)
+            if shard not in reserved:
+                self.reserve_range(shard)
+
+    def check_current(self) -> None:
+        for engine in self.engines:
+            check_current(engine)
+
+    def range_base(self, shard: int) -> int | None:
+        with self.directory.connect() as connection:
+            return connection.scalar(
+                select(shard_id_ranges.c.base).where(shard_id_ranges.c.shard == shard)
+            )
+
+    def reserve_range(self, shard: int) -> int:
+        # Ranges are handed out above every range ever reserved, so a shard that received
+        # rows from elsewhere can always move on to ids nobody has used.
+        with self.directory.begin() as connection:
+            highest = connection.scalar(select(func.max(shard_id_ranges.c.base)))
+            base = (highest or 0) + ID_RANGE_SIZE
+            connection.execute(delete(shard_id_ranges).where(shard_id_ranges.c.shard == shard))
+            connection.execute(insert(shard_id_ranges).values(shard=shard, base=base))
+        with self.engines[shard].begin() as connection:
+            for table in ALLOCATING_TABLES:
+                connection.execute(
+                    text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table}
+                )
+                connection.execute(
+                    text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"),
+                    {"name": table, "seq": base},
+                )
+        return base
+
+    def ensure_range(self, shard: int) -> None:
+        # SQLite allocates max(rowid) + 1, so ids copied in from a higher range would make
+        # this shard continue inside another shard's range.
+        base = self.range_base(shard)
+        with self.engines[shard].connect() as connection:
+            highest = max(
+                connection.scalar(text(f"SELECT coalesce(max(id), 0) FROM {table}"))
+                for table in ALLOCATING_TABLES
+            )
+        if base is None or highest >= base + ID_RANGE_SIZE:
+            self.reserve_range(shard)
+
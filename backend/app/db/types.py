@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class EnumCode(TypeDecorator):
+    """Stores a str-valued enum as its declaration index; Python sees the string value.
+
+    Codes are persisted, so members may only ever be appended to the enum.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum: type[Enum]) -> None:
+        super().__init__()
+        self.enum = enum
+        self._codes = {member.value: code for code, member in enumerate(enum)}
+        self._values = tuple(member.value for member in enum)
+
+    def process_bind_param(self, value: Any, dialect) -> int | None:
+        if value is None:
+            return None
+        if isinstance(value, Enum):
+            value = value.value
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {self.enum.__name__}") from None
+
+    def process_result_value(self, value: int | None, dialect) -> str | None:
+        return None if value is None else self._values[value]
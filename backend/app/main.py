@@ -1,19 +1,127 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routes import auth, lists, tasks
+from app.api.routes import (
+    auth,
+    backups,
+    bootstrap,
+    health,
+    lists,
+    memory,
+    metrics,
+    profiles,
+    tasks,
+    transfer,
+)
 from app.api import deps
+from app.api.changes import ChangePublisher
+from app.api.middleware.admission import AdmissionControlMiddleware
+from app.api.middleware.compression import CompressionMiddleware
+from app.api.middleware.profiling import ProfilingMiddleware, capture_profile_sql
 from app.core.config import Settings, get_settings
 from app.db import models  # noqa: F401
+from app.db.backup import settings_databases
 from app.db.base import Base
-from app.db.session import create_engine_from_settings, create_session_factory
+from app.db.query_log import SlowQueryLog
+from app.db.migrations import check_current, migrate
+from app.db.session import (
+    RoutingSessionFactory,
+    create_engine_from_settings,
+    create_read_engine_from_settings,
+    create_session_factory,
+    create_shard_engines_from_settings,
+)
+from app.db.shards import ShardRouter
+from app.services.archive import ArchiveJob
+from app.services.backup import BackupJob
+from app.services.list_cache import TaskListCache
+from app.services.memory import MemoryMonitor
 from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskReadModel
+from app.services.reminders import ReminderScheduler
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
     app_settings = settings or get_settings()
-    app = FastAPI(title=app_settings.app_name)
+    notifier = TaskNotifier(
+        heartbeat_interval=app_settings.websocket_heartbeat_interval_seconds,
+        heartbeat_timeout=app_settings.websocket_heartbeat_timeout_seconds,
+        max_connections=app_settings.websocket_max_connections,
+        max_connections_per_user=app_settings.websocket_max_connections_per_user,
+        event_buffer_size=app_settings.sse_event_buffer_size,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # Schema work waits for startup so importing the app never touches a database file.
+        # The directory keeps the list tables for accounts created before sharding was enabled.
+        if app_settings.auto_migrate:
+            migrate(engine, Base.metadata)
+            if shards is not None:
+                shards.create_all()
+        else:
+            check_current(engine)
+            if shards is not None:
+                shards.check_current()
+        notifier.start()
+        background = [
+            job
+            for job in (
+                app.state.archive_job,
+                app.state.reminders,
+                app.state.memory_monitor,
+                app.state.backup_job,
+            )
+            if job is not None
+        ]
+        for job in background:
+            job.start()
+        app.state.ready = True
+        try:
+            yield
+        finally:
+            # Fail readiness first so load balancers stop routing here while we drain.
+            app.state.ready = False
+            for job in background:
+                await job.stop()
+            await notifier.stop()
+
+    app = FastAPI(title=app_settings.app_name, lifespan=lifespan)
 
+    # Added first so it sits innermost and times the handler, not admission queueing.
+    if app_settings.profiling_enabled:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=app_settings.profiling_directory,
+            token=app_settings.profiling_token,
+            sample_rate=app_settings.profiling_sample_rate,
+            max_profiles=app_settings.profiling_max_profiles,
+        )
+    if app_settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=app_settings.compression_minimum_size,
+        )
+    if app_settings.admission_control_enabled:
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            max_concurrency=app_settings.admission_max_concurrency,
+            max_concurrency_per_user=app_settings.admission_max_concurrency_per_user,
+            class_limits={
+                "auth": app_settings.admission_auth_concurrency,
+                "read": app_settings.admission_read_concurrency,
+                "write": app_settings.admission_write_concurrency,
+            },
+            max_queue=app_settings.admission_max_queue,
+            queue_timeout_seconds=app_settings.admission_queue_timeout_seconds,
+            retry_after_seconds=app_settings.admission_retry_after_seconds,
+            secret_key=app_settings.secret_key,
+            algorithm=app_settings.algorithm,
+        )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -23,16 +131,122 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     )
 
     engine = create_engine_from_settings(app_settings)
-    session_factory = create_session_factory(engine)
+    read_engine = create_read_engine_from_settings(app_settings)
+    shard_engines = create_shard_engines_from_settings(app_settings)
+    shards = ShardRouter(engine, shard_engines) if shard_engines else None
+    session_factory = RoutingSessionFactory(
+        create_session_factory(engine),
+        create_session_factory(read_engine) if read_engine is not None else None,
+        read_your_writes_seconds=app_settings.read_your_writes_seconds,
+        shards=shards,
+    )
     deps.set_session_factory(session_factory)
-    Base.metadata.create_all(bind=engine)
-
+    query_log = (
+        SlowQueryLog(threshold_seconds=app_settings.slow_query_threshold_ms / 1000)
+        if app_settings.slow_query_log_enabled
+        else None
+    )
+    for logged_engine in (engine, read_engine, *shard_engines):
+        if query_log is not None and logged_engine is not None:
+            query_log.install(logged_engine)
+    if app_settings.profiling_enabled:
+        for profiled_engine in (engine, read_engine, *shard_engines):
+            if profiled_engine is not None:
+                capture_profile_sql(profiled_engine)
     app.state.settings = app_settings
-    app.state.task_notifier = TaskNotifier()
+    app.state.engine = engine
+    # Keyed by role so probes and gauges never publish database URLs or file paths.
+    app.state.database_engines = {
+        "primary": engine,
+        **({"replica": read_engine} if read_engine is not None else {}),
+        **{f"shard-{index}": shard_engine for index, shard_engine in enumerate(shard_engines)},
+    }
+    app.state.ready = False
+    app.state.query_log = query_log
+    app.state.task_notifier = notifier
+    app.state.task_cache = (
+        TaskListCache(max_bytes=app_settings.task_cache_max_bytes)
+        if app_settings.task_cache_enabled
+        else None
+    )
+    app.state.read_model = (
+        TaskReadModel(max_bytes=app_settings.read_model_max_bytes)
+        if app_settings.read_model_enabled
+        else None
+    )
+    app.state.archive_job = (
+        ArchiveJob(
+            session_factory.partitions(),
+            older_than=timedelta(days=app_settings.archive_after_days),
+            interval_seconds=app_settings.archive_interval_seconds,
+            batch_size=app_settings.archive_batch_size,
+            notifier=notifier,
+        )
+        if app_settings.archive_enabled
+        else None
+    )
+    app.state.backup_job = (
+        BackupJob(
+            settings_databases(app_settings),
+            directory=app_settings.backup_directory,
+            interval_seconds=app_settings.backup_interval_seconds,
+            max_backups=app_settings.backup_max_backups,
+            step_pages=app_settings.backup_step_pages,
+            step_sleep_seconds=app_settings.backup_step_sleep_seconds,
+        )
+        if app_settings.backup_enabled
+        else None
+    )
+    app.state.reminders = (
+        ReminderScheduler(
+            session_factory.partitions(),
+            notifier,
+            window_days=app_settings.reminder_window_days,
+            batch_size=app_settings.reminder_batch_size,
+        )
+        if app_settings.reminders_enabled
+        else None
+    )
+    if app_settings.memory_diagnostics_enabled:
+        session_factory.track_sessions()
+    app.state.memory_monitor = (
+        MemoryMonitor(
+            directory=app_settings.memory_snapshot_directory,
+            interval_seconds=app_settings.memory_snapshot_interval_seconds,
+            top_n=app_settings.memory_snapshot_top_n,
+            frames=app_settings.memory_trace_frames,
+            max_snapshots=app_settings.memory_max_snapshots,
+            gauges={
+                "websockets": notifier.stats,
+                "sessions": session_factory.session_stats,
+                "checked_out_connections": lambda: {
+                    role: db_engine.pool.checkedout()
+                    for role, db_engine in app.state.database_engines.items()
+                    if hasattr(db_engine.pool, "checkedout")
+                },
+                "settings_cache": lambda: get_settings.cache_info().currsize,
+            },
+        )
+        if app_settings.memory_diagnostics_enabled
+        else None
+    )
+    app.state.change_publisher = ChangePublisher(
+        notifier, read_model=app.state.read_model, reminders=app.state.reminders
+    )
 
     app.include_router(auth.router)
     app.include_router(lists.router)
+    app.include_router(bootstrap.router)
     app.include_router(tasks.router)
+    app.include_router(transfer.router)
+    app.include_router(metrics.router)
+    app.include_router(health.router)
+    if app_settings.profiling_enabled:
+        app.include_router(profiles.router)
+    if app_settings.memory_diagnostics_enabled:
+        app.include_router(memory.router)
+    if app_settings.backup_enabled:
+        app.include_router(backups.router)
 
     return app
 
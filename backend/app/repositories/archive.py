@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, delete, insert, null, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+_ARCHIVED_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "due_date",
+    "status",
+    "priority",
+    "tags",
+    "list_id",
+    "position",
+    "created_at",
+    "updated_at",
+)
+
+
+class ArchiveRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def completed_before(self, cutoff: datetime, limit: int) -> list[tuple[int, int]]:
+        rows = self.session.execute(
+            select(models.Task.id, models.Task.list_id)
+            .where(
+                models.Task.status == models.TaskStatusEnum.completed.value,
+                models.Task.updated_at < cutoff,
+                # A series row is its future occurrences; the archive has no rule to keep.
+                models.Task.recurrence.is_(None),
+            )
+            .order_by(models.Task.id.asc())
+            .limit(limit)
+        )
+        return [(row.id, row.list_id) for row in rows]
+
+    def move(self, task_ids: Sequence[int]) -> None:
+        tasks = models.Task.__table__
+        archived = models.ArchivedTask.__table__
+        self.session.execute(
+            insert(archived).from_select(
+                list(_ARCHIVED_COLUMNS),
+                select(*(tasks.c[name] for name in _ARCHIVED_COLUMNS)).where(tasks.c.id.in_(task_ids)),
+            )
+        )
+        self.session.execute(delete(tasks).where(tasks.c.id.in_(task_ids)))
+
+    def bulk_create(self, rows: list[dict[str, Any]]) -> int:
+        # Ids are drawn from tasks so an archived task never shares an id with a live one.
+        if not rows:
+            return 0
+        tasks = models.Task.__table__
+        task_ids = self.session.scalars(insert(tasks).returning(tasks.c.id), rows).all()
+        self.move(task_ids)
+        return len(task_ids)
+
+    def iter_export_rows(self, owner_id: int, batch_size: int = 1000) -> Iterator[Sequence[Row]]:
+        archived = models.ArchivedTask
+        statement = (
+            select(
+                models.TaskList.id.label("list_id"),
+                models.TaskList.name.label("list_name"),
+                archived.id.label("task_id"),
+                archived.title,
+                archived.description,
+                archived.due_date,
+                archived.status,
+                archived.priority,
+                archived.tags,
+                archived.position,
+                null().label("recurrence"),
+            )
+            .join(archived, archived.list_id == models.TaskList.id)
+            .where(models.TaskList.owner_id == owner_id)
+            .order_by(models.TaskList.id.asc(), archived.id.asc())
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(statement).partitions()
+
+    def list_for_task_list(
+        self, list_id: int, *, limit: int, before_id: int | None = None
+    ) -> list[models.ArchivedTask]:
+        query = self.session.query(models.ArchivedTask).filter(models.ArchivedTask.list_id == list_id)
+        if before_id is not None:
+            query = query.filter(models.ArchivedTask.id < before_id)
+        return query.order_by(models.ArchivedTask.id.desc()).limit(limit).all()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+
+class JobLeaseRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def claim(self, name: str, *, holder: str, now: datetime, until: datetime) -> bool:
+        # The conditional UPDATE is the cross-worker lock: only one claimant changes the row.
+        lease = models.JobLease
+        renewed = self.session.execute(
+            update(lease)
+            .where(lease.name == name, lease.expires_at <= now)
+            .values(holder=holder, expires_at=until)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if renewed:
+            return True
+        if self.session.get(lease, name) is not None:
+            return False
+        # A worker racing on the first claim fails this insert with an IntegrityError.
+        self.session.add(lease(name=name, holder=holder, expires_at=until))
+        self.session.flush()
+        return True
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import date
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+
+class OccurrenceRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def statuses_between(
+        self, task_ids: Collection[int], start: date, end: date
+    ) -> dict[tuple[int, date], str]:
+        if not task_ids:
+            return {}
+        occurrence = models.TaskOccurrence
+        rows = self.session.execute(
+            select(occurrence.task_id, occurrence.occurrence_date, occurrence.status).where(
+                occurrence.task_id.in_(task_ids),
+                occurrence.occurrence_date >= start,
+                occurrence.occurrence_date <= end,
+            )
+        )
+        return {(row.task_id, row.occurrence_date): row.status for row in rows}
+
+    def upsert(
+        self, *, task_id: int, list_id: int, occurrence_date: date, status: str
+    ) -> models.TaskOccurrence:
+        occurrence = self.session.get(models.TaskOccurrence, (task_id, occurrence_date))
+        if occurrence is None:
+            occurrence = models.TaskOccurrence(
+                task_id=task_id, list_id=list_id, occurrence_date=occurrence_date
+            )
+        occurrence.status = status
+        self.session.add(occurrence)
+        self.session.flush()
+        return occurrence
+
+    def delete_for_task(self, task_id: int) -> None:
+        self.session.execute(
+            delete(models.TaskOccurrence).where(models.TaskOccurrence.task_id == task_id)
+        )
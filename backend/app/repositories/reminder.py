@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import Row, or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+
+class ReminderRepository:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def pending_between(
+        self,
+        start: date,
+        end: date,
+        *,
+        after: tuple[date, int] | None = None,
+        limit: int = 1000,
+    ) -> list[Row]:
+        task = models.Task
+        statement = (
+            select(task.id, task.list_id, task.due_date)
+            .where(
+                task.due_date >= start,
+                task.due_date <= end,
+                task.status != models.TaskStatusEnum.completed.value,
+                self._not_reminded(),
+            )
+            .order_by(task.due_date.asc(), task.id.asc())
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(tuple_(task.due_date, task.id) > tuple_(*after))
+        return list(self.session.execute(statement))
+
+    def claim(self, task_id: int, due_date: date) -> Row | None:
+        # The conditional UPDATE is the cross-worker lock: only one claimant sees a row back.
+        task = models.Task
+        return self.session.execute(
+            update(task)
+            .where(
+                task.id == task_id,
+                task.due_date == due_date,
+                task.status != models.TaskStatusEnum.completed.value,
+                self._not_reminded(),
+            )
+            .values(reminded_for=task.due_date, updated_at=task.updated_at)
+            .returning(task.id, task.list_id, task.title, task.due_date)
+            .execution_options(synchronize_session=False)
+        ).first()
+
+    def _not_reminded(self):
+        task = models.Task
+        return or_(task.reminded_for.is_(None), task.reminded_for != task.due_date)
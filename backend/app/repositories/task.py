@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from sqlalchemy import func
+from collections.abc import Iterator, Sequence
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Row, delete, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.db import models
@@ -9,6 +13,7 @@ from app.db import models
 class TaskRepository:
     def __init__(self, session: Session):
         self.session = session
+        self.list_versions: dict[int, int] = {}
 
     def create(
         self,
@@ -20,6 +25,7 @@ class TaskRepository:
         status: str,
         priority: str,
         tags: list[str],
+        recurrence: dict[str, Any] | None = None,
     ) -> models.Task:
         next_position = self._next_position(list_id)
         task = models.Task(
@@ -30,29 +36,122 @@ class TaskRepository:
             status=status,
             priority=priority,
             tags=tags,
+            recurrence=recurrence,
             position=next_position,
         )
         self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+        self.session.flush()
+        self.bump_versions({list_id})
         return task
 
+    def bulk_create(self, rows: list[dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        self.session.execute(insert(models.Task.__table__), rows)
+        self.bump_versions({row["list_id"] for row in rows})
+        return len(rows)
+
+    def iter_export_rows(self, owner_id: int, batch_size: int = 1000) -> Iterator[Sequence[Row]]:
+        statement = (
+            select(
+                models.TaskList.id.label("list_id"),
+                models.TaskList.name.label("list_name"),
+                models.Task.id.label("task_id"),
+                models.Task.title,
+                models.Task.description,
+                models.Task.due_date,
+                models.Task.status,
+                models.Task.priority,
+                models.Task.tags,
+                models.Task.position,
+                models.Task.recurrence,
+            )
+            .outerjoin(models.Task, models.Task.list_id == models.TaskList.id)
+            .where(models.TaskList.owner_id == owner_id)
+            .order_by(models.TaskList.id.asc(), models.Task.position.asc(), models.Task.id.asc())
+            .execution_options(yield_per=batch_size)
+        )
+        yield from self.session.execute(statement).partitions()
+
     def get_by_id(self, task_id: int) -> models.Task | None:
         return self.session.query(models.Task).filter(models.Task.id == task_id).first()
 
-    def list_for_task_list(self, list_id: int) -> list[models.Task]:
+    def list_for_task_list(
+        self,
+        list_id: int,
+        *,
+        status: str | None = None,
+        priority: str | None = None,
+        limit: int | None = None,
+    ) -> list[models.Task]:
+        query = self.session.query(models.Task).filter(models.Task.list_id == list_id)
+        if status is not None:
+            query = query.filter(models.Task.status == status)
+        if priority is not None:
+            query = query.filter(models.Task.priority == priority)
+        query = query.order_by(models.Task.position.asc(), models.Task.created_at.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def dated_between(self, list_id: int, start: date, end: date) -> list[models.Task]:
+        task = models.Task
         return (
-            self.session.query(models.Task)
-            .filter(models.Task.list_id == list_id)
-            .order_by(models.Task.position.asc(), models.Task.created_at.asc())
+            self.session.query(task)
+            .filter(
+                task.list_id == list_id,
+                task.recurrence.is_(None),
+                task.due_date >= start,
+                task.due_date <= end,
+            )
+            .all()
+        )
+
+    def series_starting_by(self, list_id: int, end: date) -> list[models.Task]:
+        # Series are few per list; each is expanded for the window by the caller.
+        task = models.Task
+        return (
+            self.session.query(task)
+            .filter(task.list_id == list_id, task.recurrence.is_not(None), task.due_date <= end)
             .all()
         )
 
+    def count_by(self, list_id: int, column) -> dict[str, int]:
+        rows = self.session.execute(
+            select(column, func.count())
+            .where(models.Task.list_id == list_id)
+            .group_by(column)
+        )
+        return {value: count for value, count in rows}
+
     def delete(self, task: models.Task) -> None:
         list_id = task.list_id
         self.session.delete(task)
-        self.session.commit()
-        self._resequence_positions(list_id)
+        self.session.flush()
+        self.resequence({list_id})
+        self.bump_versions({list_id})
+
+    def update_matching(self, list_id: int, *, where: dict[str, str], values: dict[str, str]) -> int:
+        result = self.session.execute(
+            update(models.Task)
+            .where(models.Task.list_id == list_id, *self._matching(where), *self._settable(values))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            self.bump_versions({list_id})
+        return result.rowcount
+
+    def delete_matching(self, list_id: int, *, where: dict[str, str]) -> int:
+        result = self.session.execute(
+            delete(models.Task)
+            .where(models.Task.list_id == list_id, *self._matching(where))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            self.resequence({list_id})
+            self.bump_versions({list_id})
+        return result.rowcount
 
     def update(
         self,
@@ -64,6 +163,8 @@ class TaskRepository:
         status: str | None = None,
         priority: str | None = None,
         tags: list[str] | None = None,
+        recurrence: dict[str, Any] | None = None,
+        clear_recurrence: bool = False,
     ) -> models.Task:
         if title is not None:
             task.title = title
@@ -77,9 +178,11 @@ class TaskRepository:
             task.priority = priority
         if tags is not None:
             task.tags = tags
+        if recurrence is not None or clear_recurrence:
+            task.recurrence = recurrence
         self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+        self.session.flush()
+        self.bump_versions({task.list_id})
         return task
 
     def reorder(self, list_id: int, ordered_ids: list[int]) -> list[models.Task]:
@@ -92,9 +195,44 @@ class TaskRepository:
             task = task_by_id[task_id]
             task.position = position
             self.session.add(task)
-        self.session.commit()
+        self.session.flush()
+        self.bump_versions({list_id})
         return self.list_for_task_list(list_id)
 
+    def resequence(self, list_ids: set[int]) -> None:
+        tasks = models.Task.__table__
+        ranked = (
+            select(
+                tasks.c.id,
+                (
+                    func.row_number().over(
+                        partition_by=tasks.c.list_id,
+                        order_by=(tasks.c.position.asc(), tasks.c.created_at.asc()),
+                    )
+                    - 1
+                ).label("position"),
+            )
+            .where(tasks.c.list_id.in_(list_ids))
+            .subquery()
+        )
+        self.session.execute(
+            update(tasks)
+            .where(tasks.c.id == ranked.c.id, tasks.c.position != ranked.c.position)
+            # Closing gaps is not an edit; keep updated_at so archive age stays accurate.
+            .values(position=ranked.c.position, updated_at=tasks.c.updated_at)
+        )
+
+    def bump_versions(self, list_ids: set[int]) -> None:
+        # Cached list reads are keyed by version, so every write to a list must bump it.
+        result = self.session.execute(
+            update(models.TaskList)
+            .where(models.TaskList.id.in_(list_ids))
+            .values(version=models.TaskList.version + 1)
+            .returning(models.TaskList.id, models.TaskList.version)
+            .execution_options(synchronize_session=False)
+        )
+        self.list_versions.update({row.id: row.version for row in result})
+
     def _next_position(self, list_id: int) -> int:
         max_position = (
             self.session.query(func.max(models.Task.position))
@@ -105,11 +243,9 @@ class TaskRepository:
             return 0
         return max_position + 1
 
-    def _resequence_positions(self, list_id: int) -> None:
-        tasks = self.list_for_task_list(list_id)
-        for position, task in enumerate(tasks):
-            if task.position != position:
-                task.position = position
-                self.session.add(task)
-        self.session.commit()
+    def _matching(self, where: dict[str, str]) -> list[Any]:
+        return [getattr(models.Task, column) == value for column, value in where.items()]
 
+    def _settable(self, values: dict[str, str]) -> list[Any]:
+        # Series rows take status changes per occurrence; see TaskService.update_occurrence.
+        return [models.Task.recurrence.is_(None)] if "status" in values else []
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from sqlalchemy import Row, case, delete, func, select
 from sqlalchemy.orm import Session
 
 from app.db import models
@@ -12,13 +13,22 @@ class TaskListRepository:
     def create(self, *, name: str, owner_id: int) -> models.TaskList:
         task_list = models.TaskList(name=name, owner_id=owner_id)
         self.session.add(task_list)
-        self.session.commit()
-        self.session.refresh(task_list)
+        self.session.flush()
         return task_list
 
     def get_by_id(self, list_id: int) -> models.TaskList | None:
         return self.session.query(models.TaskList).filter(models.TaskList.id == list_id).first()
 
+    def owned_ids(self, owner_id: int, list_ids: set[int]) -> set[int]:
+        if not list_ids:
+            return set()
+        rows = (
+            self.session.query(models.TaskList.id)
+            .filter(models.TaskList.owner_id == owner_id, models.TaskList.id.in_(list_ids))
+            .all()
+        )
+        return {row.id for row in rows}
+
     def list_for_user(self, owner_id: int) -> list[models.TaskList]:
         return (
             self.session.query(models.TaskList)
@@ -27,3 +37,34 @@ class TaskListRepository:
             .all()
         )
 
+    def summaries_for_user(self, owner_id: int) -> list[Row]:
+        # One grouped pass over the owner's tasks gives every list's counts and last activity.
+        status_counts = [
+            func.count(case((models.Task.status == member.value, 1))).label(member.value)
+            for member in models.TaskStatusEnum
+        ]
+        statement = (
+            select(
+                models.TaskList.id,
+                models.TaskList.name,
+                func.count(models.Task.id).label("total"),
+                *status_counts,
+                func.coalesce(func.max(models.Task.updated_at), models.TaskList.created_at).label(
+                    "last_activity"
+                ),
+            )
+            .outerjoin(models.Task, models.Task.list_id == models.TaskList.id)
+            .where(models.TaskList.owner_id == owner_id)
+            .group_by(models.TaskList.id)
+            .order_by(models.TaskList.created_at.asc(), models.TaskList.id.asc())
+        )
+        return list(self.session.execute(statement))
+
+    def delete_owned(self, list_id: int, owner_id: int) -> bool:
+        # Tasks and archived tasks go with the list through ON DELETE CASCADE.
+        result = self.session.execute(
+            delete(models.TaskList).where(
+                models.TaskList.id == list_id, models.TaskList.owner_id == owner_id
+            )
+        )
+        return result.rowcount > 0
@@ -22,7 +22,6 @@ class UserRepository:
             full_name=full_name,
         )
         self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
+        self.session.flush()
         return user
 
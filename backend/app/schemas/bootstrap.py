@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from app.schemas.task import TaskListSummary, TaskRead
+from app.schemas.user import UserRead
+
+
+class Bootstrap(BaseModel):
+    user: UserRead
+    lists: list[TaskListSummary]
+    selected_list_id: int | None = None
+    tasks: list[TaskRead]
+    has_more_tasks: bool
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -16,6 +16,20 @@ class TaskPriority(str, Enum):
     high = "high"
 
 
+class RecurrenceFrequency(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+
+
+class Recurrence(BaseModel):
+    frequency: RecurrenceFrequency
+    interval: int = Field(1, ge=1, le=366)
+    # 0 is Monday; weekly only, defaulting to the weekday of the task's due date.
+    weekdays: list[int] = Field(default_factory=list)
+    until: date | None = None
+
+
 class TaskListCreate(BaseModel):
     name: str
 
@@ -27,6 +41,11 @@ class TaskListRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskListSummary(TaskListRead):
+    total: int
+    by_status: dict[str, int]
+
+
 class TaskCreate(BaseModel):
     title: str
     description: str | None = None
@@ -34,6 +53,7 @@ class TaskCreate(BaseModel):
     status: TaskStatus = TaskStatus.pending
     priority: TaskPriority = TaskPriority.medium
     tags: list[str] = Field(default_factory=list)
+    recurrence: Recurrence | None = None
 
 
 class TaskUpdate(BaseModel):
@@ -43,6 +63,8 @@ class TaskUpdate(BaseModel):
     status: TaskStatus | None = None
     priority: TaskPriority | None = None
     tags: list[str] | None = None
+    # Unlike the other fields, an explicit null stops the series.
+    recurrence: Recurrence | None = None
 
 
 class TaskRead(BaseModel):
@@ -55,10 +77,69 @@ class TaskRead(BaseModel):
     priority: TaskPriority
     tags: list[str]
     position: int
+    recurrence: Recurrence | None = None
+    # Series rows in list responses only: the first occurrence from today, as in the agenda.
+    next_occurrence: date | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskOccurrenceRead(BaseModel):
+    task_id: int
+    list_id: int
+    occurrence_date: date
+    title: str
+    description: str | None = None
+    status: TaskStatus
+    priority: TaskPriority
+    tags: list[str]
+    recurring: bool
+
+
+class TaskOccurrenceUpdate(BaseModel):
+    status: TaskStatus
+
+
 class TaskReorderRequest(BaseModel):
     task_ids: list[int]
 
+
+class TaskFilter(BaseModel):
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+
+
+class TaskBulkUpdate(BaseModel):
+    where: TaskFilter = Field(default_factory=TaskFilter)
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+
+
+class BulkResult(BaseModel):
+    affected: int
+
+
+class ArchivedTaskRead(TaskRead):
+    archived_at: datetime
+
+
+class ArchivedTaskPage(BaseModel):
+    items: list[ArchivedTaskRead]
+    next_before_id: int | None = None
+
+
+class TaskCounts(BaseModel):
+    total: int
+    by_status: dict[str, int]
+    by_priority: dict[str, int]
+
+
+class TransferFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ImportSummary(BaseModel):
+    lists: int
+    tasks: int
+    archived: int = 0
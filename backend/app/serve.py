@@ -0,0 +1,108 @@
+"""Run the API for production: supervised workers, no reloader.
+
+Run from ``backend/`` with the same environment as the app::
+
+    python -m app.serve                 # SERVER_* settings
+    python -m app.serve --workers 4     # override the worker count
+
+Migrations are applied once here before any worker starts. Send ``SIGHUP`` to the
+launcher to restart workers one at a time; each drains its in-flight requests first.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import logging
+import os
+import random
+from socket import socket
+from typing import Any
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from app.core.config import Settings, get_settings
+from app.db.migrate import migrate_databases
+
+logger = logging.getLogger("uvicorn.error")
+
+APP = "app.main:app"
+
+
+def server_options(settings: Settings) -> dict[str, Any]:
+    return {
+        "host": settings.server_host,
+        "port": settings.server_port,
+        "workers": max(1, settings.server_workers),
+        "loop": "uvloop" if _available("uvloop") else "asyncio",
+        "http": "httptools" if _available("httptools") else "h11",
+        "backlog": settings.server_backlog,
+        "timeout_keep_alive": settings.server_keep_alive_seconds,
+        "timeout_graceful_shutdown": settings.server_graceful_timeout_seconds,
+        "limit_max_requests": settings.server_max_requests or None,
+        "proxy_headers": settings.server_proxy_headers,
+        "access_log": False,
+        "reload": False,
+    }
+
+
+class _Worker:
+    """Target run in each worker process; picklable so the supervisor can spawn it."""
+
+    def __init__(self, config: uvicorn.Config, max_requests_jitter: int) -> None:
+        self.config = config
+        self.max_requests_jitter = max_requests_jitter
+
+    def __call__(self, sockets: list[socket] | None = None) -> None:
+        # Spread recycling out so workers that started together do not all restart together.
+        if self.config.limit_max_requests and self.max_requests_jitter > 0:
+            self.config.limit_max_requests += random.randint(0, self.max_requests_jitter)
+        uvicorn.Server(self.config).run(sockets=sockets)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", help="overrides SERVER_HOST")
+    parser.add_argument("--port", type=int, help="overrides SERVER_PORT")
+    parser.add_argument("--workers", type=int, help="overrides SERVER_WORKERS")
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    options = server_options(settings)
+    for name in ("host", "port", "workers"):
+        if getattr(args, name) is not None:
+            options[name] = getattr(args, name)
+
+    if settings.auto_migrate:
+        migrate_databases(settings)
+    # Workers inherit the environment; they only verify the schema the launcher migrated.
+    os.environ["AUTO_MIGRATE"] = "false"
+
+    config = uvicorn.Config(APP, **options)
+    logger.info(
+        "Serving %s with %d worker(s), loop=%s, http=%s, max_requests=%s",
+        APP,
+        config.workers,
+        options["loop"],
+        options["http"],
+        options["limit_max_requests"] or "unlimited",
+    )
+    # The supervisor is used even for one worker: it replaces workers that exit after
+    # max_requests or crash, and handles SIGHUP restarts.
+    sock = config.bind_socket()
+    try:
+        Multiprocess(
+            config,
+            target=_Worker(config, settings.server_max_requests_jitter),
+            sockets=[sock],
+        ).run()
+    finally:
+        sock.close()
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.session import unit_of_work
+from app.repositories.archive import ArchiveRepository
+from app.repositories.job_lease import JobLeaseRepository
+from app.repositories.task import TaskRepository
+from app.repositories.task_list import TaskListRepository
+from app.services.notifier import TaskNotifier
+
+logger = logging.getLogger(__name__)
+
+SWEEP_LEASE = "archive_sweep"
+
+
+class ArchiveService:
+    def __init__(self, session: Session, *, batch_size: int = 1000):
+        self.session = session
+        self.batch_size = batch_size
+        self.archive = ArchiveRepository(session)
+        self.task_lists = TaskListRepository(session)
+        self.tasks = TaskRepository(session)
+
+    def archive_completed(
+        self, *, older_than: timedelta, now: datetime | None = None
+    ) -> dict[int, int]:
+        # updated_at is written by the database as naive UTC.
+        current = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff = current - older_than
+        archived: dict[int, int] = {}
+        while True:
+            with unit_of_work(self.session):
+                candidates = self.archive.completed_before(cutoff, self.batch_size)
+                if candidates:
+                    list_ids = {list_id for _, list_id in candidates}
+                    self.archive.move([task_id for task_id, _ in candidates])
+                    self.tasks.resequence(list_ids)
+                    self.tasks.bump_versions(list_ids)
+            for _, list_id in candidates:
+                archived[list_id] = archived.get(list_id, 0) + 1
+            if len(candidates) < self.batch_size:
+                return archived
+
+    def list_archived(
+        self, *, list_id: int, owner_id: int, limit: int, before_id: int | None = None
+    ) -> list[models.ArchivedTask]:
+        task_list = self.task_lists.get_by_id(list_id)
+        if task_list is None or task_list.owner_id != owner_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task list not found")
+        return self.archive.list_for_task_list(list_id, limit=limit, before_id=before_id)
+
+
+class ArchiveJob:
+    def __init__(
+        self,
+        session_factories: Mapping[int | None, Callable[[], Session]],
+        *,
+        older_than: timedelta,
+        interval_seconds: float = 3600.0,
+        batch_size: int = 1000,
+        notifier: TaskNotifier | None = None,
+    ) -> None:
+        self.session_factories = session_factories
+        self.older_than = older_than
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.notifier = notifier
+        self.archived_total = 0
+        self.sweeps_skipped = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> dict[int, int]:
+        archived = await run_in_threadpool(self._archive)
+        self.archived_total += sum(archived.values())
+        if self.notifier is not None:
+            for list_id in archived:
+                await self.notifier.broadcast(list_id, {"type": "tasks_changed", "list_id": list_id})
+        return archived
+
+    def start(self) -> None:
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                if await run_in_threadpool(self.claim_sweep):
+                    await self.run_once()
+                else:
+                    self.sweeps_skipped += 1
+            except Exception:
+                logger.exception("Archiving completed tasks failed")
+
+    def claim_sweep(self, now: datetime | None = None) -> bool:
+        # Every worker runs this job; the lease in the main database lets one of them sweep
+        # per interval. It expires a little early so the holder's next tick can renew it.
+        current = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        until = current + timedelta(seconds=self.interval_seconds * 0.9)
+        with self.session_factories[None]() as session:
+            try:
+                with unit_of_work(session):
+                    return JobLeaseRepository(session).claim(
+                        SWEEP_LEASE, holder=f"pid-{os.getpid()}", now=current, until=until
+                    )
+            except IntegrityError:
+                return False
+
+    def _archive(self) -> dict[int, int]:
+        archived: dict[int, int] = {}
+        for session_factory in self.session_factories.values():
+            with session_factory() as session:
+                service = ArchiveService(session, batch_size=self.batch_size)
+                archived.update(service.archive_completed(older_than=self.older_than))
+        return archived
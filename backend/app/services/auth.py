@@ -5,13 +5,16 @@ from sqlalchemy.orm import Session
 
 from app.core.config import Settings
 from app.core.security import create_access_token, hash_password, verify_password
+from app.db.session import unit_of_work
+from app.db.shards import ShardRouter
 from app.repositories.user import UserRepository
 
 
 class AuthService:
-    def __init__(self, session: Session, settings: Settings):
+    def __init__(self, session: Session, settings: Settings, *, shards: ShardRouter | None = None):
         self.session = session
         self.settings = settings
+        self.shards = shards
         self.users = UserRepository(session)
 
     def register_user(self, *, email: str, password: str, full_name: str | None = None):
@@ -19,7 +22,10 @@ class AuthService:
         if existing:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
         hashed = hash_password(password)
-        user = self.users.create(email=email, hashed_password=hashed, full_name=full_name)
+        with unit_of_work(self.session):
+            user = self.users.create(email=email, hashed_password=hashed, full_name=full_name)
+            if self.shards is not None:
+                user.shard = self.shards.assign(user.id)
         token = self._token_for_user(user.id)
         return user, token
 
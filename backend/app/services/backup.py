@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.db.backup import backup_name, backup_sqlite, prune_backups
+
+logger = logging.getLogger(__name__)
+
+_PATH_FIELDS = frozenset({"database", "path"})
+
+
+class BackupJob:
+    def __init__(
+        self,
+        databases: Sequence[str | Path],
+        *,
+        directory: str | Path,
+        interval_seconds: float = 86400.0,
+        max_backups: int = 7,
+        step_pages: int = 256,
+        step_sleep_seconds: float = 0.01,
+    ) -> None:
+        self.databases = [Path(database) for database in databases]
+        self.directory = Path(directory)
+        self.interval_seconds = interval_seconds
+        self.max_backups = max_backups
+        self.step_pages = step_pages
+        self.step_sleep_seconds = step_sleep_seconds
+        self.backups_total = 0
+        self.failures_total = 0
+        self.last_results: list[dict[str, Any]] = []
+        self.last_finished_at: float | None = None
+        self._progress: dict[str, Any] | None = None
+        self._stopping = False
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> list[dict[str, Any]]:
+        # Steps sleep between page batches; keep the whole copy off the event loop.
+        return await run_in_threadpool(self._backup)
+
+    def start(self) -> None:
+        self._stopping = False
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        # A copy still running in the threadpool gives up at its next step.
+        self._stopping = True
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        # Public: no database or backup paths, those are in details().
+        progress = self._progress
+        return {
+            "backups_total": self.backups_total,
+            "failures_total": self.failures_total,
+            "in_progress": (
+                {key: progress[key] for key in ("pages_copied", "pages_total")}
+                if progress is not None
+                else None
+            ),
+            "last_finished_at": self.last_finished_at,
+            "last": [
+                {key: value for key, value in result.items() if key not in _PATH_FIELDS}
+                for result in self.last_results
+            ],
+        }
+
+    def details(self) -> dict[str, Any]:
+        progress = self._progress
+        return {
+            **self.stats(),
+            "in_progress": dict(progress) if progress is not None else None,
+            "last": self.last_results,
+            "directory": str(self.directory),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Backing up the database failed")
+
+    def _backup(self) -> list[dict[str, Any]]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        results = []
+        try:
+            for database in self.databases:
+                self._progress = {"database": database.name, "pages_copied": 0, "pages_total": None}
+
+                def _report(copied: int, total: int) -> None:
+                    self._progress = {
+                        "database": database.name,
+                        "pages_copied": copied,
+                        "pages_total": total,
+                    }
+
+                try:
+                    result = backup_sqlite(
+                        database,
+                        self.directory / backup_name(database),
+                        step_pages=self.step_pages,
+                        step_sleep_seconds=self.step_sleep_seconds,
+                        progress=_report,
+                        cancelled=lambda: self._stopping,
+                    )
+                except Exception:
+                    self.failures_total += 1
+                    raise
+                if result["restarts"]:
+                    logger.warning(
+                        "Backup of %s restarted %d times because of concurrent writes; "
+                        "set DATABASE_WAL=true to back up from a snapshot instead",
+                        database,
+                        result["restarts"],
+                    )
+                prune_backups(self.directory, database, self.max_backups)
+                self.backups_total += 1
+                results.append(result)
+        finally:
+            self._progress = None
+        self.last_results = results
+        self.last_finished_at = time.time()
+        return results
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+CacheKey = tuple[int, int, Hashable]
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: bytes | None = None
+        self.error: BaseException | None = None
+
+
+class TaskListCache:
+    def __init__(self, *, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._latest: dict[tuple[int, Hashable], CacheKey] = {}
+        self._inflight: dict[CacheKey, _Flight] = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self.evictions = 0
+
+    def get_or_load(
+        self, list_id: int, version: int, variant: Hashable, loader: Callable[[], bytes]
+    ) -> bytes:
+        key = (list_id, version, variant)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collapsed": self.collapsed,
+            "evictions": self.evictions,
+        }
+
+    def _store(self, key: CacheKey, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        list_id, version, variant = key
+        previous = self._latest.get((list_id, variant))
+        if previous is not None and previous[1] > version:
+            return
+        if previous is not None and previous != key:
+            self._discard(previous)
+        self._latest[(list_id, variant)] = key
+        self._entries[key] = value
+        self.current_bytes += len(value)
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+
+    def _discard(self, key: CacheKey) -> None:
+        value = self._entries.pop(key, None)
+        if value is None:
+            return
+        self.current_bytes -= len(value)
+        list_id, _, variant = key
+        if self._latest.get((list_id, variant)) == key:
+            del self._latest[(list_id, variant)]
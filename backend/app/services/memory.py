@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import linecache
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = ".tracemalloc"
+
+# Allocations made by the diagnostics themselves would otherwise top every diff.
+_IGNORED_FILES = frozenset(
+    {
+        __file__,
+        tracemalloc.__file__,
+        linecache.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+    }
+)
+
+
+class MemoryMonitor:
+    def __init__(
+        self,
+        *,
+        directory: str | Path,
+        interval_seconds: float,
+        top_n: int = 20,
+        frames: int = 5,
+        max_snapshots: int = 10,
+        gauges: Mapping[str, Callable[[], Any]] | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.interval_seconds = interval_seconds
+        self.top_n = top_n
+        self.frames = frames
+        self.max_snapshots = max_snapshots
+        self.gauges = dict(gauges or {})
+        self.snapshots_total = 0
+        self.last_diff: list[dict[str, Any]] = []
+        self._previous: dict[tuple[str, int], tuple[int, int]] | None = None
+        self._started_tracing = False
+        self._lock = threading.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Waits out a snapshot still running in the threadpool after its task was cancelled.
+        with self._lock:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            self._previous = None
+
+    async def run_once(self) -> list[dict[str, Any]]:
+        # take_snapshot walks every traced block; keep it off the event loop.
+        _, diff = await run_in_threadpool(self._take)
+        if diff:
+            logger.info(
+                "Memory growth since last snapshot: %s",
+                "; ".join(f"{item['location']} {item['size_diff']:+d} B" for item in diff[:5]),
+            )
+        return diff
+
+    def dump(self) -> tuple[Path, list[dict[str, Any]]]:
+        snapshot, diff = self._take()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / (
+            f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{self.snapshots_total}{SNAPSHOT_SUFFIX}"
+        )
+        snapshot.dump(str(path))
+        for stale in list_snapshots(self.directory)[self.max_snapshots :]:
+            stale.unlink(missing_ok=True)
+        return path, diff
+
+    def stats(self) -> dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        stats: dict[str, Any] = {
+            "rss_bytes": rss_bytes(),
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "snapshots_total": self.snapshots_total,
+        }
+        for name, gauge in self.gauges.items():
+            stats[name] = gauge()
+        return stats
+
+    def _take(self) -> tuple[tracemalloc.Snapshot, list[dict[str, Any]]]:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start the monitor first")
+        with self._lock:
+            snapshot = tracemalloc.take_snapshot()
+            # Grouping is the expensive part, so each snapshot is grouped once and only the
+            # per-line totals are kept for the next diff, not the snapshot itself.
+            totals: dict[tuple[str, int], tuple[int, int]] = {}
+            for stat in snapshot.statistics("lineno"):
+                frame = stat.traceback[0]
+                if frame.filename not in _IGNORED_FILES:
+                    totals[(frame.filename, frame.lineno)] = (stat.size, stat.count)
+            diff = _top_growth(self._previous, totals, self.top_n) if self._previous is not None else []
+            self._previous = totals
+            self.snapshots_total += 1
+            self.last_diff = diff
+            return snapshot, diff
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Taking a memory snapshot failed")
+
+
+def _top_growth(
+    before: dict[tuple[str, int], tuple[int, int]],
+    after: dict[tuple[str, int], tuple[int, int]],
+    top_n: int,
+) -> list[dict[str, Any]]:
+    changes = []
+    for location in before.keys() | after.keys():
+        size, count = after.get(location, (0, 0))
+        old_size, old_count = before.get(location, (0, 0))
+        if size != old_size:
+            changes.append((location, size - old_size, size, count - old_count, count))
+    changes.sort(key=lambda change: (abs(change[1]), change[2]), reverse=True)
+    return [
+        {
+            "location": f"{filename}:{lineno}",
+            "size_diff": size_diff,
+            "size": size,
+            "count_diff": count_diff,
+            "count": count,
+        }
+        for (filename, lineno), size_diff, size, count_diff, count in changes[:top_n]
+    ]
+
+
+def list_snapshots(directory: str | Path) -> list[Path]:
+    path = Path(directory)
+    if not path.is_dir():
+        return []
+    return sorted(path.glob(f"*{SNAPSHOT_SUFFIX}"), key=lambda item: item.name, reverse=True)
+
+
+def rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
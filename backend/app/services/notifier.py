@@ -1,48 +1,345 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+import json
+import secrets
+import time
+from collections import OrderedDict, defaultdict, deque
 from typing import Any
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
+
+from app.core.encoding import packb
+
+PING_MESSAGE = {"type": "ping"}
+
+StreamEvent = tuple[int, dict[str, Any]]
+
+
+class _Subscriber:
+    __slots__ = ("websocket", "user_id", "encoding", "list_ids", "last_seen")
+
+    def __init__(self, websocket: WebSocket, user_id: int | None, encoding: str) -> None:
+        self.websocket = websocket
+        self.user_id = user_id
+        self.encoding = encoding
+        self.list_ids: set[int] = set()
+        self.last_seen = time.monotonic()
 
 
 class TaskNotifier:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        heartbeat_interval: float = 25.0,
+        heartbeat_timeout: float = 60.0,
+        send_timeout: float = 5.0,
+        max_connections: int = 10_000,
+        max_connections_per_user: int = 20,
+        event_buffer_size: int = 256,
+        max_history_lists: int = 10_000,
+        stream_queue_size: int = 64,
+    ) -> None:
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.send_timeout = send_timeout
+        self.max_connections = max_connections
+        self.max_connections_per_user = max_connections_per_user
+        self.event_buffer_size = event_buffer_size
+        self.max_history_lists = max_history_lists
+        self.stream_queue_size = stream_queue_size
         self._connections: dict[int, set[WebSocket]] = defaultdict(set)
+        self._subscribers: dict[WebSocket, _Subscriber] = {}
+        self._user_counts: dict[int, int] = defaultdict(int)
+        self._streams: dict[int, set[asyncio.Queue[StreamEvent | None]]] = defaultdict(set)
+        self._stream_users: dict[asyncio.Queue[StreamEvent | None], int | None] = {}
+        # Event ids count up across all lists and carry a per-process epoch, so an id is
+        # never reused: not after a list's history is evicted, nor by another worker.
+        self.epoch = secrets.token_hex(4)
+        self._last_event_id = 0
+        self._history: OrderedDict[int, tuple[int, deque[StreamEvent]]] = OrderedDict()
         self._lock = asyncio.Lock()
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self.reaped_total = 0
+        self.rejected_total = 0
 
-    async def connect(self, list_id: int, websocket: WebSocket) -> None:
+    async def connect(
+        self,
+        list_id: int,
+        websocket: WebSocket,
+        *,
+        user_id: int | None = None,
+        encoding: str = "json",
+    ) -> bool:
+        if not await self.register(websocket, user_id=user_id, encoding=encoding):
+            return False
+        await self.subscribe(websocket, {list_id})
+        return True
+
+    async def register(
+        self,
+        websocket: WebSocket,
+        *,
+        user_id: int | None = None,
+        encoding: str = "json",
+    ) -> bool:
+        async with self._lock:
+            admitted = self._has_capacity(user_id)
+            if admitted:
+                self._subscribers[websocket] = _Subscriber(websocket, user_id, encoding)
+                if user_id is not None:
+                    self._user_counts[user_id] += 1
+            else:
+                self.rejected_total += 1
+        if not admitted:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return False
         await websocket.accept()
+        return True
+
+    async def subscribe(self, websocket: WebSocket, list_ids: set[int]) -> None:
+        async with self._lock:
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is None:
+                return
+            for list_id in list_ids:
+                subscriber.list_ids.add(list_id)
+                self._connections[list_id].add(websocket)
+
+    async def unsubscribe(self, websocket: WebSocket, list_ids: set[int]) -> None:
         async with self._lock:
-            self._connections[list_id].add(websocket)
+            subscriber = self._subscribers.get(websocket)
+            if subscriber is None:
+                return
+            for list_id in list_ids & subscriber.list_ids:
+                subscriber.list_ids.discard(list_id)
+                self._discard(list_id, websocket)
 
-    async def disconnect(self, list_id: int, websocket: WebSocket) -> None:
+    def subscriptions(self, websocket: WebSocket) -> set[int]:
+        subscriber = self._subscribers.get(websocket)
+        return set(subscriber.list_ids) if subscriber is not None else set()
+
+    async def send(self, websocket: WebSocket, message: dict[str, Any]) -> bool:
+        subscriber = self._subscribers.get(websocket)
+        if subscriber is None:
+            return False
+        return await self._send(subscriber, _encode(message, subscriber.encoding))
+
+    async def disconnect(self, websocket: WebSocket) -> None:
         async with self._lock:
-            connections = self._connections.get(list_id)
-            if connections and websocket in connections:
-                connections.remove(websocket)
-                if not connections:
-                    self._connections.pop(list_id, None)
+            self._remove(websocket)
+
+    def touch(self, websocket: WebSocket) -> None:
+        subscriber = self._subscribers.get(websocket)
+        if subscriber is not None:
+            subscriber.last_seen = time.monotonic()
 
     async def broadcast(self, list_id: int, message: dict[str, Any]) -> None:
         async with self._lock:
-            connections = list(self._connections.get(list_id, set()))
-
-        stale_connections: list[WebSocket] = []
-        for websocket in connections:
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                stale_connections.append(websocket)
-
-        if stale_connections:
-            async with self._lock:
-                remaining = self._connections.get(list_id)
-                if not remaining:
-                    return
-                for websocket in stale_connections:
-                    remaining.discard(websocket)
-                if not remaining:
-                    self._connections.pop(list_id, None)
+            event = self._record(list_id, message)
+            for queue in list(self._streams.get(list_id, ())):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # A reader this far behind resumes from the ring buffer after reconnecting.
+                    self._close_stream(list_id, queue)
+            subscribers = [
+                self._subscribers[websocket] for websocket in self._connections.get(list_id, ())
+            ]
+        stale = await self._send_all(subscribers, message)
+        if not stale:
+            return
+        async with self._lock:
+            for subscriber in stale:
+                if self._remove(subscriber.websocket):
+                    self.reaped_total += 1
+        # Closing ends the socket's receive loop; otherwise it lingers uncounted and unpinged.
+        await asyncio.gather(*(self._close(subscriber.websocket) for subscriber in stale))
+
+    def has_capacity(self, user_id: int | None) -> bool:
+        return self._has_capacity(user_id)
+
+    async def open_stream(
+        self, list_id: int, last_event_id: str | None = None, *, user_id: int | None = None
+    ) -> tuple[asyncio.Queue[StreamEvent | None], list[StreamEvent]] | None:
+        """Subscribe a stream to ``list_id``; ``None`` when the connection caps are reached.
+
+        Streams count toward the same global and per-user caps as WebSockets.
+        """
+        queue: asyncio.Queue[StreamEvent | None] = asyncio.Queue(self.stream_queue_size)
+        async with self._lock:
+            if not self._has_capacity(user_id):
+                self.rejected_total += 1
+                return None
+            backlog = self._missed_events(list_id, last_event_id)
+            self._streams[list_id].add(queue)
+            self._stream_users[queue] = user_id
+            if user_id is not None:
+                self._user_counts[user_id] += 1
+        return queue, backlog
+
+    def format_event_id(self, event_id: int) -> str:
+        return f"{self.epoch}-{event_id}"
+
+    async def close_stream(self, list_id: int, queue: asyncio.Queue[StreamEvent | None]) -> None:
+        async with self._lock:
+            self._discard_stream(list_id, queue)
+
+    async def heartbeat(self) -> None:
+        now = time.monotonic()
+        async with self._lock:
+            subscribers = list(self._subscribers.values())
+        expired = [s for s in subscribers if now - s.last_seen > self.heartbeat_timeout]
+        alive = [s for s in subscribers if now - s.last_seen <= self.heartbeat_timeout]
+        dead = expired + await self._send_all(alive, PING_MESSAGE)
+        if not dead:
+            return
+        async with self._lock:
+            for subscriber in dead:
+                if self._remove(subscriber.websocket):
+                    self.reaped_total += 1
+        await asyncio.gather(*(self._close(subscriber.websocket) for subscriber in dead))
+
+    def start(self) -> None:
+        if self._heartbeat_task is None and self.heartbeat_interval > 0:
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._run_heartbeats())
+
+    async def stop(self) -> None:
+        async with self._lock:
+            for list_id, queues in list(self._streams.items()):
+                for queue in list(queues):
+                    self._close_stream(list_id, queue)
+        if self._heartbeat_task is None:
+            return
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "live": len(self._subscribers),
+            "lists": len(self._connections),
+            "streams": sum(len(queues) for queues in self._streams.values()),
+            "history_lists": len(self._history),
+            "reaped_total": self.reaped_total,
+            "rejected_total": self.rejected_total,
+        }
+
+    async def _run_heartbeats(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await self.heartbeat()
+
+    def _has_capacity(self, user_id: int | None) -> bool:
+        if len(self._subscribers) + len(self._stream_users) >= self.max_connections:
+            return False
+        if user_id is not None and self._user_counts.get(user_id, 0) >= self.max_connections_per_user:
+            return False
+        return True
+
+    def _remove(self, websocket: WebSocket) -> bool:
+        subscriber = self._subscribers.pop(websocket, None)
+        if subscriber is None:
+            return False
+        for list_id in subscriber.list_ids:
+            self._discard(list_id, websocket)
+        self._release_user(subscriber.user_id)
+        return True
+
+    def _release_user(self, user_id: int | None) -> None:
+        if user_id is not None:
+            self._user_counts[user_id] -= 1
+            if self._user_counts[user_id] <= 0:
+                del self._user_counts[user_id]
+
+    def _history_for(self, list_id: int) -> tuple[int, deque[StreamEvent]]:
+        # The floor is the newest id this list may have had that is no longer buffered.
+        history = self._history.pop(list_id, None)
+        if history is None:
+            history = (self._last_event_id, deque(maxlen=self.event_buffer_size))
+        self._history[list_id] = history
+        while len(self._history) > self.max_history_lists:
+            self._history.popitem(last=False)
+        return history
+
+    def _record(self, list_id: int, message: dict[str, Any]) -> StreamEvent:
+        floor, events = self._history_for(list_id)
+        self._last_event_id += 1
+        event = (self._last_event_id, message)
+        if len(events) == events.maxlen:
+            floor = events[0][0] if events else event[0]
+        events.append(event)
+        self._history[list_id] = (floor, events)
+        return event
+
+    def _missed_events(self, list_id: int, last_event_id: str | None) -> list[StreamEvent]:
+        floor, events = self._history_for(list_id)
+        if last_event_id is None:
+            return []
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch == self.epoch and sequence.isdigit():
+            resume_after = int(sequence)
+            if floor <= resume_after <= self._last_event_id:
+                return [event for event in events if event[0] > resume_after]
+        # Ids from another process, or older than anything buffered for this list.
+        return [(self._last_event_id, {"type": "resync", "list_id": list_id})]
+
+    def _close_stream(self, list_id: int, queue: asyncio.Queue[StreamEvent | None]) -> None:
+        self._discard_stream(list_id, queue)
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _discard_stream(self, list_id: int, queue: asyncio.Queue[StreamEvent | None]) -> None:
+        if queue in self._stream_users:
+            self._release_user(self._stream_users.pop(queue))
+        queues = self._streams.get(list_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                self._streams.pop(list_id, None)
+
+    def _discard(self, list_id: int, websocket: WebSocket) -> None:
+        connections = self._connections.get(list_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
+                self._connections.pop(list_id, None)
+
+    async def _send_all(
+        self, subscribers: list[_Subscriber], message: dict[str, Any]
+    ) -> list[_Subscriber]:
+        encoded: dict[str, str | bytes] = {}
+        for subscriber in subscribers:
+            if subscriber.encoding not in encoded:
+                encoded[subscriber.encoding] = _encode(message, subscriber.encoding)
+        results = await asyncio.gather(
+            *(self._send(subscriber, encoded[subscriber.encoding]) for subscriber in subscribers)
+        )
+        return [subscriber for subscriber, delivered in zip(subscribers, results) if not delivered]
+
+    async def _send(self, subscriber: _Subscriber, payload: str | bytes) -> bool:
+        try:
+            if isinstance(payload, bytes):
+                await asyncio.wait_for(subscriber.websocket.send_bytes(payload), self.send_timeout)
+            else:
+                await asyncio.wait_for(subscriber.websocket.send_text(payload), self.send_timeout)
+        except Exception:
+            return False
+        return True
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=status.WS_1001_GOING_AWAY), self.send_timeout)
+        except Exception:
+            pass
+
 
+def _encode(message: dict[str, Any], encoding: str) -> str | bytes:
+    if encoding == "msgpack":
+        return packb(message)
+    return json.dumps(message, separators=(",", ":"))
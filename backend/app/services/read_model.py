@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.repositories.task import TaskRepository
+
+STATUSES = tuple(member.value for member in models.TaskStatusEnum)
+PRIORITIES = tuple(member.value for member in models.TaskPriorityEnum)
+
+_STATUS_CODES = {value: code for code, value in enumerate(STATUSES)}
+_PRIORITY_CODES = {value: code for code, value in enumerate(PRIORITIES)}
+_NO_DUE_DATE = 0
+# ids and positions (8 bytes each), due date ordinal (4), status and priority codes (1 each),
+# plus one pointer per row in each of the title, description, tags and recurrence lists.
+_FIXED_ROW_BYTES = 8 + 8 + 4 + 1 + 1 + 4 * 8
+
+
+class TaskChange:
+    __slots__ = (
+        "kind",
+        "list_id",
+        "version",
+        "task",
+        "task_id",
+        "ordered_ids",
+        "where",
+        "values",
+        "shard",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        list_id: int,
+        version: int,
+        *,
+        task: dict[str, Any] | None = None,
+        task_id: int | None = None,
+        ordered_ids: list[int] | None = None,
+        where: dict[str, str] | None = None,
+        values: dict[str, str] | None = None,
+        shard: int | None = None,
+    ) -> None:
+        self.kind = kind
+        self.list_id = list_id
+        self.version = version
+        self.task = task
+        self.task_id = task_id
+        self.ordered_ids = ordered_ids
+        self.where = where
+        self.values = values
+        self.shard = shard
+
+
+def task_row(task: Any) -> dict[str, Any]:
+    return {
+        "id": task.id,
+        "list_id": task.list_id,
+        "title": task.title,
+        "description": task.description,
+        "due_date": task.due_date,
+        "status": task.status,
+        "priority": task.priority,
+        "tags": list(task.tags or ()),
+        "position": task.position,
+        "recurrence": task.recurrence,
+    }
+
+
+class _ListColumns:
+    __slots__ = (
+        "list_id",
+        "version",
+        "ids",
+        "positions",
+        "due_dates",
+        "statuses",
+        "priorities",
+        "titles",
+        "descriptions",
+        "tags",
+        "recurrences",
+        "nbytes",
+    )
+
+    def __init__(self, list_id: int, version: int) -> None:
+        self.list_id = list_id
+        self.version = version
+        self.ids = array("q")
+        self.positions = array("q")
+        self.due_dates = array("i")
+        self.statuses = bytearray()
+        self.priorities = bytearray()
+        self.titles: list[str] = []
+        self.descriptions: list[str | None] = []
+        self.tags: list[tuple[str, ...]] = []
+        self.recurrences: list[dict[str, Any] | None] = []
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, task_id: int) -> int | None:
+        try:
+            return self.ids.index(task_id)
+        except ValueError:
+            return None
+
+    def insert(self, row: dict[str, Any]) -> None:
+        index = bisect_right(self.positions, row["position"])
+        due_date = row["due_date"]
+        self.ids.insert(index, row["id"])
+        self.positions.insert(index, row["position"])
+        self.due_dates.insert(index, due_date.toordinal() if due_date else _NO_DUE_DATE)
+        self.statuses.insert(index, _STATUS_CODES[row["status"]])
+        self.priorities.insert(index, _PRIORITY_CODES[row["priority"]])
+        self.titles.insert(index, row["title"])
+        self.descriptions.insert(index, row["description"])
+        self.tags.insert(index, tuple(sys.intern(tag) for tag in row["tags"]))
+        self.recurrences.insert(index, row["recurrence"])
+        self.nbytes += self._row_bytes(index)
+
+    def remove(self, index: int) -> None:
+        self.nbytes -= self._row_bytes(index)
+        for column in self._columns():
+            del column[index]
+
+    def reorder(self, ordered_ids: list[int]) -> bool:
+        if len(ordered_ids) != len(self.ids):
+            return False
+        order = [self.index_of(task_id) for task_id in ordered_ids]
+        if None in order or len(set(order)) != len(order):
+            return False
+        self.ids = array("q", (self.ids[i] for i in order))
+        self.due_dates = array("i", (self.due_dates[i] for i in order))
+        self.statuses = bytearray(self.statuses[i] for i in order)
+        self.priorities = bytearray(self.priorities[i] for i in order)
+        self.titles = [self.titles[i] for i in order]
+        self.descriptions = [self.descriptions[i] for i in order]
+        self.tags = [self.tags[i] for i in order]
+        self.recurrences = [self.recurrences[i] for i in order]
+        self.resequence()
+        return True
+
+    def resequence(self) -> None:
+        self.positions = array("q", range(len(self.ids)))
+
+    def rows(self, status: str | None = None, priority: str | None = None) -> list[dict[str, Any]]:
+        filters = (("status", status), ("priority", priority))
+        where = {column: value for column, value in filters if value is not None}
+        return [self.row(index) for index in self.matching(where)]
+
+    def matching(self, where: dict[str, str]) -> list[int]:
+        status_code = _STATUS_CODES.get(where["status"], -1) if "status" in where else None
+        priority_code = _PRIORITY_CODES.get(where["priority"], -1) if "priority" in where else None
+        return [
+            index
+            for index in range(len(self.ids))
+            if (status_code is None or self.statuses[index] == status_code)
+            and (priority_code is None or self.priorities[index] == priority_code)
+        ]
+
+    def update_matching(self, where: dict[str, str], values: dict[str, str]) -> None:
+        for index in self.matching(where):
+            if "status" in values and self.recurrences[index] is None:
+                self.statuses[index] = _STATUS_CODES[values["status"]]
+            if "priority" in values:
+                self.priorities[index] = _PRIORITY_CODES[values["priority"]]
+
+    def delete_matching(self, where: dict[str, str]) -> None:
+        for index in reversed(self.matching(where)):
+            self.remove(index)
+        self.resequence()
+
+    def row(self, index: int) -> dict[str, Any]:
+        due_date = self.due_dates[index]
+        return {
+            "id": self.ids[index],
+            "list_id": self.list_id,
+            "title": self.titles[index],
+            "description": self.descriptions[index],
+            "due_date": date.fromordinal(due_date) if due_date != _NO_DUE_DATE else None,
+            "status": STATUSES[self.statuses[index]],
+            "priority": PRIORITIES[self.priorities[index]],
+            "tags": list(self.tags[index]),
+            "position": self.positions[index],
+            "recurrence": self.recurrences[index],
+        }
+
+    def counts(self) -> dict[str, Any]:
+        return {
+            "total": len(self.ids),
+            "by_status": {value: self.statuses.count(code) for value, code in _STATUS_CODES.items()},
+            "by_priority": {
+                value: self.priorities.count(code) for value, code in _PRIORITY_CODES.items()
+            },
+        }
+
+    def _columns(self) -> tuple[Any, ...]:
+        return (
+            self.ids,
+            self.positions,
+            self.due_dates,
+            self.statuses,
+            self.priorities,
+            self.titles,
+            self.descriptions,
+            self.tags,
+            self.recurrences,
+        )
+
+    def _row_bytes(self, index: int) -> int:
+        description = self.descriptions[index]
+        tags = self.tags[index]
+        recurrence = self.recurrences[index]
+        return (
+            _FIXED_ROW_BYTES
+            + sys.getsizeof(self.titles[index])
+            + (sys.getsizeof(description) if description is not None else 0)
+            + (sys.getsizeof(recurrence) if recurrence is not None else 0)
+            + sys.getsizeof(tags)
+            + sum(sys.getsizeof(tag) for tag in tags)
+        )
+
+
+class TaskReadModel:
+    def __init__(self, *, max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._lists: OrderedDict[int, _ListColumns] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.applied = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def load(self, list_id: int, version: int, tasks: Iterable[Any]) -> None:
+        columns = _ListColumns(list_id, version)
+        for task in tasks:
+            columns.insert(task_row(task))
+        with self._lock:
+            existing = self._lists.get(list_id)
+            if existing is not None and existing.version >= version:
+                return
+            self._drop(list_id)
+            if columns.nbytes > self.max_bytes:
+                return
+            self._lists[list_id] = columns
+            self.current_bytes += columns.nbytes
+            self._evict()
+
+    def tasks(
+        self,
+        list_id: int,
+        version: int,
+        *,
+        status: str | None = None,
+        priority: str | None = None,
+    ) -> list[dict[str, Any]] | None:
+        with self._lock:
+            columns = self._fresh(list_id, version)
+            return columns.rows(status, priority) if columns is not None else None
+
+    def counts(self, list_id: int, version: int) -> dict[str, Any] | None:
+        with self._lock:
+            columns = self._fresh(list_id, version)
+            return columns.counts() if columns is not None else None
+
+    def apply(self, change: TaskChange) -> None:
+        with self._lock:
+            if change.kind == "delete_list":
+                self._drop(change.list_id)
+                return
+            columns = self._lists.get(change.list_id)
+            if columns is None:
+                return
+            # Changes from this process arrive after commit and may race each other; any gap
+            # means a write was missed or reordered, so reload from the database instead.
+            if change.version != columns.version + 1 or not self._apply(columns, change):
+                self._drop(change.list_id)
+                self.invalidations += 1
+                return
+            columns.version = change.version
+            self.applied += 1
+            self._lists.move_to_end(change.list_id)
+            self._evict()
+
+    def invalidate(self, list_id: int) -> None:
+        with self._lock:
+            if self._drop(list_id):
+                self.invalidations += 1
+
+    def verify(self, session: Session) -> dict[int, list[str]]:
+        with self._lock:
+            snapshot = {list_id: (columns.version, columns.rows()) for list_id, columns in self._lists.items()}
+        repository = TaskRepository(session)
+        mismatches: dict[int, list[str]] = {}
+        for list_id, (version, rows) in snapshot.items():
+            problems: list[str] = []
+            task_list = session.get(models.TaskList, list_id)
+            if task_list is None:
+                problems.append("list no longer exists")
+            elif task_list.version != version:
+                problems.append(f"version {version} != database version {task_list.version}")
+            expected = [task_row(task) for task in repository.list_for_task_list(list_id)]
+            if len(expected) != len(rows):
+                problems.append(f"{len(rows)} tasks != {len(expected)} in database")
+            for actual, wanted in zip(rows, expected):
+                if actual != wanted:
+                    problems.append(f"task {wanted['id']} differs: {actual} != {wanted}")
+            if problems:
+                mismatches[list_id] = problems
+        return mismatches
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "lists": len(self._lists),
+            "tasks": sum(len(columns) for columns in self._lists.values()),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "applied": self.applied,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+    def _fresh(self, list_id: int, version: int) -> _ListColumns | None:
+        columns = self._lists.get(list_id)
+        # A lagging replica can report an older version than changes already applied here.
+        if columns is None or columns.version < version:
+            self.misses += 1
+            return None
+        self._lists.move_to_end(list_id)
+        self.hits += 1
+        return columns
+
+    def _apply(self, columns: _ListColumns, change: TaskChange) -> bool:
+        before = columns.nbytes
+        if change.kind == "upsert":
+            index = columns.index_of(change.task["id"])
+            if index is not None:
+                columns.remove(index)
+            columns.insert(change.task)
+        elif change.kind == "delete":
+            index = columns.index_of(change.task_id)
+            if index is None:
+                return False
+            columns.remove(index)
+            columns.resequence()
+        elif change.kind == "reorder":
+            if not columns.reorder(change.ordered_ids):
+                return False
+        elif change.kind == "update_matching":
+            columns.update_matching(change.where, change.values)
+        elif change.kind == "delete_matching":
+            columns.delete_matching(change.where)
+        else:
+            return False
+        self.current_bytes += columns.nbytes - before
+        return True
+
+    def _drop(self, list_id: int) -> bool:
+        columns = self._lists.pop(list_id, None)
+        if columns is None:
+            return False
+        self.current_bytes -= columns.nbytes
+        return True
+
+    def _evict(self) -> None:
+        while self.current_bytes > self.max_bytes and self._lists:
+            list_id = next(iter(self._lists))
+            self._drop(list_id)
+            self.evictions += 1
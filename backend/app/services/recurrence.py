@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import calendar
+from collections.abc import Iterator
+from datetime import date, timedelta
+from typing import Any
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+
+
+def occurrences(rule: dict[str, Any], first: date, start: date, end: date) -> Iterator[date]:
+    """Yield the dates of a series starting on ``first`` that fall within ``start``..``end``.
+
+    Each frequency jumps straight to the first period inside the window, so the cost
+    depends on the window, not on how long the series has been running.
+    """
+    until = rule.get("until")
+    if until is not None:
+        end = min(end, date.fromisoformat(until))
+    start = max(start, first)
+    if start > end:
+        return
+    interval = rule.get("interval", 1)
+    frequency = rule["frequency"]
+    if frequency == "daily":
+        yield from _daily(first, start, end, interval)
+    elif frequency == "weekly":
+        weekdays = sorted(rule.get("weekdays") or [first.weekday()])
+        yield from _weekly(first, start, end, interval, weekdays)
+    elif frequency == "monthly":
+        yield from _monthly(first, start, end, interval)
+    else:
+        raise ValueError(f"Unknown frequency {frequency!r}")
+
+
+def is_occurrence(rule: dict[str, Any], first: date, day: date) -> bool:
+    return next(occurrences(rule, first, day, day), None) == day
+
+
+def _periods_until(offset: int, interval: int) -> int:
+    # The first multiple of interval that is not before offset.
+    return -(-offset // interval) * interval
+
+
+def _daily(first: date, start: date, end: date, interval: int) -> Iterator[date]:
+    day = first + timedelta(days=_periods_until((start - first).days, interval))
+    step = timedelta(days=interval)
+    while day <= end:
+        yield day
+        day += step
+
+
+def _weekly(
+    first: date, start: date, end: date, interval: int, weekdays: list[int]
+) -> Iterator[date]:
+    first_monday = first - timedelta(days=first.weekday())
+    week = (start - first_monday).days // 7
+    if week % interval:
+        week += interval - week % interval
+    while True:
+        monday = first_monday + timedelta(weeks=week)
+        if monday > end:
+            return
+        for weekday in weekdays:
+            day = monday + timedelta(days=weekday)
+            if day > end:
+                return
+            if day >= start:
+                yield day
+        week += interval
+
+
+def _monthly(first: date, start: date, end: date, interval: int) -> Iterator[date]:
+    # Months without the series' day (the 31st in April) are skipped, as in RFC 5545.
+    first_month = first.year * 12 + first.month - 1
+    month = first_month + _periods_until(start.year * 12 + start.month - 1 - first_month, interval)
+    while True:
+        year, index = divmod(month, 12)
+        if date(year, index + 1, 1) > end:
+            return
+        if first.day <= calendar.monthrange(year, index + 1)[1]:
+            day = date(year, index + 1, first.day)
+            if start <= day <= end:
+                yield day
+        month += interval
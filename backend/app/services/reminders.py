@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import time
+from collections.abc import Callable, Mapping
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.session import unit_of_work
+from app.repositories.reminder import ReminderRepository
+from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskChange
+
+logger = logging.getLogger(__name__)
+
+# Heap entries are mutable lists so a rescheduled or deleted task can be cancelled in place.
+_FIRE_AT, _TASK_ID, _LIST_ID, _DUE_DATE, _SHARD, _ACTIVE = range(6)
+
+
+class ReminderScheduler:
+    def __init__(
+        self,
+        session_factories: Mapping[int | None, Callable[[], Session]],
+        notifier: TaskNotifier,
+        *,
+        window_days: int = 1,
+        batch_size: int = 1000,
+        max_sleep_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        # Keyed by shard; None is the directory database.
+        self.session_factories = session_factories
+        self.notifier = notifier
+        self.window_days = window_days
+        self.batch_size = batch_size
+        self.max_sleep_seconds = max_sleep_seconds
+        self.clock = clock
+        self._heap: list[list] = []
+        self._entries: dict[int, list] = {}
+        self._loaded_until: date | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self.fired_total = 0
+        self.skipped_total = 0
+
+    def apply(self, changes: list[TaskChange]) -> None:
+        for change in changes:
+            if change.kind == "upsert":
+                row = change.task
+                if row["due_date"] is None or row["status"] == models.TaskStatusEnum.completed.value:
+                    self.cancel(row["id"])
+                else:
+                    self.schedule(row["id"], change.list_id, row["due_date"], change.shard)
+            elif change.kind == "delete":
+                self.cancel(change.task_id)
+
+    def schedule(
+        self, task_id: int, list_id: int, due_date: date, shard: int | None = None
+    ) -> None:
+        if self._loaded_until is None or not self._today() <= due_date <= self._loaded_until:
+            # Outside the loaded window; the refill that reaches this date will pick it up.
+            self.cancel(task_id)
+            return
+        existing = self._entries.get(task_id)
+        if existing is not None:
+            if existing[_DUE_DATE] == due_date and existing[_LIST_ID] == list_id:
+                return
+            existing[_ACTIVE] = False
+        entry = [_fire_at(due_date), task_id, list_id, due_date, shard, True]
+        self._entries[task_id] = entry
+        heapq.heappush(self._heap, entry)
+        self._compact()
+        self._wake.set()
+
+    def cancel(self, task_id: int) -> None:
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            entry[_ACTIVE] = False
+            self._compact()
+
+    async def refill(self) -> int:
+        today = self._today()
+        horizon = today + timedelta(days=self.window_days)
+        previous = self._loaded_until
+        start = today if previous is None or previous < today else previous + timedelta(days=1)
+        if start > horizon:
+            return 0
+        # Widen the window first so writes committed during the load are scheduled directly.
+        self._loaded_until = horizon
+        loaded = 0
+        try:
+            for shard in self.session_factories:
+                after: tuple[date, int] | None = None
+                while True:
+                    rows = await run_in_threadpool(self._load, shard, start, horizon, after)
+                    for row in rows:
+                        self.schedule(row.id, row.list_id, row.due_date, shard)
+                    loaded += len(rows)
+                    if len(rows) < self.batch_size:
+                        break
+                    after = (rows[-1].due_date, rows[-1].id)
+        except BaseException:
+            self._loaded_until = previous
+            raise
+        return loaded
+
+    async def fire_due(self) -> int:
+        now = self.clock()
+        due: list[list] = []
+        while self._heap and self._heap[0][_FIRE_AT] <= now:
+            entry = heapq.heappop(self._heap)
+            if entry[_ACTIVE]:
+                del self._entries[entry[_TASK_ID]]
+                due.append(entry)
+        if not due:
+            return 0
+        claimed = await run_in_threadpool(self._claim, due)
+        for row in claimed:
+            await self.notifier.broadcast(
+                row.list_id,
+                {
+                    "type": "task_due",
+                    "list_id": row.list_id,
+                    "task_id": row.id,
+                    "title": row.title,
+                    "due_date": row.due_date.isoformat(),
+                },
+            )
+        self.fired_total += len(claimed)
+        self.skipped_total += len(due) - len(claimed)
+        return len(claimed)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "scheduled": len(self._entries),
+            "heap": len(self._heap),
+            "fired_total": self.fired_total,
+            "skipped_total": self.skipped_total,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self._loaded_until is None or self._loaded_until < self._horizon():
+                    await self.refill()
+                await self.fire_due()
+            except Exception:
+                logger.exception("Reminder scheduling failed")
+            await self._sleep()
+
+    async def _sleep(self) -> None:
+        now = self.clock()
+        timeout = min(self.max_sleep_seconds, _fire_at(self._today() + timedelta(days=1)) - now)
+        if self._heap:
+            timeout = min(timeout, self._heap[0][_FIRE_AT] - now)
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            pass
+
+    def _load(
+        self, shard: int | None, start: date, end: date, after: tuple[date, int] | None
+    ) -> list[Row]:
+        with self.session_factories[shard]() as session:
+            return ReminderRepository(session).pending_between(
+                start, end, after=after, limit=self.batch_size
+            )
+
+    def _claim(self, due: list[list]) -> list[Row]:
+        by_shard: dict[int | None, list[list]] = {}
+        for entry in due:
+            by_shard.setdefault(entry[_SHARD], []).append(entry)
+        claimed: list[Row] = []
+        for shard, entries in by_shard.items():
+            with self.session_factories[shard]() as session, unit_of_work(session):
+                repository = ReminderRepository(session)
+                for entry in entries:
+                    row = repository.claim(entry[_TASK_ID], entry[_DUE_DATE])
+                    if row is not None:
+                        claimed.append(row)
+        return claimed
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if entry[_ACTIVE]]
+            heapq.heapify(self._heap)
+
+    def _today(self) -> date:
+        return datetime.fromtimestamp(self.clock(), timezone.utc).date()
+
+    def _horizon(self) -> date:
+        return self._today() + timedelta(days=self.window_days)
+
+
+def _fire_at(due_date: date) -> float:
+    return datetime(due_date.year, due_date.month, due_date.day, tzinfo=timezone.utc).timestamp()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
-from datetime import date
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, timezone
+from typing import Any
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.db import models
+from app.db.session import unit_of_work
+from app.repositories.occurrence import OccurrenceRepository
 from app.repositories.task import TaskRepository
 from app.repositories.task_list import TaskListRepository
+from app.services.list_cache import TaskListCache
+from app.services.read_model import TaskChange, TaskReadModel, task_row
+from app.services.recurrence import FREQUENCIES, is_occurrence, occurrences
 
 
 class TaskService:
@@ -15,13 +22,54 @@ class TaskService:
         self.session = session
         self.task_lists = TaskListRepository(session)
         self.tasks = TaskRepository(session)
+        self.occurrences = OccurrenceRepository(session)
+        self.changes: list[TaskChange] = []
 
     def create_list(self, *, owner_id: int, name: str) -> models.TaskList:
-        return self.task_lists.create(owner_id=owner_id, name=name)
+        with unit_of_work(self.session):
+            return self.task_lists.create(owner_id=owner_id, name=name)
+
+    def delete_list(self, *, list_id: int, owner_id: int) -> None:
+        with unit_of_work(self.session):
+            if not self.task_lists.delete_owned(list_id, owner_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task list not found")
+        self.changes.append(TaskChange("delete_list", list_id, 0))
 
     def list_lists(self, *, owner_id: int) -> list[models.TaskList]:
         return self.task_lists.list_for_user(owner_id)
 
+    def bootstrap(self, *, owner_id: int, list_id: int | None, limit: int) -> dict[str, Any]:
+        summaries = self.task_lists.summaries_for_user(owner_id)
+        selected = next((row for row in summaries if row.id == list_id), None)
+        if selected is None and summaries:
+            # A requested list that no longer exists falls back to the most recently active one.
+            selected = max(summaries, key=lambda row: row.last_activity)
+        tasks: list[models.Task] = []
+        if selected is not None:
+            tasks = self.tasks.list_for_task_list(selected.id, limit=limit + 1)
+        return {
+            "lists": [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "total": row.total,
+                    "by_status": {
+                        member.value: getattr(row, member.value) for member in models.TaskStatusEnum
+                    },
+                }
+                for row in summaries
+            ],
+            "selected_list_id": selected.id if selected is not None else None,
+            "tasks": tasks[:limit],
+            "has_more_tasks": len(tasks) > limit,
+        }
+
+    def owned_list_ids(self, *, owner_id: int, list_ids: set[int]) -> set[int]:
+        return self.task_lists.owned_ids(owner_id, list_ids)
+
+    def get_list(self, *, list_id: int, owner_id: int) -> models.TaskList:
+        return self._require_list(list_id, owner_id)
+
     def _require_list(self, list_id: int, owner_id: int) -> models.TaskList:
         task_list = self.task_lists.get_by_id(list_id)
         if task_list is None or task_list.owner_id != owner_id:
@@ -39,24 +87,83 @@ class TaskService:
         status: str,
         priority: str,
         tags: list[str] | None,
+        recurrence: dict[str, Any] | None = None,
     ) -> models.Task:
         self._require_list(list_id, owner_id)
-        self._validate_status(status)
-        validated_priority = self._validate_priority(priority)
-        normalized_tags = self._normalize_tags(tags)
-        return self.tasks.create(
-            list_id=list_id,
-            title=title,
-            description=description,
-            due_date=due_date,
-            status=status,
-            priority=validated_priority,
-            tags=normalized_tags,
-        )
+        _checked(validate_status, status)
+        if recurrence is not None and status != models.TaskStatusEnum.pending.value:
+            raise _series_status_error()
+        validated_priority = _checked(validate_priority, priority)
+        normalized_tags = _checked(normalize_tags, tags)
+        rule = None
+        if recurrence is not None:
+            rule = _checked(validate_recurrence, recurrence, due_date)
+        with unit_of_work(self.session):
+            task = self.tasks.create(
+                list_id=list_id,
+                title=title,
+                description=description,
+                due_date=due_date,
+                status=status,
+                priority=validated_priority,
+                tags=normalized_tags,
+                recurrence=rule,
+            )
+        self._record_upsert(task)
+        return task
 
-    def list_tasks(self, *, list_id: int, owner_id: int) -> list[models.Task]:
+    def list_tasks(self, *, list_id: int, owner_id: int) -> list[Any]:
         self._require_list(list_id, owner_id)
-        return self.tasks.list_for_task_list(list_id)
+        return with_next_occurrence(self.tasks.list_for_task_list(list_id), _today())
+
+    def list_tasks_encoded(
+        self,
+        *,
+        list_id: int,
+        owner_id: int,
+        media_type: str,
+        encode: Callable[[list[Any]], bytes],
+        status: str | None = None,
+        priority: str | None = None,
+        cache: TaskListCache | None = None,
+        read_model: TaskReadModel | None = None,
+    ) -> bytes:
+        task_list = self._require_list(list_id, owner_id)
+        today = _today()
+
+        def load() -> bytes:
+            return encode(
+                with_next_occurrence(self._task_rows(task_list, status, priority, read_model), today)
+            )
+
+        if cache is None:
+            return load()
+        # Series rows carry their next occurrence, so a cached body is only good for one day.
+        key = (media_type, status, priority, today)
+        return cache.get_or_load(list_id, task_list.version, key, load)
+
+    def count_tasks(
+        self, *, list_id: int, owner_id: int, read_model: TaskReadModel | None = None
+    ) -> dict[str, Any]:
+        task_list = self._require_list(list_id, owner_id)
+        if read_model is not None:
+            counts = read_model.counts(list_id, task_list.version)
+            if counts is None:
+                read_model.load(list_id, task_list.version, self.tasks.list_for_task_list(list_id))
+                counts = read_model.counts(list_id, task_list.version)
+            if counts is not None:
+                return counts
+        by_status = self.tasks.count_by(list_id, models.Task.status)
+        by_priority = self.tasks.count_by(list_id, models.Task.priority)
+        return {
+            "total": sum(by_status.values()),
+            "by_status": {
+                member.value: by_status.get(member.value, 0) for member in models.TaskStatusEnum
+            },
+            "by_priority": {
+                member.value: by_priority.get(member.value, 0) for member in models.TaskPriorityEnum
+            },
+        }
 
     def update_task(
         self,
@@ -69,30 +176,105 @@ class TaskService:
         status: str | None,
         priority: str | None,
         tags: list[str] | None,
+        recurrence: dict[str, Any] | None = None,
+        clear_recurrence: bool = False,
     ) -> models.Task:
         task = self.tasks.get_by_id(task_id)
         if task is None or task.task_list.owner_id != owner_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
         if status is not None:
-            self._validate_status(status)
-        validated_priority = self._validate_priority(priority) if priority is not None else None
-        normalized_tags = self._normalize_tags(tags) if tags is not None else None
-        return self.tasks.update(
-            task,
-            title=title,
-            description=description,
-            due_date=due_date,
-            status=status,
-            priority=validated_priority,
-            tags=normalized_tags,
+            _checked(validate_status, status)
+        validated_priority = _checked(validate_priority, priority) if priority is not None else None
+        normalized_tags = _checked(normalize_tags, tags) if tags is not None else None
+        rule = None
+        if recurrence is not None:
+            rule = _checked(validate_recurrence, recurrence, due_date or task.due_date)
+        elif task.recurrence is not None and not clear_recurrence:
+            # A new due date moves the series start; the rule must still hold from there.
+            _checked(validate_recurrence, task.recurrence, due_date or task.due_date)
+        is_series = rule is not None or task.recurrence is not None and not clear_recurrence
+        if is_series and status is not None and status != task.status:
+            raise _series_status_error()
+        # Overrides are keyed by date, so they only stay meaningful while the series keeps its start.
+        moves_series = due_date is not None and due_date != task.due_date
+        with unit_of_work(self.session):
+            if task.recurrence is not None and (moves_series or clear_recurrence and recurrence is None):
+                self.occurrences.delete_for_task(task.id)
+            task = self.tasks.update(
+                task,
+                title=title,
+                description=description,
+                due_date=due_date,
+                status=status,
+                priority=validated_priority,
+                tags=normalized_tags,
+                recurrence=rule,
+                clear_recurrence=clear_recurrence,
+            )
+        self._record_upsert(task)
+        return task
+
+    def agenda(
+        self, *, list_id: int, owner_id: int, start: date, end: date
+    ) -> list[dict[str, Any]]:
+        self._require_list(list_id, owner_id)
+        entries = [
+            (task.due_date, task.position, task, task.status, False)
+            for task in self.tasks.dated_between(list_id, start, end)
+        ]
+        series = {
+            task: list(occurrences(task.recurrence, task.due_date, start, end))
+            for task in self.tasks.series_starting_by(list_id, end)
+        }
+        changed = self.occurrences.statuses_between(
+            [task.id for task, days in series.items() if days], start, end
         )
+        for task, days in series.items():
+            entries.extend(
+                (day, task.position, task, changed.get((task.id, day), task.status), True)
+                for day in days
+            )
+        entries.sort(key=lambda entry: entry[:2])
+        return [
+            self._occurrence(task, day, task_status, recurring)
+            for day, _, task, task_status, recurring in entries
+        ]
+
+    def update_occurrence(
+        self, *, task_id: int, owner_id: int, occurrence_date: date, task_status: str
+    ) -> dict[str, Any]:
+        task = self.tasks.get_by_id(task_id)
+        if task is None or task.task_list.owner_id != owner_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+        if task.recurrence is None or not is_occurrence(
+            task.recurrence, task.due_date, occurrence_date
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Occurrence not found"
+            )
+        _checked(validate_status, task_status)
+        with unit_of_work(self.session):
+            self.occurrences.upsert(
+                task_id=task.id,
+                list_id=task.list_id,
+                occurrence_date=occurrence_date,
+                status=task_status,
+            )
+            self.tasks.bump_versions({task.list_id})
+        # The series row is unchanged, but the bumped version has to reach the read model.
+        self._record_upsert(task)
+        return self._occurrence(task, occurrence_date, task_status, True)
 
     def delete_task(self, *, task_id: int, owner_id: int) -> int:
         task = self.tasks.get_by_id(task_id)
         if task is None or task.task_list.owner_id != owner_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
         list_id = task.list_id
-        self.tasks.delete(task)
+        with unit_of_work(self.session):
+            self.tasks.delete(task)
+        self.changes.append(
+            TaskChange("delete", list_id, self.tasks.list_versions[list_id], task_id=task_id)
+        )
         return list_id
 
     def reorder_tasks(self, *, list_id: int, owner_id: int, ordered_ids: list[int]) -> list[models.Task]:
@@ -103,47 +285,180 @@ class TaskService:
                 detail="Task order cannot be empty",
             )
         try:
-            return self.tasks.reorder(list_id, ordered_ids)
+            with unit_of_work(self.session):
+                tasks = self.tasks.reorder(list_id, ordered_ids)
         except ValueError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
             ) from exc
-
-    def _validate_status(self, status: str) -> None:
-        if status not in {member.value for member in models.TaskStatusEnum}:
-            valid = ", ".join(member.value for member in models.TaskStatusEnum)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid status. Valid values: {valid}",
+        self.changes.append(
+            TaskChange(
+                "reorder", list_id, self.tasks.list_versions[list_id], ordered_ids=list(ordered_ids)
             )
+        )
+        return tasks
 
-    def _validate_priority(self, priority: str | None) -> str:
-        value = priority or models.TaskPriorityEnum.medium.value
-        if value not in {member.value for member in models.TaskPriorityEnum}:
-            valid = ", ".join(member.value for member in models.TaskPriorityEnum)
+    def update_matching(
+        self, *, list_id: int, owner_id: int, where: dict[str, str], values: dict[str, str]
+    ) -> int:
+        if not values:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid priority. Valid values: {valid}",
+                detail="Provide a status or priority to set",
             )
-        return value
-
-    def _normalize_tags(self, tags: list[str] | None) -> list[str]:
-        if tags is None:
-            return []
-        if not isinstance(tags, list):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Tags must be provided as a list of strings",
+        self._require_list(list_id, owner_id)
+        with unit_of_work(self.session):
+            updated = self.tasks.update_matching(list_id, where=where, values=values)
+        if updated:
+            version = self.tasks.list_versions[list_id]
+            self.changes.append(
+                TaskChange("update_matching", list_id, version, where=where, values=values)
             )
-        normalized: list[str] = []
-        for tag in tags:
-            if not isinstance(tag, str):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Each tag must be a string",
+        return updated
+
+    def clear_completed(self, *, list_id: int, owner_id: int) -> int:
+        self._require_list(list_id, owner_id)
+        where = {"status": models.TaskStatusEnum.completed.value}
+        with unit_of_work(self.session):
+            deleted = self.tasks.delete_matching(list_id, where=where)
+        if deleted:
+            version = self.tasks.list_versions[list_id]
+            self.changes.append(TaskChange("delete_matching", list_id, version, where=where))
+        return deleted
+
+    def _task_rows(
+        self,
+        task_list: models.TaskList,
+        status: str | None,
+        priority: str | None,
+        read_model: TaskReadModel | None,
+    ) -> list[Any]:
+        if read_model is not None:
+            rows = read_model.tasks(task_list.id, task_list.version, status=status, priority=priority)
+            if rows is None:
+                tasks = self.tasks.list_for_task_list(task_list.id)
+                read_model.load(task_list.id, task_list.version, tasks)
+                rows = read_model.tasks(
+                    task_list.id, task_list.version, status=status, priority=priority
                 )
-            stripped = tag.strip()
-            if stripped:
-                normalized.append(stripped)
-        return normalized
+            if rows is not None:
+                return rows
+        return self.tasks.list_for_task_list(task_list.id, status=status, priority=priority)
+
+    def _record_upsert(self, task: models.Task) -> None:
+        version = self.tasks.list_versions[task.list_id]
+        shard = self.session.info.get("shard")
+        self.changes.append(
+            TaskChange("upsert", task.list_id, version, task=task_row(task), shard=shard)
+        )
+
+    def _occurrence(
+        self, task: models.Task, day: date, task_status: str, recurring: bool
+    ) -> dict[str, Any]:
+        return {
+            "task_id": task.id,
+            "list_id": task.list_id,
+            "occurrence_date": day,
+            "title": task.title,
+            "description": task.description,
+            "status": task_status,
+            "priority": task.priority,
+            "tags": list(task.tags or ()),
+            "recurring": recurring,
+        }
+
+
+def with_next_occurrence(rows: Iterable[Any], today: date) -> list[Any]:
+    """Add the first occurrence on or after ``today`` to series rows, as the agenda shows it."""
+    result = []
+    for row in rows:
+        rule = row["recurrence"] if isinstance(row, dict) else row.recurrence
+        if rule is None:
+            result.append(row)
+            continue
+        series = dict(row) if isinstance(row, dict) else task_row(row)
+        series["next_occurrence"] = next(occurrences(rule, series["due_date"], today, date.max), None)
+        result.append(series)
+    return result
+
+
+def validate_recurrence(rule: dict[str, Any], due_date: date | None) -> dict[str, Any]:
+    if not isinstance(rule, dict):
+        raise ValueError("Recurrence must be an object")
+    if due_date is None:
+        raise ValueError("A recurring task needs a due date for its first occurrence")
+    if rule.get("frequency") not in FREQUENCIES:
+        raise ValueError(f"Invalid frequency. Valid values: {', '.join(FREQUENCIES)}")
+    interval = 1 if rule.get("interval") is None else rule["interval"]
+    if not isinstance(interval, int) or isinstance(interval, bool) or not 1 <= interval <= 366:
+        raise ValueError("Interval must be a whole number from 1 to 366")
+    weekdays = rule.get("weekdays") or []
+    if not isinstance(weekdays, list) or any(type(day) is not int or day not in range(7) for day in weekdays):
+        raise ValueError("Weekdays are numbered 0 (Monday) to 6 (Sunday)")
+    weekdays = sorted(set(weekdays))
+    if weekdays and rule["frequency"] != "weekly":
+        raise ValueError("Weekdays only apply to weekly recurrence")
+    until = rule.get("until")
+    if until is not None:
+        try:
+            until = date.fromisoformat(str(until))
+        except ValueError as exc:
+            raise ValueError("Recurrence end must be an ISO date") from exc
+        if until < due_date:
+            raise ValueError("Recurrence cannot end before the first occurrence")
+    return {
+        "frequency": rule["frequency"],
+        "interval": interval,
+        "weekdays": weekdays,
+        "until": str(until) if until is not None else None,
+    }
+
+
+def validate_status(value: str) -> str:
+    if value not in {member.value for member in models.TaskStatusEnum}:
+        valid = ", ".join(member.value for member in models.TaskStatusEnum)
+        raise ValueError(f"Invalid status. Valid values: {valid}")
+    return value
+
+
+def validate_priority(value: str | None) -> str:
+    value = value or models.TaskPriorityEnum.medium.value
+    if value not in {member.value for member in models.TaskPriorityEnum}:
+        valid = ", ".join(member.value for member in models.TaskPriorityEnum)
+        raise ValueError(f"Invalid priority. Valid values: {valid}")
+    return value
+
+
+def normalize_tags(tags: list[str] | None) -> list[str]:
+    if tags is None:
+        return []
+    if not isinstance(tags, list):
+        raise ValueError("Tags must be provided as a list of strings")
+    normalized: list[str] = []
+    for tag in tags:
+        if not isinstance(tag, str):
+            raise ValueError("Each tag must be a string")
+        stripped = tag.strip()
+        if stripped:
+            normalized.append(stripped)
+    return normalized
+
+
+def _checked(validate: Callable[..., Any], *args: Any) -> Any:
+    # The validators are shared with imports, which report errors per line instead.
+    try:
+        return validate(*args)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def _series_status_error() -> HTTPException:
+    # The series row is the default for every occurrence; completing it would complete them all.
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Set the status of a recurring task per occurrence: PUT /api/tasks/{id}/occurrences/{date}",
+    )
+
 
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
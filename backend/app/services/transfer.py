@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import itertools
+import json
+from collections.abc import Iterable, Iterator
+from datetime import date
+from typing import Any
+
+from fastapi import HTTPException, status
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.session import unit_of_work
+from app.repositories.archive import ArchiveRepository
+from app.repositories.task import TaskRepository
+from app.repositories.task_list import TaskListRepository
+from app.services.task import normalize_tags, validate_priority, validate_recurrence, validate_status
+
+CSV_COLUMNS = (
+    "list_id",
+    "list_name",
+    "task_id",
+    "title",
+    "description",
+    "due_date",
+    "status",
+    "priority",
+    "tags",
+    "position",
+    "recurrence",
+    "archived",
+)
+
+
+class TransferService:
+    def __init__(self, session: Session, *, batch_size: int = 5000):
+        self.session = session
+        self.batch_size = batch_size
+        self.task_lists = TaskListRepository(session)
+        self.tasks = TaskRepository(session)
+        self.archive = ArchiveRepository(session)
+
+    def export_ndjson(self, *, owner_id: int) -> Iterator[bytes]:
+        current_list_id = None
+        for rows in self.tasks.iter_export_rows(owner_id, self.batch_size):
+            lines: list[str] = []
+            for row in rows:
+                if row.list_id != current_list_id:
+                    current_list_id = row.list_id
+                    lines.append(json.dumps({"type": "list", "id": row.list_id, "name": row.list_name}))
+                if row.task_id is not None:
+                    lines.append(_task_json(row, archived=False))
+            lines.append("")
+            yield "\n".join(lines).encode("utf-8")
+        # Every list was emitted above, so archived tasks only need their own records.
+        for rows in self.archive.iter_export_rows(owner_id, self.batch_size):
+            lines = [_task_json(row, archived=True) for row in rows]
+            lines.append("")
+            yield "\n".join(lines).encode("utf-8")
+
+    def export_csv(self, *, owner_id: int) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        batches = itertools.chain(
+            ((rows, False) for rows in self.tasks.iter_export_rows(owner_id, self.batch_size)),
+            ((rows, True) for rows in self.archive.iter_export_rows(owner_id, self.batch_size)),
+        )
+        for rows, archived in batches:
+            for row in rows:
+                has_task = row.task_id is not None
+                writer.writerow(
+                    (
+                        row.list_id,
+                        row.list_name,
+                        row.task_id if has_task else "",
+                        row.title if has_task else "",
+                        row.description or "",
+                        row.due_date.isoformat() if row.due_date else "",
+                        row.status if has_task else "",
+                        row.priority if has_task else "",
+                        json.dumps(row.tags) if has_task else "",
+                        row.position if has_task else "",
+                        json.dumps(row.recurrence) if row.recurrence is not None else "",
+                        ("true" if archived else "false") if has_task else "",
+                    )
+                )
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def import_ndjson(self, *, owner_id: int, lines: Iterable[str]) -> dict[str, int]:
+        return self._import_records(owner_id, self._ndjson_records(lines))
+
+    def import_csv(self, *, owner_id: int, lines: Iterable[str]) -> dict[str, int]:
+        return self._import_records(owner_id, self._csv_records(lines))
+
+    def _import_records(
+        self, owner_id: int, records: Iterable[tuple[int, dict[str, Any]]]
+    ) -> dict[str, int]:
+        list_ids: dict[Any, int] = {}
+        next_positions: dict[int, int] = {}
+        next_archived_positions: dict[int, int] = {}
+        batch: list[dict[str, Any]] = []
+        archived_batch: list[dict[str, Any]] = []
+        imported_tasks = 0
+        imported_archived = 0
+        with unit_of_work(self.session):
+            for line_number, record in records:
+                if record.get("type") == "list":
+                    name = record.get("name")
+                    if not isinstance(name, str) or not name.strip():
+                        raise _invalid_record(line_number, "list name is required")
+                    source_id = _source_list_id(line_number, record.get("id"))
+                    task_list = self.task_lists.create(name=name, owner_id=owner_id)
+                    list_ids[source_id] = task_list.id
+                    next_positions[task_list.id] = 0
+                    next_archived_positions[task_list.id] = 0
+                    continue
+                target_list_id = list_ids.get(_source_list_id(line_number, record.get("list_id")))
+                if target_list_id is None:
+                    raise _invalid_record(line_number, "task refers to an unknown list")
+                row = self._task_row(line_number, record)
+                archived = record.get("archived", False)
+                if not isinstance(archived, bool):
+                    raise _invalid_record(line_number, "archived must be true or false")
+                positions = next_archived_positions if archived else next_positions
+                row["list_id"] = target_list_id
+                row["position"] = positions[target_list_id]
+                positions[target_list_id] += 1
+                if archived:
+                    archived_batch.append(row)
+                    if len(archived_batch) >= self.batch_size:
+                        imported_archived += self.archive.bulk_create(archived_batch)
+                        archived_batch = []
+                    continue
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    imported_tasks += self.tasks.bulk_create(batch)
+                    batch = []
+            imported_tasks += self.tasks.bulk_create(batch)
+            imported_archived += self.archive.bulk_create(archived_batch)
+        return {"lists": len(list_ids), "tasks": imported_tasks, "archived": imported_archived}
+
+    def _ndjson_records(self, lines: Iterable[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise _invalid_record(line_number, "invalid JSON") from exc
+            if not isinstance(record, dict) or record.get("type") not in {"list", "task"}:
+                raise _invalid_record(line_number, "expected a list or task record")
+            yield line_number, record
+
+    def _csv_records(self, lines: Iterable[str]) -> Iterator[tuple[int, dict[str, Any]]]:
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None or not {"list_id", "list_name", "title"} <= set(reader.fieldnames):
+            raise _invalid_record(1, "missing CSV header")
+        seen_lists: set[str] = set()
+        for row in reader:
+            line_number = reader.line_num
+            list_id = row.get("list_id")
+            if list_id not in seen_lists:
+                seen_lists.add(list_id)
+                yield line_number, {"type": "list", "id": list_id, "name": row.get("list_name")}
+            if not row.get("title"):
+                continue
+            raw_tags = row.get("tags")
+            try:
+                tags = json.loads(raw_tags) if raw_tags else []
+            except json.JSONDecodeError as exc:
+                raise _invalid_record(line_number, "tags must be a JSON array") from exc
+            raw_recurrence = row.get("recurrence")
+            try:
+                recurrence = json.loads(raw_recurrence) if raw_recurrence else None
+            except json.JSONDecodeError as exc:
+                raise _invalid_record(line_number, "recurrence must be a JSON object") from exc
+            yield line_number, {
+                "type": "task",
+                "list_id": list_id,
+                "title": row.get("title"),
+                "description": row.get("description") or None,
+                "due_date": row.get("due_date") or None,
+                "status": row.get("status") or None,
+                "priority": row.get("priority") or None,
+                "tags": tags,
+                "recurrence": recurrence,
+                "archived": (row.get("archived") or "").lower() == "true",
+            }
+
+    def _task_row(self, line_number: int, record: dict[str, Any]) -> dict[str, Any]:
+        title = record.get("title")
+        if not isinstance(title, str) or not title:
+            raise _invalid_record(line_number, "task title is required")
+        description = record.get("description")
+        if description is not None and not isinstance(description, str):
+            raise _invalid_record(line_number, "description must be a string")
+        due_date = record.get("due_date")
+        if due_date is not None:
+            try:
+                due_date = date.fromisoformat(due_date)
+            except (TypeError, ValueError) as exc:
+                raise _invalid_record(line_number, "due_date must be an ISO date") from exc
+        rule = record.get("recurrence")
+        try:
+            task_status = validate_status(record.get("status") or models.TaskStatusEnum.pending.value)
+            priority = validate_priority(record.get("priority"))
+            tags = normalize_tags(record.get("tags"))
+            recurrence = validate_recurrence(rule, due_date) if rule is not None else None
+        except ValueError as exc:
+            raise _invalid_record(line_number, str(exc)) from exc
+        return {
+            "title": title,
+            "description": description,
+            "due_date": due_date,
+            "status": task_status,
+            "priority": priority,
+            "tags": tags,
+            "recurrence": recurrence,
+        }
+
+
+def _task_json(row: Row, *, archived: bool) -> str:
+    return json.dumps(
+        {
+            "type": "task",
+            "id": row.task_id,
+            "list_id": row.list_id,
+            "title": row.title,
+            "description": row.description,
+            "due_date": row.due_date.isoformat() if row.due_date else None,
+            "status": row.status,
+            "priority": row.priority,
+            "tags": row.tags,
+            "position": row.position,
+            "recurrence": row.recurrence,
+            "archived": archived,
+        }
+    )
+
+
+def decode_lines(lines: Iterable[bytes]) -> Iterator[str]:
+    """Decode an uploaded file line by line, rejecting bytes that are not UTF-8 by line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    line_number = 1
+    try:
+        for line_number, line in enumerate(lines, start=1):
+            yield decoder.decode(line)
+        tail = decoder.decode(b"", final=True)
+    except UnicodeDecodeError as exc:
+        raise _invalid_record(line_number, "not valid UTF-8") from exc
+    if tail:
+        yield tail
+
+
+def _source_list_id(line_number: int, value: Any) -> Any:
+    if value is not None and (not isinstance(value, (str, int)) or isinstance(value, bool)):
+        raise _invalid_record(line_number, "list ids must be strings or integers")
+    return value
+
+
+def _invalid_record(line_number: int, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Line {line_number}: {message}",
+    )
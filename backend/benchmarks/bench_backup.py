@@ -0,0 +1,163 @@
+"""Measure how an online backup affects concurrent writers and readers.
+
+Builds a ``--mb`` sized database of tasks, then backs it up while one thread commits a
+small write every ``--interval`` seconds and another reads a list page. Compares a copy
+in one step (what ``Connection.backup`` does by default) against the stepped backup in
+rollback journal mode and as a WAL snapshot. Latencies are for the concurrent writes and
+reads; ``idle`` is the same load with no backup running.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_backup --mb 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from app.db.backup import backup_sqlite
+
+ROW_BYTES = 400
+
+
+def _build(path: Path, megabytes: int, journal_mode: str) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+    connection.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY, list_id INTEGER NOT NULL, title TEXT)"
+    )
+    connection.execute("CREATE INDEX ix_tasks_list_id ON tasks (list_id)")
+    rows = megabytes * 1_000_000 // ROW_BYTES
+    batch = 50_000
+    for start in range(0, rows, batch):
+        connection.executemany(
+            "INSERT INTO tasks (list_id, title) VALUES (?, ?)",
+            ((number % 1000, "x" * ROW_BYTES) for number in range(start, min(start + batch, rows))),
+        )
+        connection.commit()
+    connection.close()
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | int | None]:
+    if len(samples) < 2:
+        return {"count": len(samples), "p50_ms": None, "p99_ms": None, "max_ms": None}
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "count": len(samples),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+class _Load:
+    def __init__(self, path: Path, interval: float) -> None:
+        self.path = path
+        self.interval = interval
+        self.writes: list[float] = []
+        self.reads: list[float] = []
+        self.errors = 0
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._write), threading.Thread(target=self._read)]
+
+    def __enter__(self) -> _Load:
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+    def _write(self) -> None:
+        connection = sqlite3.connect(self.path, timeout=30)
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                connection.execute("INSERT INTO tasks (list_id, title) VALUES (1, 'new')")
+                connection.commit()
+            except sqlite3.OperationalError:
+                self.errors += 1
+            self.writes.append(time.perf_counter() - started)
+            time.sleep(self.interval)
+        connection.close()
+
+    def _read(self) -> None:
+        connection = sqlite3.connect(self.path, timeout=30)
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            connection.execute(
+                "SELECT id, title FROM tasks WHERE list_id = 7 ORDER BY id DESC LIMIT 50"
+            ).fetchall()
+            self.reads.append(time.perf_counter() - started)
+            time.sleep(self.interval)
+        connection.close()
+
+
+def _measure(
+    path: Path, target: Path, interval: float, step_pages: int, sleep: float
+) -> dict[str, Any]:
+    with _Load(path, interval) as load:
+        time.sleep(0.5)
+        if step_pages:
+            result = backup_sqlite(path, target, step_pages=step_pages, step_sleep_seconds=sleep)
+        else:
+            started = time.perf_counter()
+            source, destination = sqlite3.connect(path, timeout=30), sqlite3.connect(target)
+            source.backup(destination)
+            source.close()
+            destination.close()
+            result = {"seconds": round(time.perf_counter() - started, 3), "restarts": 0}
+    target.unlink(missing_ok=True)
+    return {
+        "backup_seconds": result["seconds"],
+        "restarts": result["restarts"],
+        "write": _percentiles(load.writes),
+        "read": _percentiles(load.reads),
+        "errors": load.errors,
+    }
+
+
+def _idle(path: Path, interval: float, seconds: float) -> dict[str, Any]:
+    with _Load(path, interval) as load:
+        time.sleep(seconds)
+    return {"write": _percentiles(load.writes), "read": _percentiles(load.reads)}
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal_mode in ("delete", "wal"):
+            path = Path(tmp) / f"{journal_mode}.db"
+            _build(path, args.mb, journal_mode)
+            target = Path(tmp) / "backup.db"
+            results[journal_mode] = {
+                "database_mb": round(path.stat().st_size / 1_000_000, 1),
+                "idle": _idle(path, args.interval, 3.0),
+                "one_step": _measure(path, target, args.interval, 0, 0.0),
+                "stepped": _measure(path, target, args.interval, args.step_pages, args.step_sleep),
+            }
+            path.unlink()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=int, default=500, help="approximate database size")
+    parser.add_argument("--interval", type=float, default=0.005, help="seconds between operations")
+    parser.add_argument("--step-pages", type=int, default=256)
+    parser.add_argument("--step-sleep", type=float, default=0.01)
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "backup", **run(args)}))
+
+
+if __name__ == "__main__":
+    main()
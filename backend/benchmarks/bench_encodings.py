@@ -0,0 +1,106 @@
+"""Compare wire size and CPU cost of response encodings for task lists.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_encodings --tasks 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from datetime import date
+
+from app.api.middleware.compression import (
+    _BrotliCompressor,
+    _GzipCompressor,
+    _ZstdCompressor,
+    brotli,
+    zstandard,
+)
+from app.core.encoding import msgpack_available, packb
+from app.schemas.task import TaskRead
+
+
+def _payload(task_count: int) -> list[dict]:
+    tasks = [
+        TaskRead(
+            id=index,
+            list_id=1,
+            title=f"Task number {index}",
+            description="Review the quarterly planning notes and follow up." if index % 2 else None,
+            due_date=date(2025, 11, 1 + index % 28),
+            status=("pending", "in_progress", "completed")[index % 3],
+            priority=("low", "medium", "high")[index % 3],
+            tags=["work", "q4"] if index % 4 else [],
+            position=index,
+        )
+        for index in range(task_count)
+    ]
+    return [task.model_dump(mode="json") for task in tasks]
+
+
+def _compress(factory: Callable[[], object]) -> Callable[[bytes], bytes]:
+    def run(body: bytes) -> bytes:
+        compressor = factory()
+        return compressor.compress(body) + compressor.finish()
+
+    return run
+
+
+def _measure(encode: Callable[[], bytes], iterations: int) -> tuple[int, float]:
+    size = len(encode())
+    started = time.process_time()
+    for _ in range(iterations):
+        encode()
+    return size, (time.process_time() - started) / iterations * 1_000_000
+
+
+def run(task_count: int, iterations: int) -> list[dict[str, float | str]]:
+    payload = _payload(task_count)
+    serializers: dict[str, Callable[[], bytes]] = {
+        "json": lambda: json.dumps(payload, separators=(",", ":")).encode("utf-8"),
+    }
+    if msgpack_available():
+        serializers["msgpack"] = lambda: packb(payload)
+
+    compressors: dict[str, Callable[[bytes], bytes] | None] = {
+        "identity": None,
+        "gzip": _compress(lambda: _GzipCompressor(5)),
+    }
+    if brotli is not None:
+        compressors["br"] = _compress(lambda: _BrotliCompressor(4))
+    if zstandard is not None:
+        compressors["zstd"] = _compress(lambda: _ZstdCompressor(3))
+
+    results: list[dict[str, float | str]] = []
+    for media_type, serialize in serializers.items():
+        for content_encoding, compress in compressors.items():
+            if compress is None:
+                encode = serialize
+            else:
+                encode = lambda serialize=serialize, compress=compress: compress(serialize())
+            size, cpu_us = _measure(encode, iterations)
+            results.append(
+                {
+                    "media_type": media_type,
+                    "content_encoding": content_encoding,
+                    "bytes": size,
+                    "cpu_us_per_response": round(cpu_us, 1),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    for result in run(args.tasks, args.iterations):
+        print(json.dumps({"benchmark": "encodings", "tasks": args.tasks, **result}))
+
+
+if __name__ == "__main__":
+    main()
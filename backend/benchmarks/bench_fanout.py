@@ -0,0 +1,309 @@
+"""Measure WebSocket fan-out: delivery latency, memory per connection and broadcast CPU.
+
+Starts one uvicorn worker against a fresh database and opens ``--clients`` sockets on
+``/api/ws/lists/{id}``, spread round-robin over ``--lists`` lists. A ``--slow-fraction`` of
+them sleep ``--slow-delay`` seconds after every message, so the server's sends to them
+back up. Then ``--writers`` concurrent writers create ``--mutations`` tasks per list. Each
+write's send time is matched with the ``tasks_changed`` message every subscriber of that
+list receives.
+
+Server memory and CPU come from ``/proc``, so those fields are null off Linux. The
+broadcast CPU figure is the server CPU spent during the write phase minus what the same
+writes cost on a list without subscribers. ``broadcast_micro`` times
+``TaskNotifier.broadcast`` in-process with sockets whose sends return at once. The clients
+run in this process, so on small machines they compete with the server for CPU.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_fanout --clients 2000 --lists 50 --mutations 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+from websockets.asyncio.client import connect
+
+from app.services.notifier import TaskNotifier
+from benchmarks.bench_server import free_port, wait_ready
+
+CONNECT_BATCH = 200
+
+
+def _start(port: int, database: Path, clients: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "ADMISSION_CONTROL_ENABLED": "false",
+        "WEBSOCKET_MAX_CONNECTIONS": str(clients + 100),
+        "WEBSOCKET_MAX_CONNECTIONS_PER_USER": str(clients + 100),
+    }
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+    command += ["--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _rss_bytes(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _cpu_seconds(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as stat:
+            fields = stat.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def _percentiles(samples: list[float]) -> dict[str, float | None]:
+    if len(samples) < 2:
+        return {"p50_ms": None, "p90_ms": None, "p99_ms": None, "max_ms": None}
+    quantiles = statistics.quantiles(samples, n=100)
+    return {
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p90_ms": round(quantiles[89] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "max_ms": round(max(samples) * 1000, 2),
+    }
+
+
+class _Subscriber:
+    def __init__(self, list_id: int, slow_delay: float) -> None:
+        self.list_id = list_id
+        self.slow_delay = slow_delay
+        self.received = 0
+        self.latencies: list[float] = []
+        self.closed = False
+
+    async def run(self, url: str, sent_at: dict[int, list[float]], opened: asyncio.Event) -> None:
+        # A one-frame client queue makes a slow reader push back on the server quickly.
+        async with connect(url, ping_interval=None, max_queue=1 if self.slow_delay else 16) as socket:
+            opened.set()
+            try:
+                async for raw in socket:
+                    message = json.loads(raw)
+                    if message.get("type") != "tasks_changed":
+                        continue
+                    self.latencies.append(time.perf_counter() - sent_at[self.list_id][self.received])
+                    self.received += 1
+                    if self.slow_delay:
+                        await asyncio.sleep(self.slow_delay)
+            finally:
+                self.closed = True
+
+
+async def _write_list(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    list_id: int,
+    mutations: int,
+    sent_at: dict[int, list[float]],
+    gate: asyncio.Semaphore,
+) -> None:
+    for number in range(mutations):
+        async with gate:
+            sent_at[list_id].append(time.perf_counter())
+            response = await client.post(
+                f"/api/lists/{list_id}/tasks", json={"title": f"Task {number}"}, headers=headers
+            )
+            response.raise_for_status()
+
+
+async def _drive(args: argparse.Namespace, port: int, pid: int) -> dict[str, Any]:
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        await wait_ready(client)
+        response = await client.post(
+            "/api/register", json={"email": "fanout@example.com", "password": "bench-password"}
+        )
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        list_ids = [
+            (await client.post("/api/lists", json={"name": f"L{index}"}, headers=headers)).json()["id"]
+            for index in range(args.lists + 1)
+        ]
+        idle_list, list_ids = list_ids[0], list_ids[1:]
+        gate = asyncio.Semaphore(args.writers)
+
+        # Cost of the same writes with nobody listening, to separate fan-out from the write path.
+        idle_sent: dict[int, list[float]] = defaultdict(list)
+        await _write_list(client, headers, idle_list, 5, idle_sent, gate)
+        cpu_before = _cpu_seconds(pid)
+        await _write_list(client, headers, idle_list, args.calibration_writes, idle_sent, gate)
+        cpu_after = _cpu_seconds(pid)
+        write_cpu = (
+            (cpu_after - cpu_before) / args.calibration_writes
+            if cpu_before is not None and cpu_after is not None
+            else None
+        )
+
+        rss_before = _rss_bytes(pid)
+        slow_every = round(1 / args.slow_fraction) if args.slow_fraction > 0 else 0
+        sent_at: dict[int, list[float]] = defaultdict(list)
+        subscribers = [
+            _Subscriber(
+                list_ids[index % len(list_ids)],
+                args.slow_delay if slow_every and index % slow_every == 0 else 0.0,
+            )
+            for index in range(args.clients)
+        ]
+        tasks = []
+        connect_started = time.perf_counter()
+        for start in range(0, len(subscribers), CONNECT_BATCH):
+            batch = subscribers[start : start + CONNECT_BATCH]
+            events = [asyncio.Event() for _ in batch]
+            for subscriber, opened in zip(batch, events):
+                url = f"ws://127.0.0.1:{port}/api/ws/lists/{subscriber.list_id}?token={token}"
+                tasks.append(asyncio.create_task(subscriber.run(url, sent_at, opened)))
+            await asyncio.wait_for(asyncio.gather(*(event.wait() for event in events)), 60)
+        connect_seconds = time.perf_counter() - connect_started
+        await asyncio.sleep(1.0)
+        rss_after = _rss_bytes(pid)
+
+        cpu_before = _cpu_seconds(pid)
+        write_started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _write_list(client, headers, list_id, args.mutations, sent_at, gate)
+                for list_id in list_ids
+            )
+        )
+        write_seconds = time.perf_counter() - write_started
+
+        fast = [subscriber for subscriber in subscribers if not subscriber.slow_delay]
+        deadline = time.perf_counter() + args.drain_timeout
+        while time.perf_counter() < deadline and any(
+            subscriber.received < args.mutations and not subscriber.closed for subscriber in fast
+        ):
+            await asyncio.sleep(0.05)
+        cpu_after = _cpu_seconds(pid)
+        # Counted before cancelling, which closes every socket.
+        disconnected = sum(subscriber.closed for subscriber in subscribers if subscriber.slow_delay)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    slow = [subscriber for subscriber in subscribers if subscriber.slow_delay]
+    broadcasts = args.lists * args.mutations
+    deliveries = sum(subscriber.received for subscriber in subscribers)
+    fanout_cpu = None
+    if cpu_before is not None and cpu_after is not None and write_cpu is not None:
+        fanout_cpu = max(0.0, (cpu_after - cpu_before) - write_cpu * broadcasts)
+    return {
+        "connect_seconds": round(connect_seconds, 2),
+        "write_seconds": round(write_seconds, 2),
+        "broadcasts": broadcasts,
+        "deliveries": deliveries,
+        "fast": {
+            "clients": len(fast),
+            "missing": sum(args.mutations - subscriber.received for subscriber in fast),
+            **_percentiles([latency for subscriber in fast for latency in subscriber.latencies]),
+        },
+        "slow": {
+            "clients": len(slow),
+            "disconnected": disconnected,
+            "received": sum(subscriber.received for subscriber in slow),
+            **_percentiles([latency for subscriber in slow for latency in subscriber.latencies]),
+        },
+        "rss_bytes_per_connection": (
+            round((rss_after - rss_before) / args.clients)
+            if rss_before is not None and rss_after is not None
+            else None
+        ),
+        "server_cpu_ms_per_write": round(write_cpu * 1000, 3) if write_cpu is not None else None,
+        "server_fanout_cpu_ms_per_broadcast": (
+            round(fanout_cpu * 1000 / broadcasts, 3) if fanout_cpu is not None else None
+        ),
+        "server_fanout_cpu_us_per_delivery": (
+            round(fanout_cpu * 1e6 / deliveries, 2) if fanout_cpu is not None and deliveries else None
+        ),
+    }
+
+
+class _NullWebSocket:
+    async def send_text(self, _payload: str) -> None:
+        return None
+
+    async def accept(self) -> None:
+        return None
+
+
+async def _broadcast_micro(subscriber_counts: list[int], rounds: int) -> list[dict[str, Any]]:
+    results = []
+    for count in subscriber_counts:
+        notifier = TaskNotifier(max_connections=count, max_connections_per_user=count)
+        for _ in range(count):
+            await notifier.connect(1, _NullWebSocket())  # type: ignore[arg-type]
+        started = time.process_time()
+        for _ in range(rounds):
+            await notifier.broadcast(1, {"type": "tasks_changed", "list_id": 1})
+        elapsed = time.process_time() - started
+        results.append(
+            {
+                "subscribers": count,
+                "us_per_broadcast": round(elapsed * 1e6 / rounds, 1),
+                "us_per_delivery": round(elapsed * 1e6 / (rounds * count), 3),
+            }
+        )
+    return results
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        process = _start(port, Path(tmp) / "fanout.db", args.clients)
+        try:
+            result = asyncio.run(_drive(args, port, process.pid))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    result["broadcast_micro"] = asyncio.run(_broadcast_micro([1, 10, 100, 1000, args.clients], 200))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--lists", type=int, default=50)
+    parser.add_argument("--mutations", type=int, default=10, help="task writes per list")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent writes")
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    parser.add_argument(
+        "--slow-delay", type=float, default=0.5, help="seconds a slow reader sleeps per message"
+    )
+    parser.add_argument("--calibration-writes", type=int, default=50)
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "fanout",
+                "clients": args.clients,
+                "lists": args.lists,
+                "mutations": args.mutations,
+                **run(args),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
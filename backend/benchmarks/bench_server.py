@@ -0,0 +1,154 @@
+"""Compare request throughput of the dev server against the production launcher.
+
+Starts ``uvicorn app.main:app --reload`` and ``python -m app.serve`` in turn against a
+fresh database, waits for ``/api/health/ready``, then has each client read its own
+user's task list as fast as it can.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_server --clients 16 --seconds 10 --workers 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(mode: str, port: int, workers: int, database: Path) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "SERVER_PORT": str(port),
+        "SERVER_WORKERS": str(workers),
+        # Measure the server, not the shedding policy.
+        "ADMISSION_CONTROL_ENABLED": "false",
+    }
+    if mode == "dev":
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--reload", "--port", str(port)]
+    else:
+        command = [sys.executable, "-m", "app.serve"]
+    return subprocess.Popen(
+        command,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/health/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("server did not become ready")
+
+
+async def _prepare(client: httpx.AsyncClient, index: int, tasks: int) -> tuple[dict, int]:
+    response = await client.post(
+        "/api/register",
+        json={"email": f"bench{index}@example.com", "password": "bench-password"},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    list_id = (await client.post("/api/lists", json={"name": "Bench"}, headers=headers)).json()["id"]
+    for number in range(tasks):
+        await client.post(
+            f"/api/lists/{list_id}/tasks",
+            json={"title": f"Task {number}", "status": "pending", "priority": "medium"},
+            headers=headers,
+        )
+    return headers, list_id
+
+
+async def _drive(base_url: str, clients: int, seconds: float, tasks: int) -> dict[str, float]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        await wait_ready(client)
+        prepared = await asyncio.gather(*(_prepare(client, index, tasks) for index in range(clients)))
+
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def _client(headers: dict, list_id: int) -> None:
+        nonlocal errors
+        # One keep-alive connection per simulated client.
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as session:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await session.get(f"/api/lists/{list_id}/tasks", headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(headers, list_id) for headers, list_id in prepared))
+    elapsed = time.perf_counter() - started
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+def run(mode: str, clients: int, seconds: float, tasks: int, workers: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        port = free_port()
+        process = _start(mode, port, workers, Path(tmp) / "bench.db")
+        try:
+            return asyncio.run(_drive(f"http://127.0.0.1:{port}", clients, seconds, tasks))
+        finally:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--tasks", type=int, default=50, help="tasks per client's list")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    results = {
+        mode: run(mode, args.clients, args.seconds, args.tasks, args.workers)
+        for mode in ("dev", "prod")
+    }
+    print(
+        json.dumps(
+            {
+                "benchmark": "server",
+                "clients": args.clients,
+                "workers": args.workers,
+                **results,
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Measure concurrent task write throughput as the number of shard databases grows.
+
+Each writer process owns one user and creates tasks in that user's list, committing every
+task, so writers on the same SQLite file queue behind its single write lock.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_shards --writers 8 --tasks 200 --shards 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.config import Settings
+from app.db import models
+from app.db.base import Base
+from app.db.session import (
+    RoutingSessionFactory,
+    create_engine_from_settings,
+    create_session_factory,
+    create_shard_engines_from_settings,
+)
+from app.db.shards import ShardRouter
+from app.services.task import TaskService
+
+
+def _writer(settings: Settings, owner_id: int, list_id: int, tasks: int, barrier, results) -> None:
+    directory = create_engine_from_settings(settings)
+    router = ShardRouter(directory, create_shard_engines_from_settings(settings))
+    factory = RoutingSessionFactory(create_session_factory(directory), shards=router)
+    with factory() as session:
+        owner = session.get(models.User, owner_id)
+    barrier.wait()
+    started = time.time()
+    for index in range(tasks):
+        with factory() as session:
+            factory.bind_owner(session, owner)
+            TaskService(session).create_task(
+                list_id=list_id,
+                owner_id=owner_id,
+                title=f"Task {index}",
+                description=None,
+                due_date=None,
+                status="pending",
+                priority="medium",
+                tags=["bench"],
+            )
+    results.put((started, time.time()))
+
+
+def run(shard_count: int, writers: int, tasks: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(
+            database_url=f"sqlite:///{Path(tmp) / 'directory.db'}",
+            shard_database_urls=tuple(
+                f"sqlite:///{Path(tmp) / f'shard{index}.db'}" for index in range(shard_count)
+            ),
+        )
+        directory = create_engine_from_settings(settings)
+        Base.metadata.create_all(bind=directory)
+        router = ShardRouter(directory, create_shard_engines_from_settings(settings))
+        router.create_all()
+        factory = RoutingSessionFactory(create_session_factory(directory), shards=router)
+
+        owners: list[tuple[int, int]] = []
+        for index in range(writers):
+            with factory() as session:
+                user = models.User(email=f"bench{index}@example.com", hashed_password="x")
+                session.add(user)
+                session.flush()
+                user.shard = router.assign(user.id)
+                session.commit()
+                factory.bind_owner(session, user)
+                list_id = TaskService(session).create_list(owner_id=user.id, name="Bench").id
+                owners.append((user.id, list_id))
+
+        context = multiprocessing.get_context("spawn")
+        barrier = context.Barrier(writers)
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_writer, args=(settings, owner_id, list_id, tasks, barrier, results)
+            )
+            for owner_id, list_id in owners
+        ]
+        for process in processes:
+            process.start()
+        spans = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        elapsed = max(end for _, end in spans) - min(start for start, _ in spans)
+        for engine in (directory, *router.engines):
+            engine.dispose()
+        return {"shards": shard_count, "writes_per_s": writers * tasks / elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+    for shard_count in args.shards:
+        result = run(shard_count, args.writers, args.tasks)
+        print(json.dumps({"benchmark": "shards", "writers": args.writers, "tasks": args.tasks, **result}))
+
+
+if __name__ == "__main__":
+    main()
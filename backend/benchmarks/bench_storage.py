@@ -0,0 +1,223 @@
+"""Compare task storage with status and priority as strings against small integer codes.
+
+Builds one database in the pre-migration layout (``VARCHAR`` status and priority), copies
+it, runs the schema migrations on the copy and VACUUMs both. Reports file size, the bytes
+the ``tasks`` table and its indexes occupy (from ``dbstat``) and how much of them fits in
+SQLite's page cache. The sqlite3 module exposes no page cache hit counters, so coverage is
+the stand-in: a filter over a table that fits in the cache never misses after one pass.
+Filters are timed on a warm cache, through the ORM so the codes are bound as the app does.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_storage --tasks 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Engine, create_engine, func, insert, select, text
+
+from app.db import models
+from app.db.base import Base
+from app.db.migrations import MIGRATIONS, migrate, schema_migrations
+
+BATCH = 10_000
+STATUSES = [status.value for status in models.TaskStatusEnum]
+PRIORITIES = [priority.value for priority in models.TaskPriorityEnum]
+
+
+def _build_legacy(path: Path, task_count: int, list_count: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        ddl = connection.scalar(text("SELECT sql FROM sqlite_master WHERE name = 'tasks'"))
+        indexes = connection.scalars(
+            text("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'")
+        ).all()
+        connection.execute(text("DROP TABLE tasks"))
+        connection.execute(
+            text(
+                ddl.replace("status SMALLINT", "status VARCHAR(50)").replace(
+                    "priority SMALLINT", "priority VARCHAR(50)"
+                )
+            )
+        )
+        for index in indexes:
+            connection.execute(text(index))
+        # Stamped up to the last migration before the codes, so only that one runs.
+        schema_migrations.create(connection)
+        connection.execute(
+            insert(schema_migrations),
+            [{"version": version, "name": name} for version, name, _ in MIGRATIONS[:-1]],
+        )
+        connection.execute(
+            insert(models.User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}]
+        )
+        connection.execute(
+            insert(models.TaskList),
+            [{"id": index + 1, "name": f"List {index}", "owner_id": 1} for index in range(list_count)],
+        )
+        rng = random.Random(0)
+        rows = []
+        for number in range(task_count):
+            rows.append(
+                {
+                    "title": f"Task {number}",
+                    "status": rng.choice(STATUSES),
+                    "priority": rng.choice(PRIORITIES),
+                    "tags": "[]",
+                    "list_id": number % list_count + 1,
+                    "position": number // list_count,
+                }
+            )
+            if len(rows) == BATCH:
+                _insert_raw(connection, rows)
+                rows = []
+        if rows:
+            _insert_raw(connection, rows)
+    engine.dispose()
+
+
+def _insert_raw(connection, rows: list[dict[str, Any]]) -> None:
+    # Raw SQL, because the mapped columns would now encode status and priority.
+    connection.execute(
+        text(
+            "INSERT INTO tasks (title, status, priority, tags, list_id, position) "
+            "VALUES (:title, :status, :priority, :tags, :list_id, :position)"
+        ),
+        rows,
+    )
+
+
+def _storage(engine: Engine, path: Path, task_count: int) -> dict[str, Any]:
+    with engine.connect() as connection:
+        page_size = connection.scalar(text("PRAGMA page_size"))
+        cache_size = connection.scalar(text("PRAGMA cache_size"))
+        table_bytes = connection.scalar(
+            text("SELECT sum(pgsize) FROM dbstat WHERE name = 'tasks'")
+        )
+        index_bytes = connection.scalar(
+            text(
+                "SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name IN "
+                "(SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks')"
+            )
+        )
+    # A negative cache_size is in KiB, a positive one in pages.
+    cache_bytes = -cache_size * 1024 if cache_size < 0 else cache_size * page_size
+    return {
+        "file_mb": round(path.stat().st_size / 1_000_000, 2),
+        "tasks_table_mb": round(table_bytes / 1_000_000, 2),
+        "tasks_index_mb": round(index_bytes / 1_000_000, 2),
+        "bytes_per_task": round((table_bytes + index_bytes) / task_count, 1),
+        "page_cache_mb": round(cache_bytes / 1_000_000, 2),
+        "page_cache_coverage": round(min(1.0, cache_bytes / (table_bytes + index_bytes)), 4),
+    }
+
+
+def _timed(engine: Engine, statement, rounds: int) -> float:
+    samples = []
+    with engine.connect() as connection:
+        connection.execute(statement).all()
+        for _ in range(rounds):
+            started = time.perf_counter()
+            connection.execute(statement).all()
+            samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1000, 2)
+
+
+def _filters(engine: Engine, rounds: int) -> dict[str, float]:
+    task = models.Task
+    return {
+        "count_by_status_ms": _timed(
+            engine,
+            select(task.status, func.count()).group_by(task.status),
+            rounds,
+        ),
+        "count_completed_ms": _timed(
+            engine, select(func.count()).where(task.status == "completed"), rounds
+        ),
+        "count_open_high_ms": _timed(
+            engine,
+            select(func.count()).where(task.status != "completed", task.priority == "high"),
+            rounds,
+        ),
+        "list_open_tasks_ms": _timed(
+            engine,
+            select(task.id, task.title, task.status, task.priority)
+            .where(task.list_id == 1, task.status != "completed")
+            .order_by(task.position),
+            rounds,
+        ),
+    }
+
+
+def _legacy_filters(engine: Engine, rounds: int) -> dict[str, float]:
+    return {
+        "count_by_status_ms": _timed(
+            engine, text("SELECT status, count(*) FROM tasks GROUP BY status"), rounds
+        ),
+        "count_completed_ms": _timed(
+            engine, text("SELECT count(*) FROM tasks WHERE status = 'completed'"), rounds
+        ),
+        "count_open_high_ms": _timed(
+            engine,
+            text("SELECT count(*) FROM tasks WHERE status != 'completed' AND priority = 'high'"),
+            rounds,
+        ),
+        "list_open_tasks_ms": _timed(
+            engine,
+            text(
+                "SELECT id, title, status, priority FROM tasks "
+                "WHERE list_id = 1 AND status != 'completed' ORDER BY position"
+            ),
+            rounds,
+        ),
+    }
+
+
+def run(task_count: int, list_count: int, rounds: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "strings.db"
+        coded_path = Path(tmp) / "codes.db"
+        _build_legacy(legacy_path, task_count, list_count)
+        shutil.copyfile(legacy_path, coded_path)
+
+        coded = create_engine(f"sqlite:///{coded_path}")
+        started = time.perf_counter()
+        migrate(coded, Base.metadata)
+        results: dict[str, Any] = {"migrate_seconds": round(time.perf_counter() - started, 2)}
+
+        legacy = create_engine(f"sqlite:///{legacy_path}")
+        # The mapped columns would encode the filters for the legacy layout too, so it is
+        # queried with the string literals its columns hold.
+        for name, engine, path, filters in (
+            ("strings", legacy, legacy_path, _legacy_filters),
+            ("codes", coded, coded_path, _filters),
+        ):
+            with engine.connect() as connection:
+                connection.exec_driver_sql("VACUUM")
+            results[name] = {**_storage(engine, path, task_count), **filters(engine, rounds)}
+            engine.dispose()
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--lists", type=int, default=1_000)
+    parser.add_argument("--rounds", type=int, default=5, help="timed runs per filter")
+    args = parser.parse_args()
+    results = run(args.tasks, args.lists, args.rounds)
+    print(json.dumps({"benchmark": "storage", "tasks": args.tasks, "lists": args.lists, **results}))
+
+
+if __name__ == "__main__":
+    main()
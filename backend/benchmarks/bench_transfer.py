@@ -0,0 +1,93 @@
+"""Measure bulk import and streamed export throughput.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_transfer --tasks 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from app.core.config import Settings
+from app.db import models
+from app.db.base import Base
+from app.db.session import create_engine_from_settings, create_session_factory
+from app.services.transfer import TransferService
+
+
+def _ndjson_lines(task_count: int, list_count: int) -> Iterator[str]:
+    per_list = max(task_count // list_count, 1)
+    for list_index in range(list_count):
+        yield json.dumps({"type": "list", "id": list_index, "name": f"List {list_index}"})
+        for task_index in range(per_list):
+            yield json.dumps(
+                {
+                    "type": "task",
+                    "list_id": list_index,
+                    "title": f"Task {task_index}",
+                    "status": "pending",
+                    "priority": "medium",
+                    "tags": ["bench"],
+                }
+            )
+
+
+def _max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(task_count: int, list_count: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(database_url=f"sqlite:///{Path(tmp) / 'bench.db'}")
+        engine = create_engine_from_settings(settings)
+        Base.metadata.create_all(bind=engine)
+        factory = create_session_factory(engine)
+
+        with factory() as session:
+            user = models.User(email="bench@example.com", hashed_password="x")
+            session.add(user)
+            session.commit()
+            owner_id = user.id
+
+        results: dict[str, float] = {}
+        started = time.perf_counter()
+        with factory() as session:
+            summary = TransferService(session).import_ndjson(
+                owner_id=owner_id, lines=_ndjson_lines(task_count, list_count)
+            )
+        elapsed = time.perf_counter() - started
+        results["imported_tasks"] = summary["tasks"]
+        results["import_seconds"] = elapsed
+        results["import_per_s"] = summary["tasks"] / elapsed
+        results["rss_after_import_mb"] = _max_rss_mb()
+
+        started = time.perf_counter()
+        exported_bytes = 0
+        with factory() as session:
+            for chunk in TransferService(session).export_ndjson(owner_id=owner_id):
+                exported_bytes += len(chunk)
+        elapsed = time.perf_counter() - started
+        results["export_seconds"] = elapsed
+        results["export_mb"] = exported_bytes / 1_000_000
+        results["rss_after_export_mb"] = _max_rss_mb()
+
+        engine.dispose()
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--lists", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "transfer", **run(args.tasks, args.lists)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure task write throughput against a file-backed SQLite database.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_writes --tasks 500
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.config import Settings
+from app.db import models  # noqa: F401
+from app.db.base import Base
+from app.db.session import create_engine_from_settings, create_session_factory
+from app.services.task import TaskService
+
+
+def run(task_count: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(database_url=f"sqlite:///{Path(tmp) / 'bench.db'}")
+        engine = create_engine_from_settings(settings)
+        Base.metadata.create_all(bind=engine)
+        factory = create_session_factory(engine)
+
+        with factory() as session:
+            user = models.User(email="bench@example.com", hashed_password="x")
+            session.add(user)
+            session.commit()
+            owner_id = user.id
+            list_id = TaskService(session).create_list(owner_id=owner_id, name="Bench").id
+
+        results: dict[str, float] = {}
+
+        started = time.perf_counter()
+        task_ids: list[int] = []
+        for index in range(task_count):
+            with factory() as session:
+                task = TaskService(session).create_task(
+                    list_id=list_id,
+                    owner_id=owner_id,
+                    title=f"Task {index}",
+                    description=None,
+                    due_date=None,
+                    status="pending",
+                    priority="medium",
+                    tags=["bench"],
+                )
+                task_ids.append(task.id)
+        results["create_per_s"] = task_count / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for task_id in task_ids:
+            with factory() as session:
+                TaskService(session).update_task(
+                    task_id=task_id,
+                    owner_id=owner_id,
+                    title=None,
+                    description=None,
+                    due_date=None,
+                    status="completed",
+                    priority=None,
+                    tags=None,
+                )
+        results["update_per_s"] = task_count / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for task_id in task_ids:
+            with factory() as session:
+                TaskService(session).delete_task(task_id=task_id, owner_id=owner_id)
+        results["delete_per_s"] = task_count / (time.perf_counter() - started)
+
+        engine.dispose()
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+    print(json.dumps({"benchmark": "writes", "tasks": args.tasks, **run(args.tasks)}))
+
+
+if __name__ == "__main__":
+    main()
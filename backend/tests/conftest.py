@@ -1,15 +1,62 @@
-from collections.abc import Generator
+import os
+from collections.abc import Callable, Generator
+from contextvars import ContextVar
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_read_db
 from app.core.config import Settings
 from app.db.base import Base
+from app.db.query_log import SlowQueryLog
+from app.db.session import enable_sqlite_foreign_keys
 from app.main import create_app
 
+_current_request: ContextVar[str | None] = ContextVar("current_request", default=None)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--forbid-full-scans",
+        default=os.getenv("FORBID_FULL_SCANS", ""),
+        help="comma-separated tables that no endpoint may fully scan, e.g. 'tasks'",
+    )
+
+
+class _RequestScope:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in {"http", "websocket"}:
+            await self.app(scope, receive, send)
+            return
+        token = _current_request.set(f"{scope.get('method', 'WEBSOCKET')} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+
+
+def _watch_full_scans(engines, tables: frozenset[str], violations: list[str]):
+    # Only statements issued while serving a request count; test setup may scan freely.
+    plans = SlowQueryLog(threshold_seconds=float("inf"))
+
+    def _check(conn, _cursor, statement, parameters, _context, executemany) -> None:
+        request = _current_request.get()
+        if request is None:
+            return
+        plan = plans.explain(conn, statement, parameters, executemany)
+        if plan is not None and plan.full_scans & tables:
+            violations.append(f"{request}: {' '.join(statement.split())} -> {plan.details}")
+
+    for engine in engines:
+        event.listen(engine, "after_cursor_execute", _check)
+    return lambda: [event.remove(engine, "after_cursor_execute", _check) for engine in engines]
+
 
 @pytest.fixture()
 def settings(tmp_path_factory: pytest.TempPathFactory) -> Settings:
@@ -27,6 +74,7 @@ def engine(settings: Settings):
     engine = create_engine(
         settings.database_url, connect_args={"check_same_thread": False}
     )
+    enable_sqlite_foreign_keys(engine)
     Base.metadata.create_all(bind=engine)
     try:
         yield engine
@@ -41,8 +89,16 @@ def session_factory(engine) -> sessionmaker:
 
 
 @pytest.fixture()
-def client(settings: Settings, session_factory: sessionmaker) -> Generator[TestClient, None, None]:
+def client(
+    request: pytest.FixtureRequest, settings: Settings, engine, session_factory: sessionmaker
+) -> Generator[TestClient, None, None]:
     app = create_app(settings=settings)
+    option = request.config.getoption("--forbid-full-scans")
+    forbidden = frozenset(table.strip() for table in option.split(",") if table.strip())
+    violations: list[str] = []
+    if forbidden:
+        app.add_middleware(_RequestScope)
+        stop_watching = _watch_full_scans([engine, app.state.engine], forbidden, violations)
 
     def _get_test_db() -> Generator[Session, None, None]:
         session = session_factory()
@@ -52,7 +108,28 @@ def client(settings: Settings, session_factory: sessionmaker) -> Generator[TestC
             session.close()
 
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_read_db] = _get_test_db
 
     with TestClient(app) as test_client:
         yield test_client
 
+    if forbidden:
+        stop_watching()
+        if violations:
+            pytest.fail("Full table scans while serving requests:\n" + "\n".join(violations))
+
+
+@pytest.fixture()
+def auth_headers(request: pytest.FixtureRequest) -> Callable[..., dict[str, str]]:
+    """Register ``email`` and return its bearer headers; defaults to the ``client`` fixture."""
+
+    def _auth_headers(email: str, client: TestClient | None = None) -> dict[str, str]:
+        if client is None:
+            client = request.getfixturevalue("client")
+        response = client.post(
+            "/api/register", json={"email": email, "password": "secret-password"}
+        )
+        assert response.status_code == 201
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return _auth_headers
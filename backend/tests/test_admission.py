@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+from starlette.responses import PlainTextResponse
+
+from app.api.middleware.admission import AdmissionControlMiddleware
+from app.core.security import create_access_token
+
+
+def _blocking_app(release: asyncio.Event):
+    async def app(scope, receive, send):
+        await release.wait()
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    return app
+
+
+def _client(release: asyncio.Event, **overrides) -> httpx.AsyncClient:
+    options = {
+        "max_concurrency": 1,
+        "max_concurrency_per_user": 1,
+        "class_limits": {"auth": 1, "read": 1, "write": 1},
+        "max_queue": 4,
+        "queue_timeout_seconds": 0.05,
+        "retry_after_seconds": 3,
+        "secret_key": "k",
+    }
+    options.update(overrides)
+    middleware = AdmissionControlMiddleware(_blocking_app(release), **options)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+async def test_request_past_queue_deadline_gets_fast_503():
+    release = asyncio.Event()
+    async with _client(release) as client:
+        first = asyncio.create_task(client.get("/api/lists"))
+        await asyncio.sleep(0.01)
+
+        shed = await client.get("/api/lists")
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "3"
+
+        release.set()
+        assert (await first).status_code == 200
+
+
+async def test_queued_request_is_admitted_when_a_slot_frees_up():
+    release = asyncio.Event()
+    async with _client(release, queue_timeout_seconds=1.0) as client:
+        first = asyncio.create_task(client.get("/api/lists"))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(client.get("/api/lists"))
+        await asyncio.sleep(0.01)
+
+        release.set()
+        assert (await first).status_code == 200
+        assert (await queued).status_code == 200
+
+
+async def test_full_queue_rejects_immediately_and_users_are_isolated():
+    release = asyncio.Event()
+    token = create_access_token(subject="7", secret_key="k", expires_minutes=5)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with _client(
+        release,
+        max_concurrency=4,
+        class_limits={"read": 4},
+        max_queue=0,
+        queue_timeout_seconds=5.0,
+    ) as client:
+        busy_user = asyncio.create_task(client.get("/api/lists", headers=headers))
+        await asyncio.sleep(0.01)
+
+        same_user = await asyncio.wait_for(client.get("/api/lists", headers=headers), timeout=1.0)
+        assert same_user.status_code == 503
+
+        other = asyncio.create_task(client.get("/api/lists"))
+        await asyncio.sleep(0.01)
+        release.set()
+        assert (await other).status_code == 200
+        assert (await busy_user).status_code == 200
+
+
+async def test_forged_tokens_do_not_count_against_the_user_they_name():
+    release = asyncio.Event()
+    token = create_access_token(subject="7", secret_key="k", expires_minutes=5)
+    forged = create_access_token(subject="7", secret_key="guess", expires_minutes=5)
+    async with _client(
+        release,
+        max_concurrency=4,
+        class_limits={"read": 4},
+        max_queue=0,
+        queue_timeout_seconds=5.0,
+    ) as client:
+        attackers = [
+            asyncio.create_task(client.get("/api/lists", headers={"Authorization": f"Bearer {forged}"}))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+
+        victim = asyncio.create_task(
+            client.get("/api/lists", headers={"Authorization": f"Bearer {token}"})
+        )
+        await asyncio.sleep(0.01)
+        release.set()
+        assert (await victim).status_code == 200
+        assert [(await attacker).status_code for attacker in attackers] == [200, 200]
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.services.archive import ArchiveJob, ArchiveService
+from app.services.notifier import TaskNotifier
+
+
+def _seed(client: TestClient, headers: dict[str, str], titles: list[str]) -> tuple[int, list[int]]:
+    list_id = client.post("/api/lists", json={"name": "Inbox"}, headers=headers).json()["id"]
+    url = f"/api/lists/{list_id}/tasks"
+    ids = [client.post(url, json={"title": title}, headers=headers).json()["id"] for title in titles]
+    return list_id, ids
+
+
+def _complete(session_factory: sessionmaker, task_ids: list[int], age: timedelta) -> None:
+    with session_factory() as session:
+        session.execute(
+            update(models.Task)
+            .where(models.Task.id.in_(task_ids))
+            .values(status="completed", updated_at=datetime.utcnow() - age)
+        )
+        session.commit()
+
+
+def test_old_completed_tasks_leave_the_hot_table(
+    client: TestClient, session_factory: sessionmaker, auth_headers
+):
+    headers = auth_headers("archivist@example.com")
+    list_id, ids = _seed(client, headers, ["Old", "Open", "Recent", "Older"])
+    _complete(session_factory, [ids[0], ids[3]], timedelta(days=45))
+    _complete(session_factory, [ids[2]], timedelta(days=1))
+
+    with session_factory() as session:
+        service = ArchiveService(session, batch_size=1)
+        archived = service.archive_completed(older_than=timedelta(days=30))
+    assert archived == {list_id: 2}
+
+    tasks = client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()
+    assert [(task["title"], task["position"]) for task in tasks] == [("Open", 0), ("Recent", 1)]
+
+    page = client.get(f"/api/lists/{list_id}/archive?limit=1", headers=headers).json()
+    assert [task["title"] for task in page["items"]] == ["Older"]
+    assert page["items"][0]["status"] == "completed"
+    assert page["next_before_id"] == ids[3]
+    rest = client.get(
+        f"/api/lists/{list_id}/archive?limit=1&before_id={page['next_before_id']}",
+        headers=headers,
+    ).json()
+    assert [task["title"] for task in rest["items"]] == ["Old"]
+
+
+def test_archive_is_private_to_the_owner(client: TestClient, auth_headers):
+    owner = auth_headers("archivist@example.com")
+    list_id, _ = _seed(client, owner, ["Mine"])
+    intruder = auth_headers("intruder@example.com")
+
+    response = client.get(f"/api/lists/{list_id}/archive", headers=intruder)
+    assert response.status_code == 404
+
+
+async def test_archive_job_notifies_affected_lists(
+    client: TestClient, session_factory: sessionmaker, auth_headers
+):
+    headers = auth_headers("archivist@example.com")
+    list_id, ids = _seed(client, headers, ["Done"])
+    _complete(session_factory, ids, timedelta(days=90))
+    notifier: TaskNotifier = client.app.state.task_notifier
+    job = ArchiveJob({None: session_factory}, older_than=timedelta(days=30), notifier=notifier)
+    queue, _ = await notifier.open_stream(list_id)
+
+    assert await job.run_once() == {list_id: 1}
+    assert job.archived_total == 1
+    _, message = queue.get_nowait()
+    assert message == {"type": "tasks_changed", "list_id": list_id}
+
+
+def test_one_worker_claims_each_sweep(client: TestClient, session_factory: sessionmaker):
+    assert client.app.state.archive_job is None
+    workers = [
+        ArchiveJob({None: session_factory}, older_than=timedelta(days=30), interval_seconds=3600)
+        for _ in range(2)
+    ]
+    now = datetime(2026, 10, 19, 12, 0)
+
+    assert workers[0].claim_sweep(now)
+    assert not workers[1].claim_sweep(now)
+    assert not workers[0].claim_sweep(now + timedelta(minutes=30))
+    assert workers[1].claim_sweep(now + timedelta(hours=1))
+    with session_factory() as session:
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE status = 2 AND updated_at < '2026-01-01'"
+        ).all()
+    assert "ix_tasks_status_updated_at" in plan[0][-1]
@@ -0,0 +1,106 @@
+import asyncio
+import sqlite3
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.db.backup import backup_sqlite, list_backups, restore_sqlite
+from app.main import create_app
+from app.services.backup import BackupJob
+
+
+def _database(path: Path, journal_mode: str, rows: int) -> None:
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA journal_mode = {journal_mode}")
+    connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)")
+    connection.executemany("INSERT INTO items (payload) VALUES (?)", [("x" * 500,)] * rows)
+    connection.commit()
+    connection.close()
+
+
+def _count(path: Path) -> int:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT count(*) FROM items").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_wal_backup_is_a_snapshot_that_never_blocks_writers_and_restores(tmp_path: Path):
+    live = tmp_path / "live.db"
+    _database(live, "wal", 200)
+    # Fails instead of waiting if the backup ever held the write lock.
+    writer = sqlite3.connect(live, timeout=0)
+    progress: list[tuple[int, int]] = []
+
+    def _write_during_copy(copied: int, total: int) -> None:
+        progress.append((copied, total))
+        writer.execute("INSERT INTO items (payload) VALUES ('during')")
+        writer.commit()
+
+    result = backup_sqlite(live, tmp_path / "copy.db", step_pages=4, progress=_write_during_copy)
+    writer.close()
+
+    assert result["snapshot"] is True
+    assert result["restarts"] == 0
+    assert len(progress) > 1 and progress[-1][0] == progress[-1][1] == result["pages"]
+    assert _count(tmp_path / "copy.db") == 200
+    assert _count(live) == 200 + len(progress)
+    assert not (tmp_path / "copy.db.partial").exists()
+
+    restore_sqlite(tmp_path / "copy.db", live)
+    assert _count(live) == 200
+
+
+def test_rollback_journal_backup_restarts_on_writes_and_the_job_keeps_recent_backups(
+    tmp_path: Path,
+):
+    live = tmp_path / "live.db"
+    _database(live, "delete", 200)
+    writes = []
+
+    def _write_once(copied: int, total: int) -> None:
+        if not writes:
+            writer = sqlite3.connect(live, timeout=0)
+            writer.execute("INSERT INTO items (payload) VALUES ('during')")
+            writer.commit()
+            writer.close()
+            writes.append(copied)
+
+    result = backup_sqlite(live, tmp_path / "copy.db", step_pages=4, progress=_write_once)
+    assert result["snapshot"] is False
+    assert result["restarts"] >= 1
+    assert _count(tmp_path / "copy.db") == 201
+
+    directory = tmp_path / "backups"
+    directory.mkdir()
+    stale = directory / "live-20000101T000000.db"
+    stale.write_bytes(b"")
+    job = BackupJob([live], directory=directory, interval_seconds=0, max_backups=1)
+    results = asyncio.run(job.run_once())
+
+    assert not stale.exists()
+    assert [Path(item["path"]) for item in results] == list_backups(directory, live)
+    assert job.stats()["backups_total"] == 1
+    assert job.stats()["in_progress"] is None
+
+
+def test_backup_paths_stay_behind_the_debug_token(settings: Settings, tmp_path: Path):
+    backed_up = replace(
+        settings,
+        backup_enabled=True,
+        backup_token="debug-secret",
+        backup_interval_seconds=0,
+        backup_directory=str(tmp_path / "backups"),
+    )
+    with TestClient(create_app(settings=backed_up)) as client:
+        asyncio.run(client.app.state.backup_job.run_once())
+
+        public = client.get("/api/metrics").json()["backup"]
+        assert public["backups_total"] == 1
+        assert str(tmp_path) not in str(public)
+        assert client.get("/api/debug/backups").status_code == 403
+        details = client.get("/api/debug/backups", headers={"X-Debug-Token": "debug-secret"}).json()
+        assert Path(details["last"][0]["path"]).parent == tmp_path / "backups"
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+
+def test_bootstrap_returns_profile_lists_and_first_page_in_three_queries(
+    client: TestClient, engine, auth_headers
+):
+    headers = auth_headers("boot@example.com")
+    empty = client.get("/api/bootstrap", headers=headers).json()
+    assert empty["user"]["email"] == "boot@example.com"
+    assert empty == {**empty, "lists": [], "selected_list_id": None, "tasks": [], "has_more_tasks": False}
+
+    work = client.post("/api/lists", json={"name": "Work"}, headers=headers).json()["id"]
+    home = client.post("/api/lists", json={"name": "Home"}, headers=headers).json()["id"]
+    for title, status in (("a", "pending"), ("b", "completed"), ("c", "in_progress")):
+        client.post(f"/api/lists/{work}/tasks", json={"title": title, "status": status}, headers=headers)
+    client.post(f"/api/lists/{home}/tasks", json={"title": "dishes"}, headers=headers)
+    with engine.begin() as connection:
+        connection.execute(
+            text("UPDATE tasks SET updated_at = '2099-01-01 00:00:00' WHERE list_id = :id"), {"id": home}
+        )
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    body = client.get("/api/bootstrap", params={"list_id": work, "limit": 2}, headers=headers).json()
+    assert len(statements) == 3
+
+    assert [summary["name"] for summary in body["lists"]] == ["Work", "Home"]
+    assert body["lists"][0]["total"] == 3
+    assert body["lists"][0]["by_status"] == {"pending": 1, "in_progress": 1, "completed": 1}
+    assert body["selected_list_id"] == work
+    assert [task["title"] for task in body["tasks"]] == ["a", "b"]
+    assert body["has_more_tasks"] is True
+
+    # Without a usable list id the most recently active list is chosen.
+    for params in ({}, {"list_id": 999_999}):
+        body = client.get("/api/bootstrap", params=params, headers=headers).json()
+        assert body["selected_list_id"] == home
+        assert [task["title"] for task in body["tasks"]] == ["dishes"]
+        assert body["has_more_tasks"] is False
+
+
+def test_bootstrap_requires_authentication(client: TestClient):
+    assert client.get("/api/bootstrap").status_code == 401
@@ -0,0 +1,92 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.services.read_model import TaskReadModel
+
+
+def _seed(client: TestClient, headers: dict[str, str], tasks: list[dict]) -> int:
+    list_id = client.post("/api/lists", json={"name": "Chores"}, headers=headers).json()["id"]
+    for task in tasks:
+        response = client.post(f"/api/lists/{list_id}/tasks", json=task, headers=headers)
+        assert response.status_code == 201
+    return list_id
+
+
+def test_delete_list_cascades_in_one_statement(
+    client: TestClient, engine, session_factory: sessionmaker, auth_headers
+):
+    headers = auth_headers("bulk@example.com")
+    list_id = _seed(client, headers, [{"title": "Dishes"}, {"title": "Laundry"}])
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement.split()[0].upper())
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        response = client.delete(f"/api/lists/{list_id}", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert response.status_code == 204
+    assert statements.count("DELETE") == 1
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(models.Task)) == 0
+    assert client.get("/api/lists", headers=headers).json() == []
+
+
+def test_delete_list_requires_ownership(client: TestClient, auth_headers):
+    owner = auth_headers("bulk@example.com")
+    list_id = _seed(client, owner, [])
+    other = auth_headers("other@example.com")
+
+    assert client.delete(f"/api/lists/{list_id}", headers=other).status_code == 404
+    assert client.delete(f"/api/lists/{list_id}", headers=owner).status_code == 204
+    assert client.delete(f"/api/lists/{list_id}", headers=owner).status_code == 404
+
+
+def test_clear_completed_and_bulk_update(
+    client: TestClient, session_factory: sessionmaker, auth_headers
+):
+    read_model = client.app.state.read_model = TaskReadModel()
+    client.app.state.change_publisher.read_model = read_model
+    headers = auth_headers("bulk@example.com")
+    list_id = _seed(
+        client,
+        headers,
+        [
+            {"title": "Sweep", "status": "completed"},
+            {"title": "Mop", "priority": "high"},
+            {"title": "Dust", "status": "completed", "priority": "high"},
+            {"title": "Vacuum", "priority": "high"},
+        ],
+    )
+    client.get(f"/api/lists/{list_id}/tasks", headers=headers)
+
+    cleared = client.post(f"/api/lists/{list_id}/tasks/clear-completed", headers=headers)
+    assert cleared.json() == {"affected": 2}
+    updated = client.patch(
+        f"/api/lists/{list_id}/tasks",
+        json={"where": {"priority": "high"}, "status": "in_progress"},
+        headers=headers,
+    )
+    assert updated.json() == {"affected": 2}
+
+    tasks = client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()
+    assert [(task["title"], task["status"], task["position"]) for task in tasks] == [
+        ("Mop", "in_progress", 0),
+        ("Vacuum", "in_progress", 1),
+    ]
+    assert read_model.applied == 2
+    with session_factory() as session:
+        assert read_model.verify(session) == {}
+
+
+def test_bulk_update_needs_something_to_set(client: TestClient, auth_headers):
+    headers = auth_headers("bulk@example.com")
+    list_id = _seed(client, headers, [{"title": "Sweep"}])
+
+    response = client.patch(f"/api/lists/{list_id}/tasks", json={"where": {}}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _seed_list(client: TestClient, headers: dict[str, str], task_count: int) -> int:
+    list_id = client.post("/api/lists", json={"name": "Big"}, headers=headers).json()["id"]
+    for index in range(task_count):
+        client.post(
+            f"/api/lists/{list_id}/tasks",
+            json={"title": f"Task {index}", "description": "details " * 10, "tags": ["bulk"]},
+            headers=headers,
+        )
+    return list_id
+
+
+def test_large_task_list_is_gzip_compressed(client: TestClient, auth_headers):
+    headers = auth_headers("encoder@example.com")
+    list_id = _seed_list(client, headers, task_count=20)
+
+    response = client.get(
+        f"/api/lists/{list_id}/tasks",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert len(response.json()) == 20
+
+
+def test_small_responses_are_sent_uncompressed(client: TestClient, auth_headers):
+    headers = auth_headers("encoder@example.com")
+
+    response = client.get("/api/lists", headers={**headers, "Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_export_is_compressed_incrementally(client: TestClient, auth_headers):
+    headers = auth_headers("encoder@example.com")
+    _seed_list(client, headers, task_count=20)
+
+    response = client.get("/api/export", headers={**headers, "Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 21
+
+
+def test_task_list_and_websocket_support_msgpack(client: TestClient, auth_headers):
+    msgpack = pytest.importorskip("msgpack")
+    headers = auth_headers("encoder@example.com")
+    token = headers["Authorization"].removeprefix("Bearer ")
+    list_id = _seed_list(client, headers, task_count=2)
+
+    response = client.get(
+        f"/api/lists/{list_id}/tasks",
+        headers={**headers, "Accept": "application/msgpack"},
+    )
+    assert response.headers["content-type"] == "application/msgpack"
+    as_json = client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()
+    assert msgpack.unpackb(response.content) == as_json
+
+    with client.websocket_connect(f"/api/ws/lists/{list_id}?token={token}&encoding=msgpack") as ws:
+        client.post(f"/api/lists/{list_id}/tasks", json={"title": "Ping"}, headers=headers)
+        assert msgpack.unpackb(ws.receive_bytes()) == {"type": "tasks_changed", "list_id": list_id}
+
+    with client.websocket_connect(f"/api/ws/lists/{list_id}?token={token}") as ws:
+        client.post(f"/api/lists/{list_id}/tasks", json={"title": "Pong"}, headers=headers)
+        assert json.loads(ws.receive_text()) == {"type": "tasks_changed", "list_id": list_id}
@@ -0,0 +1,101 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from app.core.config import Settings
+from app.main import create_app
+from app.services.notifier import TaskNotifier
+
+
+async def _stream_until_stopped(client: httpx.AsyncClient, notifier: TaskNotifier, url: str, **kwargs):
+    request = asyncio.create_task(client.get(url, **kwargs))
+    while notifier.stats()["streams"] == 0:
+        await asyncio.sleep(0.01)
+    return request
+
+
+async def test_event_stream_delivers_events_and_resumes_from_last_event_id(tmp_path: Path):
+    app = create_app(
+        Settings(database_url=f"sqlite:///{tmp_path / 'sse.db'}", admission_control_enabled=False)
+    )
+    notifier: TaskNotifier = app.state.task_notifier
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        token = (
+            await client.post("/api/register", json={"email": "sse@example.com", "password": "pw"})
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        list_id = (await client.post("/api/lists", json={"name": "Live"}, headers=headers)).json()["id"]
+        url = f"/api/lists/{list_id}/events?token={token}"
+
+        request = await _stream_until_stopped(client, notifier, url)
+        await notifier.broadcast(list_id, {"type": "tasks_changed", "list_id": list_id})
+        await notifier.stop()
+        response = await request
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "content-encoding" not in response.headers
+        first_id = f"{notifier.epoch}-1"
+        assert f'id: {first_id}\ndata: {{"type":"tasks_changed","list_id":{list_id}}}\n\n' in response.text
+
+        for _ in range(2):
+            await notifier.broadcast(list_id, {"type": "tasks_changed", "list_id": list_id})
+        resume = {"Last-Event-ID": first_id}
+        request = await _stream_until_stopped(client, notifier, url, headers=resume)
+        await notifier.stop()
+        resumed = (await request).text
+        assert [line for line in resumed.splitlines() if line.startswith("id:")] == [
+            f"id: {notifier.epoch}-2",
+            f"id: {notifier.epoch}-3",
+        ]
+
+        notifier.max_connections_per_user = 0
+        assert (await client.get(url)).status_code == 503
+
+        foreign = await client.get(f"/api/lists/{list_id + 1}/events?token={token}")
+        assert foreign.status_code == 404
+
+
+async def test_resume_past_the_ring_buffer_asks_for_a_resync():
+    notifier = TaskNotifier(event_buffer_size=2)
+    for _ in range(5):
+        await notifier.broadcast(7, {"type": "tasks_changed", "list_id": 7})
+
+    resync = [(5, {"type": "resync", "list_id": 7})]
+    _, within_buffer = await notifier.open_stream(7, notifier.format_event_id(3))
+    _, too_old = await notifier.open_stream(7, notifier.format_event_id(2))
+    _, from_the_future = await notifier.open_stream(7, notifier.format_event_id(99))
+    _, other_process = await notifier.open_stream(7, "0000-4")
+
+    assert [event_id for event_id, _ in within_buffer] == [4, 5]
+    assert too_old == from_the_future == other_process == resync
+    assert len(notifier._history[7][1]) == 2
+
+
+async def test_ids_are_not_reused_after_a_list_history_is_evicted():
+    notifier = TaskNotifier(max_history_lists=1)
+    await notifier.broadcast(7, {"type": "tasks_changed", "list_id": 7})
+    seen = notifier.format_event_id(1)
+    # List 8 pushes list 7 out; list 7's next event must not be mistaken for one already seen.
+    await notifier.broadcast(8, {"type": "tasks_changed", "list_id": 8})
+    await notifier.broadcast(7, {"type": "tasks_changed", "list_id": 7})
+
+    _, backlog = await notifier.open_stream(7, seen)
+
+    assert backlog == [(3, {"type": "resync", "list_id": 7})]
+
+
+async def test_streams_share_the_websocket_connection_caps():
+    notifier = TaskNotifier(max_connections=3, max_connections_per_user=2)
+    assert await notifier.open_stream(1, user_id=1) is not None
+    second = await notifier.open_stream(2, user_id=1)
+    assert second is not None
+    assert await notifier.open_stream(1, user_id=1) is None
+    assert notifier.stats()["rejected_total"] == 1
+
+    await notifier.close_stream(2, second[0])
+    assert await notifier.open_stream(1, user_id=1) is not None
+    assert await notifier.open_stream(1, user_id=2) is not None
+    assert await notifier.open_stream(1, user_id=3) is None
@@ -0,0 +1,31 @@
+from dataclasses import replace
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import create_app
+from app.serve import server_options
+
+
+def test_readiness_follows_the_lifespan(settings: Settings):
+    app = create_app(settings=settings)
+    client = TestClient(app)
+    assert client.get("/api/health/live").json() == {"status": "ok"}
+    assert client.get("/api/health/ready").status_code == 503
+
+    with client:
+        response = client.get("/api/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["checks"] == {"started": True, "primary": True}
+
+    assert client.get("/api/health/ready").status_code == 503
+
+
+def test_server_options_never_reload_and_disable_recycling_at_zero(settings: Settings):
+    options = server_options(replace(settings, server_workers=0, server_max_requests=0))
+    assert options["reload"] is False
+    assert options["workers"] == 1
+    assert options["limit_max_requests"] is None
+    assert options["loop"] in {"uvloop", "asyncio"}
+    assert options["http"] in {"httptools", "h11"}
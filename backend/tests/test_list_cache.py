@@ -0,0 +1,91 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.services.list_cache import TaskListCache
+
+
+def test_repeated_reads_hit_the_cache_until_a_write(client: TestClient, auth_headers):
+    headers = auth_headers("cache@example.com")
+    cache = client.app.state.task_cache
+    list_id = client.post("/api/lists", json={"name": "Inbox"}, headers=headers).json()["id"]
+    client.post(f"/api/lists/{list_id}/tasks", json={"title": "First"}, headers=headers)
+
+    first = client.get(f"/api/lists/{list_id}/tasks", headers=headers)
+    second = client.get(f"/api/lists/{list_id}/tasks", headers=headers)
+    assert first.content == second.content
+    assert (cache.misses, cache.hits) == (1, 1)
+
+    task_id = first.json()[0]["id"]
+    client.put(f"/api/tasks/{task_id}", json={"status": "completed"}, headers=headers)
+    updated = client.get(f"/api/lists/{list_id}/tasks", headers=headers)
+    assert updated.json()[0]["status"] == "completed"
+    assert cache.misses == 2
+    assert cache.stats()["entries"] == 1
+
+
+def test_cached_payloads_are_kept_per_encoding(client: TestClient, auth_headers):
+    headers = auth_headers("cache@example.com")
+    cache = client.app.state.task_cache
+    list_id = client.post("/api/lists", json={"name": "Inbox"}, headers=headers).json()["id"]
+
+    client.get(f"/api/lists/{list_id}/tasks", headers=headers)
+    msgpack = client.get(
+        f"/api/lists/{list_id}/tasks",
+        headers={**headers, "Accept": "application/msgpack"},
+    )
+    assert msgpack.headers["content-type"].startswith("application/msgpack")
+    assert cache.stats()["entries"] == 2
+
+
+def test_concurrent_misses_load_once():
+    cache = TaskListCache()
+    calls = 0
+    started = threading.Event()
+
+    def load() -> bytes:
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.05)
+        return b"[]"
+
+    results: list[bytes] = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load(1, 0, "json", load)))
+    leader.start()
+    started.wait()
+    followers = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load(1, 0, "json", load)))
+        for _ in range(8)
+    ]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert calls == 1
+    assert results == [b"[]"] * 9
+    assert cache.collapsed == 8
+
+
+def test_evicts_least_recently_used_lists():
+    cache = TaskListCache(max_bytes=10)
+    cache.get_or_load(1, 0, "json", lambda: b"aaaa")
+    cache.get_or_load(2, 0, "json", lambda: b"bbbb")
+    cache.get_or_load(1, 0, "json", lambda: b"unused")
+    cache.get_or_load(3, 0, "json", lambda: b"cccc")
+
+    assert cache.evictions == 1
+    assert cache.get_or_load(1, 0, "json", lambda: b"reloaded") == b"aaaa"
+    assert cache.get_or_load(2, 0, "json", lambda: b"reloaded") == b"reloaded"
+
+
+def test_newer_version_replaces_older_entry():
+    cache = TaskListCache()
+    cache.get_or_load(1, 0, "json", lambda: b"old")
+    cache.get_or_load(1, 1, "json", lambda: b"new")
+    cache.get_or_load(1, 0, "json", lambda: b"stale")
+
+    assert cache.stats()["entries"] == 1
+    assert cache.get_or_load(1, 1, "json", lambda: b"unused") == b"new"
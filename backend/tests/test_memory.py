@@ -0,0 +1,54 @@
+import tracemalloc
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core.config import Settings
+from app.main import create_app
+
+
+def test_snapshots_can_be_triggered_diffed_and_downloaded(settings: Settings, tmp_path: Path):
+    diagnosed = replace(
+        settings,
+        memory_diagnostics_enabled=True,
+        memory_diagnostics_token="debug-secret",
+        memory_snapshot_interval_seconds=0,
+        memory_snapshot_directory=str(tmp_path / "snapshots"),
+        memory_max_snapshots=2,
+    )
+    with TestClient(create_app(settings=diagnosed)) as client:
+        assert tracemalloc.is_tracing()
+        assert client.get("/api/debug/memory").status_code == 403
+        debug = {"X-Debug-Token": "debug-secret"}
+
+        first = client.post("/api/debug/memory/snapshots", headers=debug).json()
+        assert first["diff"] == []
+        retained = [bytearray(1024) for _ in range(256)]
+        second = client.post("/api/debug/memory/snapshots", headers=debug).json()
+        assert any(item["size_diff"] >= 256 * 1024 for item in second["diff"])
+        client.post("/api/debug/memory/snapshots", headers=debug)
+
+        memory = client.get("/api/debug/memory", headers=debug).json()
+        assert memory["snapshots_total"] == 3
+        assert len(memory["snapshots"]) == 2
+        assert memory["sessions"]["live"] >= 0
+        assert memory["websockets"]["live"] == 0
+        public = client.get("/api/metrics").json()["memory"]
+        assert set(public["checked_out_connections"]) == {"primary"}
+
+        response = client.get(f"/api/debug/memory/snapshots/{memory['snapshots'][0]}", headers=debug)
+        assert response.status_code == 200
+        path = tmp_path / "downloaded"
+        path.write_bytes(response.content)
+        assert tracemalloc.Snapshot.load(str(path)).traces
+        del retained
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_diagnostics_cost_nothing_when_disabled(client: TestClient):
+    assert not tracemalloc.is_tracing()
+    assert deps._require_session_factory().live_sessions is None
+    assert client.get("/api/debug/memory", headers={"X-Debug-Token": ""}).status_code == 404
+    assert "memory" not in client.get("/api/metrics").json()
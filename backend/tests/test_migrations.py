@@ -0,0 +1,151 @@
+import os
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, select, text
+
+from app.core.config import Settings
+from app.db import migrations, models
+from app.db.base import Base
+from app.db.migrations import LATEST_VERSION, SchemaOutOfDate, applied_versions, check_current, migrate
+from app.db.session import enable_sqlite_foreign_keys
+from app.main import create_app
+
+# The schema as the first release created it, before any migration existed.
+LEGACY_SCHEMA = (
+    """CREATE TABLE users (
+        id INTEGER PRIMARY KEY, email VARCHAR(255) NOT NULL UNIQUE, full_name VARCHAR(255),
+        hashed_password VARCHAR(255) NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )""",
+    """CREATE TABLE task_lists (
+        id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL,
+        owner_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )""",
+    """CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, description TEXT, due_date DATE,
+        status VARCHAR(50) NOT NULL, priority VARCHAR(50) NOT NULL, tags JSON NOT NULL,
+        list_id INTEGER NOT NULL REFERENCES task_lists (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )""",
+    "INSERT INTO users (id, email, hashed_password) VALUES (1, 'old@example.com', 'x')",
+    "INSERT INTO task_lists (id, name, owner_id) VALUES (1, 'Old', 1)",
+    """INSERT INTO tasks (id, title, status, priority, tags, list_id, position)
+       VALUES (1, 'Kept', 'pending', 'medium', '[]', 1, 0)""",
+)
+
+
+@pytest.fixture()
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+
+
+def test_migrate_brings_a_legacy_database_forward(legacy_engine):
+    with pytest.raises(SchemaOutOfDate):
+        check_current(legacy_engine)
+
+    assert migrate(legacy_engine, Base.metadata) == [1, 2, 3, 4, 5, 6]
+    assert migrate(legacy_engine, Base.metadata) == []
+    check_current(legacy_engine)
+
+    inspector = inspect(legacy_engine)
+    assert "version" in {column["name"] for column in inspector.get_columns("task_lists")}
+    assert {index["name"] for index in inspector.get_indexes("tasks")} >= {
+        "ix_tasks_list_id_position",
+        "ix_tasks_due_date",
+        "ix_tasks_status_updated_at",
+    }
+    assert "ix_task_lists_owner_id" in {index["name"] for index in inspector.get_indexes("task_lists")}
+    assert inspector.has_table("archived_tasks")
+    assert inspector.has_table("task_occurrences")
+    assert "recurrence" in {column["name"] for column in inspector.get_columns("tasks")}
+    with legacy_engine.connect() as connection:
+        assert connection.scalar(text("SELECT title FROM tasks WHERE id = 1")) == "Kept"
+        assert connection.execute(
+            text("SELECT typeof(status), status, priority FROM tasks WHERE id = 1")
+        ).one() == ("integer", 0, 1)
+        assert connection.execute(
+            select(models.Task.status, models.Task.priority).where(models.Task.id == 1)
+        ).one() == ("pending", "medium")
+        plan = connection.execute(
+            text("EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE list_id = 1 ORDER BY position")
+        ).all()
+    assert [row[3] for row in plan] == [
+        "SEARCH tasks USING INDEX ix_tasks_list_id_position (list_id=?)"
+    ]
+
+
+def test_fresh_database_is_created_current(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    assert migrate(engine, Base.metadata) == [1, 2, 3, 4, 5, 6]
+    assert max(applied_versions(engine)) == LATEST_VERSION
+    check_current(engine)
+    engine.dispose()
+
+
+def test_startup_refuses_an_outdated_schema_without_auto_migrate(
+    settings: Settings, legacy_engine
+):
+    app = create_app(settings=replace(settings, database_url=str(legacy_engine.url), auto_migrate=False))
+    with pytest.raises(SchemaOutOfDate, match="python -m app.db.migrate"):
+        with TestClient(app):
+            pass
+
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path: Path):
+    database = tmp_path / "untouched.db"
+    environment = {**os.environ, "DATABASE_URL": f"sqlite:///{database}"}
+    subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=Path(__file__).resolve().parents[1],
+        env=environment,
+        check=True,
+    )
+    assert not database.exists()
+
+
+def test_task_ids_are_never_reused_and_occurrences_survive_the_rebuild(
+    legacy_engine, monkeypatch: pytest.MonkeyPatch
+):
+    enable_sqlite_foreign_keys(legacy_engine)
+    legacy_engine.dispose()
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS[:4])
+    migrate(legacy_engine, Base.metadata)
+    with legacy_engine.begin() as connection:
+        connection.execute(
+            text("UPDATE tasks SET due_date = '2026-01-05', recurrence = '{\"frequency\": \"daily\"}'")
+        )
+        connection.execute(
+            text(
+                "INSERT INTO task_occurrences (task_id, list_id, occurrence_date, status, updated_at)"
+                " VALUES (1, 1, '2026-01-06', 2, CURRENT_TIMESTAMP)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO archived_tasks (id, title, status, priority, tags, list_id, position,"
+                " created_at, updated_at) VALUES (9, 'Done', 2, 1, '[]', 1, 0, 0, 0)"
+            )
+        )
+    monkeypatch.undo()
+
+    assert migrate(legacy_engine, Base.metadata) == [5, 6]
+    with legacy_engine.begin() as connection:
+        assert connection.scalar(text("SELECT count(*) FROM task_occurrences")) == 1
+        new_id = connection.execute(
+            text(
+                "INSERT INTO tasks (title, status, priority, tags, list_id, position)"
+                " VALUES ('New', 0, 1, '[]', 1, 1)"
+            )
+        ).lastrowid
+    assert new_id == 10
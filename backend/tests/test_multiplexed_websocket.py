@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+
+def test_one_socket_routes_events_for_many_lists(client: TestClient, auth_headers):
+    headers = auth_headers("dashboard@example.com")
+    token = headers["Authorization"].removeprefix("Bearer ")
+    list_ids = [
+        client.post("/api/lists", json={"name": f"List {index}"}, headers=headers).json()["id"]
+        for index in range(3)
+    ]
+    other_headers = auth_headers("stranger@example.com")
+    foreign_id = client.post("/api/lists", json={"name": "Theirs"}, headers=other_headers).json()["id"]
+
+    with client.websocket_connect(f"/api/ws?token={token}") as websocket:
+        websocket.send_json({"type": "subscribe", "list_ids": [*list_ids, foreign_id]})
+        assert websocket.receive_json() == {
+            "type": "subscribed",
+            "list_ids": sorted(list_ids),
+            "denied": [foreign_id],
+        }
+        assert client.app.state.task_notifier.stats()["live"] == 1
+
+        client.post(f"/api/lists/{list_ids[2]}/tasks", json={"title": "Third"}, headers=headers)
+        assert websocket.receive_json() == {"type": "tasks_changed", "list_id": list_ids[2]}
+
+        websocket.send_json({"type": "unsubscribe", "list_ids": [list_ids[2]]})
+        assert websocket.receive_json() == {"type": "unsubscribed", "list_ids": [list_ids[2]]}
+
+        client.post(f"/api/lists/{list_ids[2]}/tasks", json={"title": "Muted"}, headers=headers)
+        client.post(f"/api/lists/{foreign_id}/tasks", json={"title": "Hidden"}, headers=other_headers)
+        client.post(f"/api/lists/{list_ids[0]}/tasks", json={"title": "First"}, headers=headers)
+        assert websocket.receive_json() == {"type": "tasks_changed", "list_id": list_ids[0]}
+
+
+def test_multiplexed_socket_rejects_invalid_token(client: TestClient):
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with client.websocket_connect("/api/ws?token=not-a-token"):
+            pass
+    assert exc_info.value.code == 1008
@@ -0,0 +1,87 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.services.notifier import TaskNotifier
+
+
+class FakeWebSocket:
+    def __init__(self, *, hang: bool = False) -> None:
+        self.hang = hang
+        self.accepted = False
+        self.close_code: int | None = None
+        self.sent: list[str] = []
+
+    async def accept(self) -> None:
+        self.accepted = True
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+    async def send_text(self, payload: str) -> None:
+        if self.hang:
+            await asyncio.sleep(3600)
+        self.sent.append(payload)
+
+
+async def test_heartbeat_pings_live_sockets_and_reaps_dead_ones():
+    notifier = TaskNotifier(heartbeat_timeout=10.0, send_timeout=0.05)
+    live, silent, stuck = FakeWebSocket(), FakeWebSocket(), FakeWebSocket(hang=True)
+    for websocket in (live, silent, stuck):
+        assert await notifier.connect(1, websocket, user_id=1)
+    notifier._subscribers[silent].last_seen -= 60
+
+    await notifier.heartbeat()
+
+    assert live.sent == ['{"type":"ping"}']
+    assert silent.sent == []
+    assert silent.close_code == 1001
+    assert stuck.close_code == 1001
+    stats = notifier.stats()
+    assert (stats["live"], stats["reaped_total"], stats["rejected_total"]) == (1, 2, 0)
+
+    await notifier.broadcast(1, {"type": "tasks_changed", "list_id": 1})
+    assert live.sent[-1] == '{"type":"tasks_changed","list_id":1}'
+
+
+async def test_broadcast_closes_subscribers_it_cannot_reach():
+    notifier = TaskNotifier(max_connections_per_user=1, send_timeout=0.05)
+    stuck = FakeWebSocket(hang=True)
+    assert await notifier.connect(1, stuck, user_id=1)
+
+    await notifier.broadcast(1, {"type": "tasks_changed", "list_id": 1})
+
+    assert stuck.close_code == 1001
+    assert notifier.stats()["live"] == 0
+    assert await notifier.connect(1, FakeWebSocket(), user_id=1)
+
+
+async def test_connection_caps_reject_with_try_again_later():
+    notifier = TaskNotifier(max_connections=3, max_connections_per_user=2)
+    first, second, over_user_cap = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    assert await notifier.connect(1, first, user_id=1)
+    assert await notifier.connect(2, second, user_id=1)
+    assert not await notifier.connect(3, over_user_cap, user_id=1)
+    assert over_user_cap.close_code == 1013
+    assert not over_user_cap.accepted
+
+    assert await notifier.connect(1, FakeWebSocket(), user_id=2)
+    over_global_cap = FakeWebSocket()
+    assert not await notifier.connect(1, over_global_cap, user_id=3)
+    assert over_global_cap.close_code == 1013
+
+    await notifier.disconnect(first)
+    assert await notifier.connect(3, FakeWebSocket(), user_id=1)
+    assert notifier.stats()["rejected_total"] == 2
+
+
+def test_metrics_report_live_websockets(client: TestClient, auth_headers):
+    headers = auth_headers("gauges@example.com")
+    token = headers["Authorization"].removeprefix("Bearer ")
+    list_id = client.post("/api/lists", json={"name": "Gauged"}, headers=headers).json()["id"]
+
+    with client.websocket_connect(f"/api/ws/lists/{list_id}?token={token}") as websocket:
+        websocket.send_text('{"type":"pong"}')
+        assert client.get("/api/metrics").json()["websockets"]["live"] == 1
+
+    assert client.get("/api/metrics").json()["websockets"]["live"] == 0
@@ -0,0 +1,40 @@
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import create_app
+
+
+def test_profiles_only_requests_with_the_debug_header(
+    settings: Settings, tmp_path: Path, auth_headers
+):
+    profiled = replace(
+        settings,
+        profiling_enabled=True,
+        profiling_token="debug-secret",
+        profiling_directory=str(tmp_path / "profiles"),
+    )
+    with TestClient(create_app(settings=profiled)) as client:
+        auth = auth_headers("prof@example.com", client)
+        client.get("/api/lists", headers={**auth, "X-Profile": "wrong"})
+        assert not (tmp_path / "profiles").exists()
+
+        assert client.get("/api/lists", headers={**auth, "X-Profile": "debug-secret"}).status_code == 200
+
+        assert client.get("/api/debug/profiles").status_code == 403
+        debug = {"X-Debug-Token": "debug-secret"}
+        [summary] = client.get("/api/debug/profiles", headers=debug).json()
+        assert summary["route"] == "/api/lists"
+        assert summary["status"] == 200
+        assert summary["sql_statements"] >= 2
+
+        profile = client.get(f"/api/debug/profiles/{summary['name']}", headers=debug).json()
+        assert any("FROM task_lists" in item["statement"] for item in profile["sql"])
+        assert profile["wall_seconds"] > 0
+        assert client.get("/api/debug/profiles/missing.json", headers=debug).status_code == 404
+
+
+def test_profiling_is_absent_when_disabled(client: TestClient):
+    assert client.get("/api/debug/profiles", headers={"X-Debug-Token": ""}).status_code == 404
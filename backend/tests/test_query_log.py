@@ -0,0 +1,45 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.query_log import SlowQueryLog
+
+
+@pytest.fixture()
+def scratch_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scratch.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY, owner INTEGER, body TEXT)"))
+    yield engine
+    engine.dispose()
+
+
+def test_slow_statements_are_logged_with_plan_and_redacted_parameters(scratch_engine, caplog):
+    query_log = SlowQueryLog(threshold_seconds=0)
+    query_log.install(scratch_engine)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_log"):
+        with scratch_engine.connect() as connection:
+            for owner in (7, 8):
+                connection.execute(
+                    text("SELECT body FROM notes WHERE owner = :owner"), {"owner": owner}
+                ).all()
+            connection.execute(text("SELECT body FROM notes WHERE id = :id"), {"id": 1}).all()
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 3
+    assert "FULL SCAN of notes" in messages[0]
+    assert "params=<1 redacted>" in messages[0]
+    assert "FULL SCAN" not in messages[2]
+    assert query_log.stats() == {"slow_total": 3, "full_scan_total": 2, "plans": 2}
+
+
+def test_fast_statements_are_not_explained(scratch_engine, caplog):
+    query_log = SlowQueryLog(threshold_seconds=60)
+    query_log.install(scratch_engine)
+    with caplog.at_level(logging.WARNING, logger="app.db.query_log"):
+        with scratch_engine.connect() as connection:
+            connection.execute(text("SELECT body FROM notes")).all()
+
+    assert caplog.records == []
+    assert query_log.stats()["plans"] == 0
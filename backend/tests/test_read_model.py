@@ -0,0 +1,111 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.services.read_model import TaskChange, TaskReadModel
+
+
+def _task(task_id: int, position: int, **fields) -> SimpleNamespace:
+    values = {
+        "id": task_id,
+        "list_id": 1,
+        "title": f"Task {task_id}",
+        "description": None,
+        "due_date": None,
+        "status": "pending",
+        "priority": "medium",
+        "tags": [],
+        "position": position,
+        "recurrence": None,
+    }
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def test_writes_are_applied_in_place_and_match_the_database(
+    client: TestClient, session_factory: sessionmaker, auth_headers
+):
+    read_model = client.app.state.read_model = TaskReadModel()
+    client.app.state.change_publisher.read_model = read_model
+    headers = auth_headers("projection@example.com")
+    list_id = client.post("/api/lists", json={"name": "Inbox"}, headers=headers).json()["id"]
+    ids = [
+        client.post(
+            f"/api/lists/{list_id}/tasks",
+            json={"title": title, "priority": priority, "tags": ["school"]},
+            headers=headers,
+        ).json()["id"]
+        for title, priority in [("Read", "low"), ("Write", "high"), ("Review", "high")]
+    ]
+    assert client.get(f"/api/lists/{list_id}/tasks", headers=headers).status_code == 200
+
+    client.put(f"/api/tasks/{ids[0]}", json={"status": "completed"}, headers=headers)
+    client.put(f"/api/lists/{list_id}/tasks/reorder", json={"task_ids": ids[::-1]}, headers=headers)
+    client.delete(f"/api/tasks/{ids[1]}", headers=headers)
+    client.post(f"/api/lists/{list_id}/tasks", json={"title": "Submit"}, headers=headers)
+    assert read_model.applied == 4
+    assert read_model.invalidations == 0
+
+    tasks = client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()
+    assert [task["title"] for task in tasks] == ["Review", "Read", "Submit"]
+    assert [task["position"] for task in tasks] == [0, 1, 2]
+    high = client.get(f"/api/lists/{list_id}/tasks?priority=high", headers=headers).json()
+    assert [task["title"] for task in high] == ["Review"]
+    counts = client.get(f"/api/lists/{list_id}/tasks/counts", headers=headers).json()
+    assert counts["total"] == 3
+    assert counts["by_status"] == {"pending": 2, "in_progress": 0, "completed": 1}
+    assert counts["by_priority"] == {"low": 1, "medium": 1, "high": 1}
+    assert read_model.stats()["misses"] == 1
+
+    with session_factory() as session:
+        assert read_model.verify(session) == {}
+
+
+def test_counts_without_read_model_use_the_database(client: TestClient, auth_headers):
+    headers = auth_headers("projection@example.com")
+    list_id = client.post("/api/lists", json={"name": "Inbox"}, headers=headers).json()["id"]
+    client.post(
+        f"/api/lists/{list_id}/tasks",
+        json={"title": "Only", "status": "in_progress"},
+        headers=headers,
+    )
+
+    counts = client.get(f"/api/lists/{list_id}/tasks/counts", headers=headers).json()
+    assert counts == {
+        "total": 1,
+        "by_status": {"pending": 0, "in_progress": 1, "completed": 0},
+        "by_priority": {"low": 0, "medium": 1, "high": 0},
+    }
+
+
+def test_out_of_order_change_drops_the_list():
+    read_model = TaskReadModel()
+    read_model.load(1, 3, [_task(1, 0), _task(2, 1)])
+
+    read_model.apply(TaskChange("delete", 1, 5, task_id=2))
+
+    assert read_model.tasks(1, 3) is None
+    assert read_model.invalidations == 1
+
+
+def test_newer_projection_serves_lagging_reads():
+    read_model = TaskReadModel()
+    read_model.load(1, 1, [_task(1, 0)])
+    read_model.apply(TaskChange("upsert", 1, 2, task=vars(_task(2, 1))))
+
+    rows = read_model.tasks(1, 1)
+    assert [row["id"] for row in rows] == [1, 2]
+    read_model.load(1, 1, [_task(1, 0)])
+    assert len(read_model.tasks(1, 2)) == 2
+
+
+def test_budget_evicts_whole_lists():
+    read_model = TaskReadModel(max_bytes=2_000)
+    for list_id in range(1, 4):
+        read_model.load(list_id, 1, [_task(task_id, task_id, list_id=list_id) for task_id in range(5)])
+
+    assert read_model.current_bytes <= 2_000
+    assert read_model.evictions >= 1
+    assert read_model.tasks(1, 1) is None
+    assert len(read_model.tasks(3, 1)) == 5
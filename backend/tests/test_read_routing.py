@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.db.session import sync_sqlite_replica
+from app.main import create_app
+
+
+def _settings(tmp_path: Path, read_your_writes_seconds: float) -> Settings:
+    return Settings(
+        app_name="TaskTrack-Replica",
+        database_url=f"sqlite:///{tmp_path / 'primary.db'}",
+        read_database_url=f"sqlite:///{tmp_path / 'replica.db'}",
+        read_your_writes_seconds=read_your_writes_seconds,
+        secret_key="test-secret-key",
+    )
+
+
+def test_reads_use_replica_until_it_catches_up(tmp_path: Path, auth_headers):
+    settings = _settings(tmp_path, read_your_writes_seconds=0)
+    with TestClient(create_app(settings=settings)) as client:
+        sync_sqlite_replica(settings.database_url, settings.read_database_url)
+        headers = auth_headers("reader@example.com", client)
+        assert client.post("/api/lists", json={"name": "Inbox"}, headers=headers).status_code == 201
+
+        stale = client.get("/api/lists", headers=headers)
+        assert stale.status_code == 200
+        assert stale.json() == []
+
+        sync_sqlite_replica(settings.database_url, settings.read_database_url)
+        fresh = client.get("/api/lists", headers=headers)
+        assert [task_list["name"] for task_list in fresh.json()] == ["Inbox"]
+
+
+def test_reads_after_a_write_are_pinned_to_primary(tmp_path: Path, auth_headers):
+    settings = _settings(tmp_path, read_your_writes_seconds=60)
+    with TestClient(create_app(settings=settings)) as client:
+        sync_sqlite_replica(settings.database_url, settings.read_database_url)
+        headers = auth_headers("reader@example.com", client)
+        list_id = client.post("/api/lists", json={"name": "Inbox"}, headers=headers).json()["id"]
+        client.post(f"/api/lists/{list_id}/tasks", json={"title": "Fresh"}, headers=headers)
+
+        response = client.get(f"/api/lists/{list_id}/tasks", headers=headers)
+        assert response.status_code == 200
+        assert [task["title"] for task in response.json()] == ["Fresh"]
@@ -0,0 +1,143 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.services import task as task_service
+
+
+def _agenda(client: TestClient, list_id: int, headers: dict[str, str]) -> list[dict]:
+    response = client.get(
+        f"/api/lists/{list_id}/agenda",
+        params={"start": "2026-10-19", "end": "2026-10-25"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_agenda_expands_old_series_and_stores_only_changed_occurrences(
+    client: TestClient, engine, auth_headers
+):
+    headers = auth_headers("repeat@example.com")
+    list_id = client.post("/api/lists", json={"name": "Chores"}, headers=headers).json()["id"]
+    series = client.post(
+        f"/api/lists/{list_id}/tasks",
+        json={
+            "title": "bins",
+            "due_date": "1990-01-01",
+            "recurrence": {"frequency": "weekly", "weekdays": [0, 2]},
+        },
+        headers=headers,
+    ).json()
+    assert series["recurrence"] == {"frequency": "weekly", "interval": 1, "weekdays": [0, 2], "until": None}
+    client.post(
+        f"/api/lists/{list_id}/tasks", json={"title": "dentist", "due_date": "2026-10-20"}, headers=headers
+    )
+
+    agenda = _agenda(client, list_id, headers)
+    assert [(item["occurrence_date"], item["title"], item["recurring"]) for item in agenda] == [
+        ("2026-10-19", "bins", True),
+        ("2026-10-20", "dentist", False),
+        ("2026-10-21", "bins", True),
+    ]
+
+    response = client.put(
+        f"/api/tasks/{series['id']}/occurrences/2026-10-21", json={"status": "completed"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert [item["status"] for item in _agenda(client, list_id, headers)] == ["pending", "pending", "completed"]
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM task_occurrences")).scalar_one() == 1
+
+    missing = client.put(
+        f"/api/tasks/{series['id']}/occurrences/2026-10-20", json={"status": "completed"}, headers=headers
+    )
+    assert missing.status_code == 404
+
+
+def test_recurrence_is_validated_and_clearing_it_drops_the_series(
+    client: TestClient, engine, auth_headers
+):
+    headers = auth_headers("repeat@example.com")
+    list_id = client.post("/api/lists", json={"name": "Chores"}, headers=headers).json()["id"]
+    undated = client.post(
+        f"/api/lists/{list_id}/tasks",
+        json={"title": "bins", "recurrence": {"frequency": "daily"}},
+        headers=headers,
+    )
+    assert undated.status_code == 400
+    too_long = client.get(
+        f"/api/lists/{list_id}/agenda", params={"start": "2026-01-01", "end": "2027-06-01"}, headers=headers
+    )
+    assert too_long.status_code == 400
+
+    task_id = client.post(
+        f"/api/lists/{list_id}/tasks",
+        json={"title": "water", "due_date": "2026-10-01", "recurrence": {"frequency": "daily", "interval": 3}},
+        headers=headers,
+    ).json()["id"]
+    assert [item["occurrence_date"] for item in _agenda(client, list_id, headers)] == [
+        "2026-10-19",
+        "2026-10-22",
+        "2026-10-25",
+    ]
+    client.put(f"/api/tasks/{task_id}/occurrences/2026-10-22", json={"status": "completed"}, headers=headers)
+
+    moved = client.put(f"/api/tasks/{task_id}", json={"due_date": "2026-10-02"}, headers=headers)
+    assert moved.status_code == 200
+    assert [item["occurrence_date"] for item in _agenda(client, list_id, headers)] == [
+        "2026-10-20",
+        "2026-10-23",
+    ]
+    assert all(item["status"] == "pending" for item in _agenda(client, list_id, headers))
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM task_occurrences")).scalar_one() == 0
+    client.put(f"/api/tasks/{task_id}/occurrences/2026-10-23", json={"status": "completed"}, headers=headers)
+
+    cleared = client.put(f"/api/tasks/{task_id}", json={"recurrence": None}, headers=headers)
+    assert cleared.status_code == 200
+    assert cleared.json()["recurrence"] is None
+    assert _agenda(client, list_id, headers) == []
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM task_occurrences")).scalar_one() == 0
+
+
+def test_series_status_changes_go_through_occurrences(
+    client: TestClient, auth_headers, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(task_service, "_today", lambda: date(2026, 10, 20))
+    headers = auth_headers("repeat@example.com")
+    list_id = client.post("/api/lists", json={"name": "Chores"}, headers=headers).json()["id"]
+    weekly = {"frequency": "weekly", "weekdays": [0, 2]}
+    completed_series = client.post(
+        f"/api/lists/{list_id}/tasks",
+        json={"title": "bins", "due_date": "1990-01-01", "status": "completed", "recurrence": weekly},
+        headers=headers,
+    )
+    assert completed_series.status_code == 400
+    series = client.post(
+        f"/api/lists/{list_id}/tasks",
+        json={"title": "bins", "due_date": "1990-01-01", "recurrence": weekly},
+        headers=headers,
+    ).json()
+    client.post(f"/api/lists/{list_id}/tasks", json={"title": "post"}, headers=headers)
+
+    completed = client.put(f"/api/tasks/{series['id']}", json={"status": "completed"}, headers=headers)
+    assert completed.status_code == 400
+    assert "occurrences" in completed.json()["detail"]
+    unchanged = client.put(
+        f"/api/tasks/{series['id']}", json={"title": "bins out", "status": "pending"}, headers=headers
+    )
+    assert unchanged.status_code == 200
+    bulk = client.patch(f"/api/lists/{list_id}/tasks", json={"status": "completed"}, headers=headers)
+    assert bulk.json() == {"affected": 1}
+
+    tasks = client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()
+    assert [(task["title"], task["status"], task["next_occurrence"]) for task in tasks] == [
+        ("bins out", "pending", "2026-10-21"),
+        ("post", "completed", None),
+    ]
+    assert [item["status"] for item in _agenda(client, list_id, headers)] == ["pending", "pending"]
@@ -0,0 +1,93 @@
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.services.notifier import TaskNotifier
+from app.services.read_model import TaskChange, task_row
+from app.services.reminders import ReminderScheduler
+
+TODAY = date(2030, 5, 1)
+NOW = datetime(2030, 5, 1, 9, 30, tzinfo=timezone.utc).timestamp()
+
+
+def _seed(session_factory: sessionmaker, tasks: list[dict]) -> tuple[int, list[int]]:
+    with session_factory() as session:
+        user = models.User(email="reminders@example.com", hashed_password="x")
+        session.add(user)
+        session.flush()
+        task_list = models.TaskList(name="Due", owner_id=user.id)
+        session.add(task_list)
+        session.flush()
+        rows = [
+            models.Task(list_id=task_list.id, position=position, **task)
+            for position, task in enumerate(tasks)
+        ]
+        session.add_all(rows)
+        session.commit()
+        return task_list.id, [row.id for row in rows]
+
+
+def _scheduler(session_factory: sessionmaker, notifier: TaskNotifier) -> ReminderScheduler:
+    return ReminderScheduler(
+        {None: session_factory}, notifier, window_days=1, batch_size=2, clock=lambda: NOW
+    )
+
+
+async def test_fires_due_reminders_once_across_workers(engine, session_factory: sessionmaker):
+    list_id, ids = _seed(
+        session_factory,
+        [
+            {"title": "Today", "due_date": TODAY},
+            {"title": "Also today", "due_date": TODAY},
+            {"title": "Done", "due_date": TODAY, "status": "completed"},
+            {"title": "Tomorrow", "due_date": TODAY + timedelta(days=1)},
+            {"title": "Later", "due_date": TODAY + timedelta(days=5)},
+            {"title": "Yesterday", "due_date": TODAY - timedelta(days=1)},
+        ],
+    )
+    notifier = TaskNotifier()
+    queue, _ = await notifier.open_stream(list_id)
+    first, second = _scheduler(session_factory, notifier), _scheduler(session_factory, notifier)
+
+    assert await first.refill() == 3
+    assert await second.refill() == 3
+    assert await first.fire_due() == 2
+    assert await second.fire_due() == 0
+    assert second.skipped_total == 2
+
+    events = [queue.get_nowait()[1] for _ in range(queue.qsize())]
+    assert [(event["type"], event["task_id"]) for event in events] == [
+        ("task_due", ids[0]),
+        ("task_due", ids[1]),
+    ]
+    assert events[0]["due_date"] == TODAY.isoformat()
+    assert first.stats()["scheduled"] == 1
+
+
+async def test_writes_adjust_only_the_affected_entries(engine, session_factory: sessionmaker):
+    list_id, ids = _seed(
+        session_factory,
+        [
+            {"title": "Moved", "due_date": TODAY + timedelta(days=1)},
+            {"title": "Deleted", "due_date": TODAY},
+        ],
+    )
+    notifier = TaskNotifier()
+    scheduler = _scheduler(session_factory, notifier)
+    await scheduler.refill()
+
+    with session_factory() as session:
+        moved = session.get(models.Task, ids[0])
+        moved.due_date = TODAY
+        session.delete(session.get(models.Task, ids[1]))
+        session.commit()
+        changes = [
+            TaskChange("upsert", list_id, 1, task=task_row(moved)),
+            TaskChange("delete", list_id, 2, task_id=ids[1]),
+        ]
+    scheduler.apply(changes)
+
+    assert scheduler.stats()["scheduled"] == 1
+    assert await scheduler.fire_due() == 1
+    assert scheduler.skipped_total == 0
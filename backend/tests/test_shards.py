@@ -0,0 +1,94 @@
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.api import deps
+from app.core.config import Settings
+from app.db.rebalance import move_user, plan_moves
+from app.db.shards import ID_RANGE_SIZE
+from app.main import create_app
+
+
+@pytest.fixture()
+def shard_paths(tmp_path: Path) -> list[Path]:
+    return [tmp_path / f"shard{index}.db" for index in range(2)]
+
+
+@pytest.fixture()
+def sharded_client(tmp_path: Path, shard_paths: list[Path]) -> Generator[TestClient, None, None]:
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'directory.db'}",
+        shard_database_urls=tuple(f"sqlite:///{path}" for path in shard_paths),
+        secret_key="test-secret-key",
+    )
+    with TestClient(create_app(settings=settings)) as client:
+        yield client
+
+
+def _seed(client: TestClient, headers: dict[str, str], titles: list[str]) -> tuple[int, list[int]]:
+    list_id = client.post("/api/lists", json={"name": "Errands"}, headers=headers).json()["id"]
+    ids = [
+        client.post(f"/api/lists/{list_id}/tasks", json={"title": title}, headers=headers).json()["id"]
+        for title in titles
+    ]
+    return list_id, ids
+
+
+def _list_ids(path: Path) -> set[int]:
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as connection:
+            return set(connection.scalars(text("SELECT id FROM task_lists")))
+    finally:
+        engine.dispose()
+
+
+def test_lists_live_on_their_owners_shard(
+    sharded_client: TestClient, shard_paths: list[Path], auth_headers
+):
+    first = auth_headers("first@example.com", sharded_client)
+    second = auth_headers("second@example.com", sharded_client)
+    first_list, first_tasks = _seed(sharded_client, first, ["Milk", "Bread"])
+    second_list, second_tasks = _seed(sharded_client, second, ["Stamps"])
+
+    # User 1 is placed on shard 1 and user 2 on shard 0.
+    assert _list_ids(shard_paths[1]) == {first_list}
+    assert _list_ids(shard_paths[0]) == {second_list}
+    assert len({*first_tasks, *second_tasks}) == 3
+    assert min(first_tasks) > ID_RANGE_SIZE and min(second_tasks) > ID_RANGE_SIZE
+
+    tasks = sharded_client.get(f"/api/lists/{first_list}/tasks", headers=first).json()
+    assert [task["title"] for task in tasks] == ["Milk", "Bread"]
+    assert sharded_client.get(f"/api/lists/{first_list}/tasks", headers=second).status_code == 404
+    assert [item["id"] for item in sharded_client.get("/api/lists", headers=second).json()] == [
+        second_list
+    ]
+
+
+def test_rebalance_moves_a_user_without_changing_ids(
+    sharded_client: TestClient, shard_paths: list[Path], auth_headers
+):
+    headers = auth_headers("mover@example.com", sharded_client)
+    list_id, task_ids = _seed(sharded_client, headers, ["Pack", "Ship"])
+    router = deps.get_shard_router()
+
+    assert plan_moves(router) == []
+    assert plan_moves(router, target=0) == [(1, 1, 0)]
+    assert move_user(router, 1, 0) == 1
+
+    assert _list_ids(shard_paths[1]) == set()
+    assert _list_ids(shard_paths[0]) == {list_id}
+    tasks = sharded_client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()
+    assert [task["id"] for task in tasks] == task_ids
+
+    # Shard 0 received ids from shard 1's higher range, so it must allocate above them.
+    other = auth_headers("other@example.com", sharded_client)
+    _, other_tasks = _seed(sharded_client, other, ["Unpack"])
+    assert other_tasks[0] > max(task_ids)
+    created = sharded_client.post(
+        f"/api/lists/{list_id}/tasks", json={"title": "Track"}, headers=headers
+    ).json()
+    assert created["id"] not in {*task_ids, *other_tasks}
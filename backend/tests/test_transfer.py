@@ -0,0 +1,209 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.services.archive import ArchiveService
+
+
+def _seed(client: TestClient, headers: dict[str, str]) -> None:
+    list_id = client.post("/api/lists", json={"name": "Chores"}, headers=headers).json()["id"]
+    client.post("/api/lists", json={"name": "Empty"}, headers=headers)
+    weekly = {"frequency": "weekly", "weekdays": [3], "until": "2026-06-30"}
+    for title, tags, recurrence in (("Dishes", ["home"], None), ("Laundry, folded", [], weekly)):
+        client.post(
+            f"/api/lists/{list_id}/tasks",
+            json={
+                "title": title,
+                "due_date": "2025-11-20",
+                "priority": "high",
+                "tags": tags,
+                "recurrence": recurrence,
+            },
+            headers=headers,
+        )
+
+
+def _snapshot(client: TestClient, headers: dict[str, str]) -> list[tuple[str, list[tuple]]]:
+    snapshot = []
+    for task_list in client.get("/api/lists", headers=headers).json():
+        tasks = client.get(f"/api/lists/{task_list['id']}/tasks", headers=headers).json()
+        snapshot.append(
+            (
+                task_list["name"],
+                [
+                    (t["title"], t["due_date"], t["priority"], t["tags"], t["position"], t["recurrence"])
+                    for t in tasks
+                ],
+            )
+        )
+    return snapshot
+
+
+def test_ndjson_export_round_trips_through_import(client: TestClient, auth_headers):
+    source = auth_headers("source@example.com")
+    _seed(client, source)
+
+    export = client.get("/api/export", headers=source)
+    assert export.status_code == 200
+    assert export.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in export.text.splitlines()]
+    assert [record["type"] for record in records] == ["list", "task", "task", "list"]
+
+    target = auth_headers("target@example.com")
+    response = client.post(
+        "/api/import",
+        files={"file": ("export.ndjson", export.content, "application/x-ndjson")},
+        headers=target,
+    )
+    assert response.status_code == 201
+    assert response.json() == {"lists": 2, "tasks": 2, "archived": 0}
+    assert _snapshot(client, target) == _snapshot(client, source)
+
+
+def test_csv_export_round_trips_through_import(client: TestClient, auth_headers):
+    source = auth_headers("csv-source@example.com")
+    _seed(client, source)
+
+    export = client.get("/api/export", params={"format": "csv"}, headers=source)
+    assert export.status_code == 200
+    assert export.text.splitlines()[0].startswith("list_id,list_name,task_id,title")
+
+    target = auth_headers("csv-target@example.com")
+    response = client.post(
+        "/api/import",
+        files={"file": ("export.csv", export.content, "text/csv")},
+        headers=target,
+    )
+    assert response.status_code == 201
+    assert response.json() == {"lists": 2, "tasks": 2, "archived": 0}
+    assert _snapshot(client, target) == _snapshot(client, source)
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+def test_archived_tasks_survive_an_export_round_trip(
+    client: TestClient, session_factory: sessionmaker, auth_headers, export_format: str
+):
+    source = auth_headers(f"archived-{export_format}@example.com")
+    _seed(client, source)
+    list_id = client.get("/api/lists", headers=source).json()[0]["id"]
+    dishes = client.get(f"/api/lists/{list_id}/tasks", headers=source).json()[0]["id"]
+    with session_factory() as session:
+        session.execute(
+            update(models.Task)
+            .where(models.Task.id == dishes)
+            .values(status="completed", updated_at=datetime.utcnow() - timedelta(days=45))
+        )
+        session.commit()
+        assert ArchiveService(session).archive_completed(older_than=timedelta(days=30)) == {list_id: 1}
+
+    export = client.get("/api/export", params={"format": export_format}, headers=source)
+    target = auth_headers(f"restored-{export_format}@example.com")
+    response = client.post(
+        "/api/import", files={"file": (f"export.{export_format}", export.content)}, headers=target
+    )
+
+    assert response.status_code == 201
+    assert response.json() == {"lists": 2, "tasks": 1, "archived": 1}
+    assert _snapshot(client, target) == _snapshot(client, source)
+    restored_list = client.get("/api/lists", headers=target).json()[0]["id"]
+    archive = client.get(f"/api/lists/{restored_list}/archive", headers=target).json()["items"]
+    assert [(task["title"], task["status"], task["tags"]) for task in archive] == [
+        ("Dishes", "completed", ["home"])
+    ]
+
+
+def test_invalid_import_is_rejected_without_partial_writes(client: TestClient, auth_headers):
+    headers = auth_headers("broken@example.com")
+    body = "\n".join(
+        [
+            json.dumps({"type": "list", "id": 1, "name": "Half"}),
+            json.dumps({"type": "task", "list_id": 1, "title": "Fine"}),
+            json.dumps({"type": "task", "list_id": 1, "title": "Bad", "status": "nope"}),
+        ]
+    )
+
+    response = client.post(
+        "/api/import",
+        files={"file": ("broken.ndjson", body.encode(), "application/x-ndjson")},
+        headers=headers,
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Line 3:")
+    assert client.get("/api/lists", headers=headers).json() == []
+
+
+@pytest.mark.parametrize(
+    ("filename", "body", "line"),
+    [
+        ("bad.csv", b"list_id,list_name,title\n1,Home,Dishes\n1,Home,Bad \xff\xfe\n", 3),
+        ("bad.ndjson", b'{"type": "list", "id": 1, "name": "Home"}\n{"type": "task", "title": "\xff"}\n', 2),
+    ],
+)
+def test_undecodable_import_is_a_line_error(
+    client: TestClient, auth_headers, filename: str, body: bytes, line: int
+):
+    headers = auth_headers("bytes@example.com")
+
+    response = client.post("/api/import", files={"file": (filename, body)}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Line {line}: not valid UTF-8"
+    assert client.get("/api/lists", headers=headers).json() == []
+
+
+def test_import_applies_the_same_task_rules_as_the_api(client: TestClient, auth_headers):
+    headers = auth_headers("rules@example.com")
+    records = [
+        {"type": "list", "id": 1, "name": "Home"},
+        {"type": "task", "list_id": 1, "title": "Tidy", "tags": [" home ", " "]},
+    ]
+
+    def _import(lines: list[dict]) -> dict:
+        body = "\n".join(json.dumps(record) for record in lines).encode()
+        return client.post("/api/import", files={"file": ("rules.ndjson", body)}, headers=headers)
+
+    invalid = _import([*records, {"type": "task", "list_id": 1, "title": "Bad", "priority": "urgent"}])
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "Line 3: Invalid priority. Valid values: low, medium, high"
+    endless = {"frequency": "daily", "interval": 0}
+    invalid = _import([*records, {"type": "task", "list_id": 1, "title": "Bad", "recurrence": endless}])
+    assert invalid.status_code == 400
+    assert invalid.json()["detail"] == "Line 3: A recurring task needs a due date for its first occurrence"
+    dated = {"type": "task", "list_id": 1, "title": "Bad", "due_date": "2026-01-01", "recurrence": endless}
+    invalid = _import([*records, dated])
+    assert invalid.json()["detail"] == "Line 3: Interval must be a whole number from 1 to 366"
+
+    assert _import(records).status_code == 201
+    list_id = client.get("/api/lists", headers=headers).json()[0]["id"]
+    created = client.post(
+        f"/api/lists/{list_id}/tasks", json={"title": "Tidy", "tags": [" home ", " "]}, headers=headers
+    ).json()
+    imported = client.get(f"/api/lists/{list_id}/tasks", headers=headers).json()[0]
+    assert imported["tags"] == created["tags"] == ["home"]
+
+
+@pytest.mark.parametrize(
+    ("record", "message"),
+    [
+        ({"type": "list", "id": [1], "name": "Odd"}, "list ids must be strings or integers"),
+        ({"type": "task", "list_id": [1], "title": "Odd"}, "list ids must be strings or integers"),
+        ({"type": "task", "list_id": 1, "title": "Odd", "description": {"x": 1}}, "description must be a string"),
+    ],
+)
+def test_malformed_import_fields_are_line_errors(
+    client: TestClient, auth_headers, record: dict, message: str
+):
+    headers = auth_headers("malformed@example.com")
+    body = "\n".join(json.dumps(line) for line in [{"type": "list", "id": 1, "name": "Home"}, record])
+
+    response = client.post("/api/import", files={"file": ("odd.ndjson", body.encode())}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Line 2: {message}"
+    assert client.get("/api/lists", headers=headers).json() == []
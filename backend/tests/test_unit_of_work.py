@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models
+from app.db.session import unit_of_work
+from app.repositories.task import TaskRepository
+from app.repositories.task_list import TaskListRepository
+from app.services.task import TaskService
+
+
+def _seed_list(session_factory: sessionmaker) -> tuple[int, int]:
+    with session_factory() as session:
+        user = models.User(email="uow@example.com", hashed_password="hashed")
+        session.add(user)
+        session.commit()
+        task_list = TaskService(session).create_list(owner_id=user.id, name="Atomic")
+        return user.id, task_list.id
+
+
+def _create_task(session_factory: sessionmaker, owner_id: int, list_id: int, title: str) -> int:
+    with session_factory() as session:
+        task = TaskService(session).create_task(
+            list_id=list_id,
+            owner_id=owner_id,
+            title=title,
+            description=None,
+            due_date=None,
+            status="pending",
+            priority="medium",
+            tags=[],
+        )
+        return task.id
+
+
+def test_delete_commits_once_and_resequences(session_factory: sessionmaker):
+    owner_id, list_id = _seed_list(session_factory)
+    task_ids = [_create_task(session_factory, owner_id, list_id, title) for title in ("a", "b", "c")]
+
+    with session_factory() as session:
+        commits: list[int] = []
+        event.listen(session, "after_commit", lambda _: commits.append(1))
+        TaskService(session).delete_task(task_id=task_ids[0], owner_id=owner_id)
+        assert len(commits) == 1
+
+    with session_factory() as session:
+        remaining = TaskRepository(session).list_for_task_list(list_id)
+        assert [(task.id, task.position) for task in remaining] == [(task_ids[1], 0), (task_ids[2], 1)]
+
+
+def test_unit_of_work_rolls_back_every_flushed_write(session_factory: sessionmaker):
+    owner_id, _ = _seed_list(session_factory)
+
+    with session_factory() as session:
+        with pytest.raises(RuntimeError):
+            with unit_of_work(session):
+                TaskListRepository(session).create(name="Never committed", owner_id=owner_id)
+                raise RuntimeError("boom")
+
+    with session_factory() as session:
+        names = [task_list.name for task_list in TaskListRepository(session).list_for_user(owner_id)]
+        assert names == ["Atomic"]
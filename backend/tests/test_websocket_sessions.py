@@ -0,0 +1,24 @@
+from contextlib import ExitStack
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def test_idle_subscribers_hold_no_database_connections(client: TestClient, auth_headers):
+    headers = auth_headers("watcher@example.com")
+    token = headers["Authorization"].removeprefix("Bearer ")
+    list_id = client.post("/api/lists", json={"name": "Watched"}, headers=headers).json()["id"]
+    pool = client.app.state.engine.pool
+    notifier = client.app.state.task_notifier
+    notifier.max_connections_per_user = 1000
+    checkouts: list[int] = []
+    event.listen(pool, "checkout", lambda *_: checkouts.append(1))
+
+    with ExitStack() as stack:
+        for _ in range(1000):
+            stack.enter_context(client.websocket_connect(f"/api/ws/lists/{list_id}?token={token}"))
+
+        assert notifier.stats()["live"] == 1000
+        assert len(checkouts) >= 1000
+        assert pool.checkedout() == 0
+        assert client.get(f"/api/lists/{list_id}/tasks", headers=headers).status_code == 200
@@ -27,6 +27,11 @@ export class ApiClient {
     });
   }
 
+  async bootstrap(listId) {
+    const query = listId ? `?list_id=${listId}` : "";
+    return this._request(`/api/bootstrap${query}`, { method: "GET" });
+  }
+
   async getLists() {
     return this._request("/api/lists", { method: "GET" });
   }
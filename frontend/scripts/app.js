@@ -5,6 +5,7 @@ import {
   setToken,
   setLists,
   setCurrentList,
+  getLastListId,
   setTasks,
   getTasks,
   resetState,
@@ -174,22 +175,32 @@ const taskHandlers = {
 async function loadInitialData() {
   try {
     enterAppView();
-    const lists = await apiClient.getLists();
-    setLists(lists);
-    renderLists(lists, state.currentListId, handleListSelect);
-    if (lists.length) {
-      handleListSelect(lists[0]);
+    // One request for the profile, every list and the first page of the last-used list.
+    const data = await apiClient.bootstrap(getLastListId());
+    setAuthStatus(data.user.email);
+    setLists(data.lists);
+    const selected = data.lists.find((list) => list.id === data.selected_list_id);
+    if (!selected) {
+      renderLists(data.lists, state.currentListId, handleListSelect);
+      return;
     }
+    setTasks(selected.id, data.tasks);
+    await handleListSelect(selected, { preloaded: !data.has_more_tasks });
   } catch (error) {
     setAuthMessage(error.message || "Unable to load data.");
   }
 }
 
-async function handleListSelect(list) {
+async function handleListSelect(list, { preloaded = false } = {}) {
   setCurrentList(list.id);
   updateCurrentListTitle(list.name);
   renderLists(state.lists, state.currentListId, handleListSelect);
-  await loadTasksForList(list.id);
+  if (preloaded) {
+    renderTasks(getTasks(list.id), taskHandlers);
+    setTasksMessage("");
+  } else {
+    await loadTasksForList(list.id);
+  }
   connectRealtime(list.id);
 }
 
@@ -236,9 +247,17 @@ function connectRealtime(listId) {
   socket.addEventListener("message", (event) => {
     try {
       const data = JSON.parse(event.data);
+      if (data?.type === "ping") {
+        socket.send(JSON.stringify({ type: "pong" }));
+        return;
+      }
       if (data?.type === "tasks_changed" && data.list_id === state.currentListId) {
         loadTasksForList(state.currentListId);
       }
+      if (data?.type === "list_deleted") {
+        setCurrentList(null);
+        loadInitialData();
+      }
     } catch (error) {
       console.warn("Failed to parse realtime message", error);
     }
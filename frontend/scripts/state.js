@@ -1,4 +1,5 @@
 const TOKEN_STORAGE_KEY = "tasktrack/token";
+const LIST_STORAGE_KEY = "tasktrack/list";
 
 export const state = {
   token: null,
@@ -33,6 +34,13 @@ export function setLists(lists) {
 
 export function setCurrentList(listId) {
   state.currentListId = listId;
+  if (listId) {
+    window.localStorage.setItem(LIST_STORAGE_KEY, String(listId));
+  }
+}
+
+export function getLastListId() {
+  return Number(window.localStorage.getItem(LIST_STORAGE_KEY)) || null;
 }
 
 export function setTasks(listId, tasks) {
@@ -47,6 +55,7 @@ export function resetState() {
   state.lists = [];
   state.tasksByList.clear();
   state.currentListId = null;
+  window.localStorage.removeItem(LIST_STORAGE_KEY);
   setToken(null);
   state.realtime.connected = false;
   if (state.realtime.socket) {
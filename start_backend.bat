@@ -27,7 +27,11 @@ pip install -r requirements.txt >nul
 echo.
 echo [INFO] Starting FastAPI server on http://127.0.0.1:8000
 echo [INFO] Press CTRL+C to stop the server.
-uvicorn app.main:app --reload
+if /i "%~1"=="--prod" (
+  python -m app.serve
+) else (
+  uvicorn app.main:app --reload
+)
 
 endlocal
 
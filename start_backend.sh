@@ -24,6 +24,9 @@ echo "[INFO] Starting FastAPI server on http://127.0.0.1:8000"
 echo "[INFO] Press CTRL+C to stop the server."
 echo ""
 
-# Start the server
+# Start the server: --prod runs the production launcher, otherwise the auto-reloading dev server
+if [ "${1:-}" = "--prod" ]; then
+  exec python -m app.serve
+fi
 uvicorn app.main:app --reload
 